@@ -0,0 +1,18 @@
+"""Calendar buckets for reports: day ordinals grouped by day, week or month."""
+from datetime import date
+
+GRANULARITIES = ('day', 'week', 'month')
+
+
+def week_start(ordinal):
+    """Ordinal of the Monday starting ordinal's week (day 1, 0001-01-01, is a Monday)"""
+    return ordinal - (ordinal - 1) % 7
+
+
+def month_start(ordinal):
+    return date.fromordinal(ordinal).replace(day=1).toordinal()
+
+
+def bucket_label(ordinal, granularity):
+    day = date.fromordinal(ordinal)
+    return day.strftime('%Y-%m') if granularity == 'month' else day.isoformat()
@@ -1,4 +1,6 @@
-from datetime import datetime
+from datetime import date, datetime
+from database.epoch import from_epoch
+from analytics.downsample import lttb_indices, minmax_indices, select
 
 class ChartGenerator:
     def __init__(self):
@@ -16,7 +18,10 @@ class ChartGenerator:
         }
     
     def generate_spending_trend(self, transactions):
-        """Generate chart data for spending trends (JSON for frontend)"""
+        """Generate chart data for spending trends (JSON for frontend)
+
+        Accepts TransactionRecords (dates already converted) or sqlite3 rows.
+        """
         if not transactions:
             return None
         
@@ -25,8 +30,9 @@ class ChartGenerator:
         
         for trans in transactions:
             if trans['transaction_type'] == 'expense':
-                date = datetime.fromisoformat(trans['date']).date()
-                daily_spending[date] = daily_spending.get(date, 0) + trans['amount']
+                day = trans['date']
+                day = (day if isinstance(day, datetime) else from_epoch(day)).date()
+                daily_spending[day] = daily_spending.get(day, 0) + trans['amount']
         
         if not daily_spending:
             return None
@@ -41,6 +47,59 @@ class ChartGenerator:
             'data': amounts
         }
     
+    def generate_daily_spending_trend(self, daily_totals, max_points=None):
+        """Generate chart data for spending trends from [(day, total)] rows"""
+        if not daily_totals:
+            return None
+        
+        labels = [day for day, _ in daily_totals]
+        data = [total for _, total in daily_totals]
+        chart = {'type': 'line', 'labels': labels, 'data': data}
+        
+        if max_points and len(data) > max_points:
+            # Days are sparse, so LTTB gets their real positions on the x axis
+            xs = [date.fromisoformat(day).toordinal() for day in labels]
+            indices = lttb_indices(data, max_points, xs)
+            chart.update(labels=select(labels, indices), data=select(data, indices), downsampled_from=len(data))
+        
+        return chart
+    
+    def generate_bucket_trend(self, buckets, transaction_type='expense', max_points=None):
+        """Generate line chart data from ReportGenerator.get_bucket_totals buckets"""
+        if not buckets:
+            return None
+        
+        labels = [bucket['label'] for bucket in buckets]
+        data = [bucket[transaction_type] for bucket in buckets]
+        chart = {'type': 'line', 'labels': labels, 'data': data}
+        
+        if max_points and len(data) > max_points:
+            indices = lttb_indices(data, max_points)
+            chart.update(labels=select(labels, indices), data=select(data, indices), downsampled_from=len(data))
+        
+        return chart
+    
+    def generate_bucket_comparison(self, buckets, max_points=None):
+        """Generate grouped bar chart data (savings and expenses per bucket)"""
+        if not buckets:
+            return None
+        
+        labels = [bucket['label'] for bucket in buckets]
+        savings = [bucket['savings'] for bucket in buckets]
+        expenses = [bucket['expense'] for bucket in buckets]
+        chart = {'type': 'bar', 'labels': labels, 'datasets': {'savings': savings, 'expenses': expenses}}
+        
+        if max_points and len(labels) > max_points:
+            # Keep the spending peaks and troughs; savings follow the same buckets
+            indices = minmax_indices(expenses, max_points)
+            chart.update(
+                labels=select(labels, indices),
+                datasets={'savings': select(savings, indices), 'expenses': select(expenses, indices)},
+                downsampled_from=len(labels)
+            )
+        
+        return chart
+    
     def generate_savings_vs_expense_chart(self, data):
         """Generate chart data comparing savings vs expenses (JSON for frontend)"""
         return {
@@ -0,0 +1,181 @@
+"""Columnar analytics for long-range reports.
+
+A report range is loaded once into four parallel columns (day ordinal,
+amount, type, category id) and every aggregate is computed over whole
+columns: time buckets, category breakdowns, rolling averages and
+percentiles. Day numbers are computed by SQLite, so no per-row date
+parsing happens in Python.
+
+NumPy is used when installed; otherwise the columns are compact ``array``
+module arrays and the same operations run as plain loops over them.
+"""
+import math
+from array import array
+from datetime import date
+
+from analytics.buckets import GRANULARITIES, bucket_label, month_start, week_start
+from database.epoch import EPOCH_ORDINAL
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+EXPENSE = 0
+SAVINGS = 1
+TYPE_CODES = {'expense': EXPENSE, 'savings': SAVINGS}
+
+class TransactionColumns:
+    """One report range as parallel columns: day ordinal, amount, type code, category id"""
+
+    def __init__(self, days, amounts, types, categories):
+        self.days = days
+        self.amounts = amounts
+        self.types = types
+        self.categories = categories
+
+    @classmethod
+    def from_rows(cls, rows, use_numpy=None):
+        """Build columns from (day_ordinal, amount, type_code, category_id) tuples"""
+        use_numpy = np is not None if use_numpy is None else use_numpy
+        if use_numpy:
+            table = np.array(rows, dtype=np.float64).reshape(-1, 4)
+            return cls(table[:, 0].astype(np.int32), table[:, 1].copy(),
+                       table[:, 2].astype(np.int8), table[:, 3].astype(np.int32))
+
+        days, amounts, types, categories = array('i'), array('d'), array('b'), array('i')
+        for day, amount, type_code, category_id in rows:
+            days.append(day)
+            amounts.append(amount)
+            types.append(type_code)
+            categories.append(category_id)
+        return cls(days, amounts, types, categories)
+
+    @classmethod
+    def load(cls, transaction_model, start_date=None, end_date=None, use_numpy=None):
+        return cls.from_rows(transaction_model.get_column_rows(start_date, end_date), use_numpy)
+
+    @property
+    def vectorized(self):
+        return np is not None and isinstance(self.amounts, np.ndarray)
+
+    def __len__(self):
+        return len(self.amounts)
+
+    def _selected(self, transaction_type):
+        """(days, amounts, categories) of one transaction type"""
+        code = TYPE_CODES[transaction_type]
+        if self.vectorized:
+            mask = self.types == code
+            return self.days[mask], self.amounts[mask], self.categories[mask]
+        picked = [i for i, t in enumerate(self.types) if t == code]
+        return ([self.days[i] for i in picked], [self.amounts[i] for i in picked],
+                [self.categories[i] for i in picked])
+
+    def totals(self):
+        """{'expense': total, 'savings': total}"""
+        if self.vectorized:
+            sums = np.bincount(self.types, weights=self.amounts, minlength=2)
+            return {'expense': float(sums[EXPENSE]), 'savings': float(sums[SAVINGS])}
+        sums = [0.0, 0.0]
+        for type_code, amount in zip(self.types, self.amounts):
+            sums[type_code] += amount
+        return {'expense': sums[EXPENSE], 'savings': sums[SAVINGS]}
+
+    def bucket_totals(self, granularity='day', transaction_type='expense'):
+        """[(label, total)] per day, week (Monday start) or month, in date order"""
+        if granularity not in GRANULARITIES:
+            raise ValueError(f'granularity must be one of {", ".join(GRANULARITIES)}')
+        days, amounts, _ = self._selected(transaction_type)
+
+        if self.vectorized:
+            if granularity == 'week':
+                keys = days - (days - 1) % 7
+            elif granularity == 'month':
+                months = (days - EPOCH_ORDINAL).astype('datetime64[D]').astype('datetime64[M]')
+                keys = months.astype('datetime64[D]').astype(np.int64) + EPOCH_ORDINAL
+            else:
+                keys = days
+            starts, inverse = np.unique(keys, return_inverse=True)
+            sums = np.bincount(inverse, weights=amounts)
+            return [(bucket_label(int(s), granularity), float(t)) for s, t in zip(starts, sums)]
+
+        buckets = {}
+        starts = {}
+        for day, amount in zip(days, amounts):
+            start = starts.get(day)
+            if start is None:
+                if granularity == 'week':
+                    start = week_start(day)
+                elif granularity == 'month':
+                    start = month_start(day)
+                else:
+                    start = day
+                starts[day] = start
+            buckets[start] = buckets.get(start, 0.0) + amount
+        return [(bucket_label(s, granularity), buckets[s]) for s in sorted(buckets)]
+
+    def category_totals(self, transaction_type='expense'):
+        """{category_id: total} (0 is uncategorized)"""
+        _, amounts, categories = self._selected(transaction_type)
+        if self.vectorized:
+            if not len(categories):
+                return {}
+            sums = np.bincount(categories, weights=amounts)
+            counts = np.bincount(categories)
+            return {int(c): float(sums[c]) for c in np.flatnonzero(counts)}
+        totals = {}
+        for category_id, amount in zip(categories, amounts):
+            totals[category_id] = totals.get(category_id, 0.0) + amount
+        return totals
+
+    def daily_series(self, transaction_type='expense'):
+        """(first_day_ordinal, totals) with one total per calendar day, zeros included"""
+        days, amounts, _ = self._selected(transaction_type)
+        if not len(days):
+            return None, []
+        if self.vectorized:
+            first = int(days.min())
+            return first, np.bincount(days - first, weights=amounts)
+        first = min(days)
+        series = [0.0] * (max(days) - first + 1)
+        for day, amount in zip(days, amounts):
+            series[day - first] += amount
+        return first, series
+
+    def rolling_average(self, window=7, transaction_type='expense'):
+        """[(day label, mean of the last `window` days)] over the daily series"""
+        first, series = self.daily_series(transaction_type)
+        if first is None:
+            return []
+        if self.vectorized:
+            sums = np.cumsum(np.concatenate(([0.0], series)))
+            index = np.arange(1, len(series) + 1)
+            lower = np.maximum(index - window, 0)
+            means = (sums[index] - sums[lower]) / (index - lower)
+        else:
+            means = []
+            running = 0.0
+            for i, value in enumerate(series):
+                running += value
+                if i >= window:
+                    running -= series[i - window]
+                means.append(running / min(i + 1, window))
+        return [(date.fromordinal(first + i).isoformat(), float(m)) for i, m in enumerate(means)]
+
+    def percentiles(self, quantiles=(50, 90, 99), transaction_type='expense'):
+        """{q: amount} per-transaction amount percentiles (linear interpolation)"""
+        _, amounts, _ = self._selected(transaction_type)
+        if not len(amounts):
+            return {}
+        if self.vectorized:
+            values = np.percentile(amounts, quantiles)
+            return {q: float(v) for q, v in zip(quantiles, values)}
+        ordered = sorted(amounts)
+        result = {}
+        for q in quantiles:
+            position = (len(ordered) - 1) * q / 100
+            low = math.floor(position)
+            high = min(low + 1, len(ordered) - 1)
+            result[q] = ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+        return result
@@ -0,0 +1,79 @@
+"""Reduce chart series to a bounded number of points.
+
+``lttb_indices`` (Largest-Triangle-Three-Buckets) keeps the points that
+preserve a line's visual shape; ``minmax_indices`` keeps each bucket's
+lowest and highest point, so spikes survive in bar charts. Both return
+sorted indices into the series, so labels and parallel series can be
+reduced with the same selection.
+"""
+
+
+def lttb_indices(values, threshold, xs=None):
+    """Indices of at most `threshold` points that keep the line's shape"""
+    count = len(values)
+    if threshold >= count:
+        return list(range(count))
+    if threshold < 3:
+        return [0, count - 1][:max(threshold, 0)]
+
+    xs = xs if xs is not None else range(count)
+    every = (count - 2) / (threshold - 2)
+    indices = [0]
+    anchor = 0
+
+    for bucket in range(threshold - 2):
+        # Average of the next bucket is the third corner of the triangle
+        next_start = int((bucket + 1) * every) + 1
+        next_end = min(int((bucket + 2) * every) + 1, count)
+        span = next_end - next_start
+        avg_x = sum(xs[j] for j in range(next_start, next_end)) / span
+        avg_y = sum(values[j] for j in range(next_start, next_end)) / span
+
+        start = int(bucket * every) + 1
+        end = int((bucket + 1) * every) + 1
+        anchor_x, anchor_y = xs[anchor], values[anchor]
+        best_area = -1.0
+        best = start
+        for j in range(start, end):
+            area = abs((anchor_x - avg_x) * (values[j] - anchor_y) - (anchor_x - xs[j]) * (avg_y - anchor_y))
+            if area > best_area:
+                best_area = area
+                best = j
+        indices.append(best)
+        anchor = best
+
+    indices.append(count - 1)
+    return indices
+
+
+def minmax_indices(values, threshold):
+    """Indices of each bucket's minimum and maximum, at most `threshold` points"""
+    count = len(values)
+    if threshold >= count:
+        return list(range(count))
+
+    buckets = max(threshold // 2, 1)
+    size = count / buckets
+    picked = set()
+    for bucket in range(buckets):
+        start = int(bucket * size)
+        end = max(int((bucket + 1) * size), start + 1)
+        window = range(start, min(end, count))
+        picked.add(min(window, key=values.__getitem__))
+        picked.add(max(window, key=values.__getitem__))
+    return sorted(picked)
+
+
+def select(sequence, indices):
+    return [sequence[i] for i in indices]
+
+
+def round_numbers(value, digits=2):
+    """Copy of a JSON-style payload with every float rounded"""
+    if isinstance(value, float):
+        return round(value, digits)
+    if isinstance(value, dict):
+        return {key: round_numbers(item, digits) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [round_numbers(item, digits) for item in value]
+    return value
@@ -1,13 +1,65 @@
-from datetime import datetime, timedelta
+import re
+from datetime import date, datetime, time, timedelta
+from database.epoch import app_now
+from analytics.buckets import GRANULARITIES, bucket_label, month_start, week_start
 from models.transaction import Transaction
+from monitoring.metrics import timed
+
+class LazyTransactions:
+    """Transactions of a report period, fetched only if a caller iterates them.
+
+    The row count comes from the aggregate query, so len() and truth tests
+    never touch the raw rows. Rows are TransactionRecords without the
+    description.
+    """
+
+    def __init__(self, transaction_model, start_date, end_date, count):
+        self.transaction_model = transaction_model
+        self.start_date = start_date
+        self.end_date = end_date
+        self.count = count
+        self._rows = None
+
+    def _load(self):
+        if self._rows is None:
+            if self.count:
+                self._rows = self.transaction_model.get_records(self.start_date, self.end_date)
+            else:
+                self._rows = []
+        return self._rows
+
+    def __len__(self):
+        return self.count
+
+    def __bool__(self):
+        return self.count > 0
+
+    def __iter__(self):
+        return iter(self._load())
+
+    def __getitem__(self, index):
+        return self._load()[index]
+
+
+LAST_DAYS_PATTERN = re.compile(r'^last_(\d{1,4})_days$')
+YEAR_PATTERN = re.compile(r'^(\d{4})$')
+MONTH_PATTERN = re.compile(r'^(\d{4})-(\d{2})$')
+QUARTER_PATTERN = re.compile(r'^(\d{4})-q([1-4])$')
 
 class ReportGenerator:
-    def __init__(self):
-        self.transaction_model = Transaction()
+    def __init__(self, db=None, transaction_model=None):
+        self.transaction_model = transaction_model or Transaction(db)
+    
+    def for_user(self, user_id):
+        """Reports over one user's transactions"""
+        scoped = self.transaction_model.for_user(user_id)
+        if scoped is self.transaction_model:
+            return self
+        return ReportGenerator(transaction_model=scoped)
     
     def get_date_range(self, period):
         """Get start and end date based on period"""
-        now = datetime.now()
+        now = app_now()
         
         if period == 'today':
             start = now.replace(hour=0, minute=0, second=0, microsecond=0)
@@ -36,26 +88,94 @@ class ReportGenerator:
         
         return start, end
     
-    def generate_summary(self, period='today'):
-        """Generate summary report for given period"""
-        start_date, end_date = self.get_date_range(period)
-        transactions = self.transaction_model.get_transactions(start_date, end_date)
+    def parse_range(self, spec, now=None):
+        """Resolve a named range to (start, end), or None if it isn't one.
+
+        Accepts the summary periods (today, week, ...), last_N_days, a year
+        (2026), a month (2026-07) or a quarter (2026-Q3).
+        """
+        now = now or app_now()
+        spec = (spec or '').strip().lower()
+        
+        if spec in ('today', 'yesterday', 'week', 'month', 'year'):
+            return self.get_date_range(spec)
         
-        # Calculate totals
+        match = LAST_DAYS_PATTERN.match(spec)
+        if match:
+            days = int(match.group(1))
+            if days < 1:
+                return None
+            return datetime.combine(now.date() - timedelta(days=days - 1), time.min), now
+        
+        match = YEAR_PATTERN.match(spec)
+        if match:
+            first, last = date(int(match.group(1)), 1, 1), date(int(match.group(1)), 12, 31)
+        elif MONTH_PATTERN.match(spec):
+            year, month = map(int, MONTH_PATTERN.match(spec).groups())
+            if not 1 <= month <= 12:
+                return None
+            first = date(year, month, 1)
+            last = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+        elif QUARTER_PATTERN.match(spec):
+            year, quarter = map(int, QUARTER_PATTERN.match(spec).groups())
+            first = date(year, 3 * quarter - 2, 1)
+            last = date(year + quarter // 4, (3 * quarter) % 12 + 1, 1) - timedelta(days=1)
+        else:
+            return None
+        
+        return datetime.combine(first, time.min), datetime.combine(last, time.max)
+    
+    @staticmethod
+    def pick_granularity(start_date, end_date):
+        """Default bucket size: days up to two months, weeks up to a year, then months"""
+        span = (end_date.date() - start_date.date()).days + 1
+        if span <= 62:
+            return 'day'
+        if span <= 366:
+            return 'week'
+        return 'month'
+    
+    def _aggregate(self, totals):
+        """(expenses, savings, transaction count, {category: expenses}) from get_totals rows"""
         total_expenses = 0
         total_savings = 0
+        transaction_count = 0
         category_breakdown = {}
         
-        for trans in transactions:
-            amount = trans['amount']
-            category = trans['category_name'] or 'Uncategorized'
+        for row in totals:
+            amount = row['total']
+            category = row['category_name'] or 'Uncategorized'
+            transaction_count += row['count']
             
-            if trans['transaction_type'] == 'expense':
+            if row['transaction_type'] == 'expense':
                 total_expenses += amount
                 category_breakdown[category] = category_breakdown.get(category, 0) + amount
             else:
                 total_savings += amount
         
+        return total_expenses, total_savings, transaction_count, category_breakdown
+    
+    def _format_totals(self, title, total_expenses, total_savings, category_breakdown):
+        response = f"📊 {title}\n\n"
+        response += f"💸 Total Expenses: {total_expenses:.2f} pesos\n"
+        response += f"💰 Total Savings: {total_savings:.2f} pesos\n"
+        response += f"📈 Net: {(total_savings - total_expenses):.2f} pesos\n"
+        
+        if category_breakdown:
+            response += "\n📂 By Category:\n"
+            for category, amount in sorted(category_breakdown.items(), key=lambda x: x[1], reverse=True):
+                percentage = (amount / total_expenses * 100) if total_expenses > 0 else 0
+                response += f"  • {category}: {amount:.2f} pesos ({percentage:.1f}%)\n"
+        
+        return response
+    
+    @timed('report')
+    def generate_summary(self, period='today'):
+        """Generate summary report for given period"""
+        start_date, end_date = self.get_date_range(period)
+        totals = self.transaction_model.get_totals(start_date, end_date)
+        total_expenses, total_savings, transaction_count, category_breakdown = self._aggregate(totals)
+        
         # Format response
         period_names = {
             'today': 'Today',
@@ -65,27 +185,99 @@ class ReportGenerator:
             'year': 'This Year'
         }
         
-        response = f"📊 {period_names.get(period, 'Summary')} ({start_date.strftime('%b %d')} - {end_date.strftime('%b %d')})\n\n"
-        response += f"💸 Total Expenses: {total_expenses:.2f} pesos\n"
-        response += f"💰 Total Savings: {total_savings:.2f} pesos\n"
-        response += f"📈 Net: {(total_savings - total_expenses):.2f} pesos\n"
+        title = f"{period_names.get(period, 'Summary')} ({start_date.strftime('%b %d')} - {end_date.strftime('%b %d')})"
+        response = self._format_totals(title, total_expenses, total_savings, category_breakdown)
         
-        if category_breakdown:
-            response += "\n📂 By Category:\n"
-            for category, amount in sorted(category_breakdown.items(), key=lambda x: x[1], reverse=True):
-                percentage = (amount / total_expenses * 100) if total_expenses > 0 else 0
-                response += f"  • {category}: {amount:.2f} pesos ({percentage:.1f}%)\n"
+        return response, {
+            'total_expenses': total_expenses,
+            'total_savings': total_savings,
+            'category_breakdown': category_breakdown,
+            'start_date': start_date,
+            'end_date': end_date,
+            'transactions': LazyTransactions(self.transaction_model, start_date, end_date, transaction_count)
+        }
+    
+    def get_bucket_totals(self, start_date, end_date, granularity='day'):
+        """Expenses and savings per day, week (Monday start) or month over [start_date, end_date].
+
+        Built from daily totals, which come from daily_rollups for whole
+        days, so a multi-year range reads a few thousand rollup rows rather
+        than every transaction. Every bucket in the range is present, empty
+        ones with zero totals.
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f'granularity must be one of {", ".join(GRANULARITIES)}')
+        
+        # (first day of the bucket holding a day, first day of the next bucket), as ordinals
+        if granularity == 'week':
+            bucket_of, next_bucket = week_start, lambda ordinal: ordinal + 7
+        elif granularity == 'month':
+            bucket_of, next_bucket = month_start, lambda ordinal: month_start(ordinal + 31)
+        else:
+            bucket_of, next_bucket = (lambda ordinal: ordinal), (lambda ordinal: ordinal + 1)
+        
+        buckets = {}
+        ordinal = bucket_of(start_date.date().toordinal())
+        last = end_date.date().toordinal()
+        while ordinal <= last:
+            buckets[ordinal] = {'label': bucket_label(ordinal, granularity), 'expense': 0.0, 'savings': 0.0}
+            ordinal = next_bucket(ordinal)
+        
+        for transaction_type in ('expense', 'savings'):
+            for day, total in self.transaction_model.get_daily_totals(start_date, end_date, transaction_type):
+                bucket = buckets.get(bucket_of(date.fromisoformat(day).toordinal()))
+                if bucket is not None:
+                    bucket[transaction_type] += total
+        
+        return [buckets[ordinal] for ordinal in sorted(buckets)]
+    
+    @timed('report')
+    def generate_report(self, start_date, end_date, granularity=None):
+        """Report over an arbitrary range, with totals per granularity bucket"""
+        granularity = granularity or self.pick_granularity(start_date, end_date)
+        totals = self.transaction_model.get_totals(start_date, end_date)
+        total_expenses, total_savings, transaction_count, category_breakdown = self._aggregate(totals)
+        buckets = self.get_bucket_totals(start_date, end_date, granularity)
+        
+        title = f"Report ({start_date.strftime('%b %d, %Y')} - {end_date.strftime('%b %d, %Y')}, by {granularity})"
+        response = self._format_totals(title, total_expenses, total_savings, category_breakdown)
         
         return response, {
             'total_expenses': total_expenses,
             'total_savings': total_savings,
             'category_breakdown': category_breakdown,
-            'transactions': transactions
+            'transaction_count': transaction_count,
+            'start_date': start_date,
+            'end_date': end_date,
+            'granularity': granularity,
+            'buckets': buckets
+        }
+    
+    def get_spending_analysis(self, start_date=None, end_date=None, granularity='month', window=7):
+        """Long-range spending analysis computed over columns (see analytics.columnar)"""
+        # Imported here: it pulls in NumPy, which only this analysis needs
+        from analytics.columnar import TransactionColumns
+        columns = TransactionColumns.load(self.transaction_model, start_date, end_date)
+        names = {
+            row['category_id']: row['category_name']
+            for row in self.transaction_model.db.fetch_all('SELECT category_id, category_name FROM categories')
+        }
+        
+        return {
+            'totals': columns.totals(),
+            'buckets': columns.bucket_totals(granularity),
+            'category_breakdown': {
+                names.get(category_id, 'Uncategorized'): total
+                for category_id, total in columns.category_totals().items()
+            },
+            'rolling_average': columns.rolling_average(window),
+            'percentiles': columns.percentiles(),
+            'transaction_count': len(columns)
         }
     
     def get_recent_transactions(self, limit=10):
         """Get recent transactions"""
-        transactions = self.transaction_model.get_transactions(limit=limit)
+        transactions = self.transaction_model.get_records(limit=limit)
         
         if not transactions:
             return "No transactions recorded yet."
@@ -93,10 +285,10 @@ class ReportGenerator:
         response = f"📝 Recent Transactions (Last {len(transactions)}):\n\n"
         
         for trans in transactions:
-            date_str = datetime.fromisoformat(trans['date']).strftime('%b %d, %I:%M %p')
-            category = trans['category_name'] or 'Uncategorized'
-            symbol = "💸" if trans['transaction_type'] == 'expense' else "💰"
+            date_str = trans.date.strftime('%b %d, %I:%M %p')
+            category = trans.category_name or 'Uncategorized'
+            symbol = "💸" if trans.transaction_type == 'expense' else "💰"
             
-            response += f"{symbol} {trans['amount']:.2f} - {category} ({date_str})\n"
+            response += f"{symbol} {trans.amount:.2f} - {category} ({date_str})\n"
         
         return response
\ No newline at end of file
@@ -0,0 +1,83 @@
+import threading
+import time
+from collections import OrderedDict
+
+from database.epoch import format_epoch
+
+
+def day_key(value):
+    """'YYYY-MM-DD' for a date, datetime, ISO string or stored epoch"""
+    if isinstance(value, int):
+        value = format_epoch(value)
+    return str(value)[:10]
+
+
+class SummaryCache:
+    """LRU + TTL cache of summary payloads, keyed by (user, period, first day, last day).
+
+    Each entry remembers the user and days it covers. Transaction writes
+    report the dates they touch through ``invalidate_dates``, which drops
+    exactly that user's entries covering one of those days. The TTL bounds staleness for writes
+    made by other processes, which this cache never hears about.
+    """
+
+    def __init__(self, max_entries=128, ttl=30.0, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(period, start_date, end_date, user_id=None):
+        return (user_id, period, day_key(start_date), day_key(end_date))
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry['expires'] <= self.clock():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry['value']
+
+    def put(self, key, value):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = {'value': value, 'expires': self.clock() + self.ttl}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_dates(self, dates, user_id=None):
+        """Drop the user's entries (everyone's when user_id is None) covering one of the dates"""
+        days = {day_key(d) for d in dates if d is not None}
+        if not days:
+            return
+        with self._lock:
+            stale = [
+                key for key in self._entries
+                if (user_id is None or key[0] == user_id)
+                and any(key[2] <= day <= key[3] for day in days)
+            ]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0
+        }
@@ -1,20 +1,265 @@
-from flask import Flask, render_template, request, jsonify
-from chatbot.message_parser import MessageParser
-from chatbot.response_generator import ResponseGenerator
-from models.transaction import Transaction
-from analytics.report_generator import ReportGenerator
-from analytics.chart_generator import ChartGenerator
+import atexit
+import base64
+import csv
+import functools
+import gzip
+import hashlib
+import hmac
+import io
+import itertools
+import json
+import secrets
+import sqlite3
+import threading
+import time as timer
+from datetime import datetime, time
+from flask import Flask, Response, render_template, request, jsonify, session, stream_with_context
+from chatbot.importer import parse_rows
+from analytics.downsample import round_numbers
+from analytics.summary_cache import SummaryCache
+from database.db_manager import get_database
+from database.epoch import app_now, format_epoch, to_epoch
+from database.sharding import shard_path, sync_categories
+from monitoring import metrics
+from monitoring.profiler import SlowRequestProfiler
 from config import Config
 
 app = Flask(__name__)
 app.config.from_object(Config)
 
-# Initialize components
-parser = MessageParser()
-response_gen = ResponseGenerator()
-transaction_model = Transaction()
-report_gen = ReportGenerator()
-chart_gen = ChartGenerator()
+# Components are built on first use instead of at import, so a serverless
+# cold start only pays for what its first request needs: opening and
+# migrating SQLite, loading categories and responses, and the analytics
+# stack (numpy, report and chart generators), which loads only once a
+# summary or report is asked for. warm_up() builds everything ahead of traffic.
+_components = {}
+_components_lock = threading.RLock()
+
+COMPONENT_SECONDS = metrics.registry.histogram(
+    'chatbot_component_init_seconds', 'Time to build each lazily initialized component', ('component',)
+)
+
+def component(factory):
+    """Decorator for a get_<name>() factory: build once on first call, then reuse"""
+    name = factory.__name__[len('get_'):]
+    
+    @functools.wraps(factory)
+    def get():
+        try:
+            return _components[name]
+        except KeyError:
+            pass
+        with _components_lock:
+            if name not in _components:
+                start = timer.perf_counter()
+                _components[name] = factory()
+                COMPONENT_SECONDS.observe(timer.perf_counter() - start, name)
+            return _components[name]
+    return get
+
+@component
+def get_snapshotter():
+    """Snapshots of the database files to SNAPSHOT_STORE (None when unset)"""
+    if not Config.SNAPSHOT_STORE:
+        return None
+    from database.snapshot import Snapshotter, open_store
+    paths = [Config.DATABASE_PATH]
+    if Config.DATABASE_SHARDS > 1:
+        paths += [shard_path(i) for i in range(Config.DATABASE_SHARDS)]
+    # Snapshots run on their own thread and connection: the backup reads a
+    # consistent copy without holding up the writer thread or the request.
+    # Not a daemon, so exiting waits for an upload in progress.
+    snapshotter = Snapshotter(open_store(Config.SNAPSHOT_STORE), paths, Config.SNAPSHOT_INTERVAL,
+                              submit=lambda snapshot: threading.Thread(target=snapshot, name='db-snapshot').start())
+    atexit.register(snapshotter.flush)
+    return snapshotter
+
+@component
+def get_db():
+    """The shared database handle; the schema is migrated when it is first built"""
+    snapshotter = get_snapshotter()
+    if snapshotter is not None:
+        # A fresh instance (empty /tmp) starts from the latest snapshot
+        with metrics.stage('restore'):
+            snapshotter.restore()
+    db = get_database()
+    atexit.register(db.close_all)
+    # Shards keep a copy of the category table for their joins and foreign keys
+    if Config.DATABASE_SHARDS > 1:
+        sync_categories(db)
+    return db
+
+@component
+def get_write_queue():
+    """Optional group commit for recorded transactions (WRITE_BEHIND=1), else None"""
+    if not Config.WRITE_BEHIND:
+        return None
+    from database.write_behind import WriteBehindQueue
+    # Group commits run as jobs on the executor's writer, the only thread that writes
+    return WriteBehindQueue(get_db(), Config.WRITE_BEHIND_MAX_BATCH, Config.WRITE_BEHIND_MAX_DELAY,
+                            submit_job=get_db_executor().write)
+
+@component
+def get_category_model():
+    from models.category import Category
+    category_model = Category(get_db())
+    if get_snapshotter() is not None:
+        category_model.add_listener(get_snapshotter().mark_dirty)
+    if Config.DATABASE_SHARDS > 1:
+        category_model.add_listener(lambda category, version: sync_categories(get_db()))
+    return category_model
+
+@component
+def get_parser():
+    from chatbot.message_parser import MessageParser
+    return MessageParser(get_db(), category_model=get_category_model())
+
+@component
+def get_summary_cache():
+    """Summary payloads, dropped whenever a write touches a day they cover"""
+    return SummaryCache(Config.SUMMARY_CACHE_SIZE, Config.SUMMARY_CACHE_TTL)
+
+@component
+def get_transaction_model():
+    from models.transaction import Transaction
+    transaction_model = Transaction(get_db(), write_queue=get_write_queue())
+    transaction_model.add_listener(get_summary_cache().invalidate_dates)
+    if get_snapshotter() is not None:
+        transaction_model.add_listener(get_snapshotter().mark_dirty)
+    return transaction_model
+
+@component
+def get_response_gen():
+    from chatbot.response_generator import ResponseGenerator
+    return ResponseGenerator(get_db(), transaction_model=get_transaction_model())
+
+@component
+def get_report_gen():
+    from analytics.report_generator import ReportGenerator
+    return ReportGenerator(get_db(), transaction_model=get_transaction_model())
+
+@component
+def get_chart_gen():
+    from analytics.chart_generator import ChartGenerator
+    return ChartGenerator()
+
+@component
+def get_db_executor():
+    """Bounded reader pool and the single writer thread every write goes through"""
+    from database.executor import DatabaseExecutor
+    return DatabaseExecutor(Config.DB_READ_WORKERS)
+
+# Module attributes for scripts and the ASGI entry point (app.parser, app.db, ...)
+_LAZY_ATTRIBUTES = {
+    'snapshotter': get_snapshotter,
+    'db': get_db,
+    'write_queue': get_write_queue,
+    'category_model': get_category_model,
+    'parser': get_parser,
+    'summary_cache': get_summary_cache,
+    'transaction_model': get_transaction_model,
+    'response_gen': get_response_gen,
+    'report_gen': get_report_gen,
+    'chart_gen': get_chart_gen,
+    'db_executor': get_db_executor,
+}
+
+def __getattr__(name):
+    try:
+        factory = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}') from None
+    return factory()
+
+def warm_up(analytics=True):
+    """Build every component (and open this thread's connection) ahead of the first request.
+
+    Returns the names built by this call; a no-op once everything exists.
+    """
+    built = [name for name in _LAZY_ATTRIBUTES if name not in _components]
+    for name, factory in _LAZY_ATTRIBUTES.items():
+        if analytics or name not in ('report_gen', 'chart_gen'):
+            factory()
+    get_response_gen().get_predefined_responses()
+    return [name for name in built if name in _components]
+
+def shutdown():
+    """Stop the executor threads, flush the write-behind queue, take a last snapshot and close connections (built ones only)"""
+    if 'db_executor' in _components:
+        _components['db_executor'].shutdown()
+    if _components.get('write_queue') is not None:
+        _components['write_queue'].close()
+    if _components.get('snapshotter') is not None:
+        _components['snapshotter'].flush()
+    if 'db' in _components:
+        _components['db'].close_all()
+
+@app.teardown_appcontext
+def release_connection(exception=None):
+    # Only once a request has actually used the database
+    if 'db' in _components:
+        _components['db'].release_connection(exception)
+
+# Per-request stage/query metrics (served at /metrics), plus sampled
+# cProfile dumps of slow requests when PROFILE_SLOW_MS is set
+profiler = None
+if Config.PROFILE_SLOW_MS is not None:
+    profiler = SlowRequestProfiler(Config.PROFILE_SLOW_MS, Config.PROFILE_DIR, Config.PROFILE_SAMPLE_RATE)
+metrics.init_app(app, profiler)
+
+# Gauges read components only once they exist, so scraping /metrics builds nothing
+def summary_cache_stats():
+    cache = _components.get('summary_cache')
+    return cache.stats() if cache else {'entries': 0, 'hits': 0, 'misses': 0}
+
+def parse_cache_stats():
+    parser = _components.get('parser')
+    return parser.cache.stats() if parser else {'entries': 0, 'hits': 0, 'misses': 0}
+
+def cache_lookups(stats):
+    return {('hit',): stats['hits'], ('miss',): stats['misses']}
+
+metrics.registry.gauge(
+    'chatbot_summary_cache_lookups_total', 'Summary cache lookups by result',
+    lambda: cache_lookups(summary_cache_stats()), ('result',), kind='counter'
+)
+metrics.registry.gauge('chatbot_summary_cache_entries', 'Cached summary payloads',
+                       lambda: summary_cache_stats()['entries'])
+metrics.registry.gauge(
+    'chatbot_parse_cache_lookups_total', 'Message template cache lookups by result',
+    lambda: cache_lookups(parse_cache_stats()), ('result',), kind='counter'
+)
+metrics.registry.gauge('chatbot_parse_cache_entries', 'Cached message templates',
+                       lambda: parse_cache_stats()['entries'])
+if Config.WRITE_BEHIND:
+    metrics.registry.gauge('chatbot_write_behind_pending', 'Writes waiting for a group commit',
+                           lambda: get_write_queue().stats()['pending'] if 'write_queue' in _components else 0)
+
+if Config.SNAPSHOT_STORE:
+    metrics.registry.gauge('chatbot_snapshots_total', 'Database snapshots uploaded',
+                           lambda: get_snapshotter().snapshots if 'snapshotter' in _components else 0,
+                           kind='counter')
+
+if Config.WARM_UP:
+    warm_up()
+
+def user_id_for_token(token):
+    """Stable user id derived from an API token (the token itself is never stored)"""
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()[:32]
+
+def current_user_id():
+    """Caller identity: bearer token, else a per-browser session id (MULTI_USER only)"""
+    if not Config.MULTI_USER:
+        return Config.DEFAULT_USER_ID
+    
+    auth = request.headers.get('Authorization', '')
+    if auth.startswith('Bearer ') and auth[7:].strip():
+        return user_id_for_token(auth[7:].strip())
+    
+    if 'user_id' not in session:
+        session['user_id'] = secrets.token_hex(16)
+        session.permanent = True
+    return session['user_id']
 
 @app.route('/')
 def index():
@@ -31,8 +276,23 @@ def chat():
     if not user_message:
         return jsonify({'response': 'Please enter a message.'})
     
+    return jsonify(handle_chat(user_message, current_user_id()))
+
+def delete_last_transaction(transactions):
+    last_transaction = transactions.get_last_transaction()
+    if last_transaction:
+        transactions.delete_transaction(last_transaction['transaction_id'])
+    return last_transaction
+
+def handle_chat(user_message, user_id=None):
+    """Parse a chat message and act on it for one user; shared by the WSGI and ASGI entry points.
+
+    Writes are handed to the single database writer thread and awaited.
+    """
+    transactions = get_transaction_model().for_user(user_id)
+    
     # Parse message
-    parsed = parser.parse_message(user_message)
+    parsed = get_parser().parse_message(user_message)
     intent = parsed['intent']
     
     response_text = ''
@@ -40,28 +300,33 @@ def chat():
     
     # Handle different intents
     if intent == 'ambiguous':
-        response_text = response_gen.generate_response(
+        response_text = get_response_gen().generate_response(
             intent,
             conflicting_actions=parsed.get('conflicting_actions')
         )
     
     elif intent == 'missing_amount':
-        response_text = response_gen.generate_response(
+        response_text = get_response_gen().generate_response(
             intent,
             action=parsed.get('action')
         )
     
     elif intent == 'record_transaction':
-        # Record transaction
-        transaction_id = transaction_model.create_transaction(
-            transaction_type=parsed['action'],
-            amount=parsed['amount'],
-            category_id=parsed['category_id'],
-            description=parsed['description'],
-            date=parsed['date']
-        )
+        # Record transaction; with write-behind the queue groups concurrent
+        # inserts into one writer job, so don't give each insert its own
+        record = {
+            'transaction_type': parsed['action'],
+            'amount': parsed['amount'],
+            'category_id': parsed['category_id'],
+            'description': parsed['description'],
+            'date': parsed['date']
+        }
+        if transactions.write_queue is not None:
+            transaction_id = transactions.create_transaction(**record)
+        else:
+            transaction_id = get_db_executor().write(transactions.create_transaction, **record).result()
         
-        response_text = response_gen.generate_response(
+        response_text = get_response_gen().generate_response(
             intent,
             amount=parsed['amount'],
             category_name=parsed['category_name'] or 'Miscellaneous',
@@ -70,54 +335,118 @@ def chat():
     
     elif intent == 'query':
         period = parsed['time_period'] or 'today'
-        response_text, data = report_gen.generate_summary(period)
+        response_text, data = get_report_gen().for_user(user_id).generate_summary(period)
     
     elif intent == 'delete':
-        last_transaction = transaction_model.get_last_transaction()
-        if last_transaction:
-            transaction_model.delete_transaction(last_transaction['transaction_id'])
-        response_text = response_gen.generate_response(intent, transaction=last_transaction)
+        last_transaction = get_db_executor().write(delete_last_transaction, transactions).result()
+        response_text = get_response_gen().generate_response(intent, transaction=last_transaction)
 
     elif intent == 'update':
         # Attempt to perform update based on parsed fields
-        response_text = response_gen.generate_response(
+        response_text = get_db_executor().write(
+            get_response_gen().generate_response,
             intent,
             amount=parsed.get('amount'),
             category_id=parsed.get('category_id'),
             category_name=parsed.get('category_name'),
-            date=parsed.get('date')
-        )
+            date=parsed.get('date'),
+            user_id=user_id
+        ).result()
     
     elif intent in ['greeting', 'help', 'advice']:
-        response_text = response_gen.generate_response(intent)
+        response_text = get_response_gen().generate_response(intent)
     
     else:
-        response_text = response_gen.generate_response('unknown')
+        response_text = get_response_gen().generate_response('unknown')
     
-    return jsonify({
+    return {
         'response': response_text,
         'intent': intent,
         'chart': chart_data
-    })
+    }
+
+def chart_options(args=None):
+    """(max_points, compact) from ?max_points= and ?compact=1 (raises ValueError on bad input)
+
+    args defaults to the Flask request's query string; the ASGI handlers pass their own.
+    """
+    args = request.args if args is None else args
+    max_points = args.get('max_points', str(Config.CHART_MAX_POINTS))
+    if not max_points.isdigit() or not 3 <= int(max_points) <= Config.CHART_MAX_POINTS_LIMIT:
+        raise ValueError(f'max_points must be between 3 and {Config.CHART_MAX_POINTS_LIMIT}.')
+    return int(max_points), args.get('compact') in ('1', 'true')
+
+def encode_payload(payload, compact=False):
+    """JSON bytes; compact rounds numbers to cents and drops whitespace"""
+    if compact:
+        return json.dumps(round_numbers(payload), separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    return app.json.dumps(payload).encode('utf-8')
+
+def gzip_body(body, etag, accept_encoding):
+    """(body, etag, gzipped): the body gzipped, with its own ETag, when large enough and accepted"""
+    if len(body) >= Config.GZIP_MIN_BYTES and 'gzip' in accept_encoding:
+        return gzip.compress(body, Config.GZIP_LEVEL), etag + '-gz', True
+    return body, etag, False
+
+def json_response(body, etag):
+    """Cached JSON body as a conditional response, gzipped when the client accepts it"""
+    body, etag, gzipped = gzip_body(body, etag, request.headers.get('Accept-Encoding', ''))
+    response = app.response_class(body, mimetype='application/json')
+    if gzipped:
+        response.headers['Content-Encoding'] = 'gzip'
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.set_etag(etag)
+    return response.make_conditional(request)
 
 @app.route('/api/summary/<period>')
 def get_summary(period):
-    response_text, data = report_gen.generate_summary(period)
+    """Summary for a period; ?max_points= caps the trend chart, ?compact=1 shrinks the payload"""
+    try:
+        max_points, compact = chart_options()
+    except ValueError as exc:
+        return jsonify({'error': str(exc)}), 400
+    
+    return json_response(*summary_body(period, current_user_id(), max_points, compact))
+
+def summary_body(period, user_id=None, max_points=None, compact=False):
+    """Serialized summary payload and its ETag, from the cache when possible"""
+    user_id = user_id or Config.DEFAULT_USER_ID
+    max_points = max_points or Config.CHART_MAX_POINTS
+    start_date, end_date = get_report_gen().get_date_range(period)
+    cache_key = SummaryCache.make_key(f'{period}:{max_points}:{int(compact)}', start_date, end_date, user_id)
+    
+    cached = get_summary_cache().get(cache_key)
+    if cached is None:
+        payload = build_summary_payload(period, user_id, max_points)
+        with metrics.stage('encode'):
+            body = encode_payload(payload, compact)
+        cached = (body, hashlib.sha1(body).hexdigest())
+        get_summary_cache().put(cache_key, cached)
+    
+    return cached
+
+def build_summary_payload(period, user_id=None, max_points=None):
+    reports = get_report_gen().for_user(user_id)
+    response_text, data = reports.generate_summary(period)
     
     # Generate charts
     pie_chart = None
     trend_chart = None
     comparison_chart = None
     
-    if data['category_breakdown']:
-        pie_chart = chart_gen.generate_category_pie_chart(data['category_breakdown'])
-    
-    if data['transactions']:
-        trend_chart = chart_gen.generate_spending_trend(data['transactions'])
-    
-    comparison_chart = chart_gen.generate_savings_vs_expense_chart(data)
+    with metrics.stage('charts'):
+        if data['category_breakdown']:
+            pie_chart = get_chart_gen().generate_category_pie_chart(data['category_breakdown'])
+        
+        if data['transactions']:
+            trend_chart = get_chart_gen().generate_daily_spending_trend(
+                reports.transaction_model.get_daily_totals(data['start_date'], data['end_date']),
+                max_points=max_points
+            )
+        
+        comparison_chart = get_chart_gen().generate_savings_vs_expense_chart(data)
     
-    return jsonify({
+    return {
         'summary': response_text,
         'data': {
             'total_expenses': data['total_expenses'],
@@ -130,14 +459,374 @@ def get_summary(period):
             'trend': trend_chart,
             'comparison': comparison_chart
         }
-    })
+    }
+
+@app.route('/api/report')
+def get_report():
+    """Report over ?range=last_90_days|2026-Q3|2026-07|2026|week... or ?start=&end=, with ?granularity=day|week|month
+
+    ?analysis=1 adds a 7-day rolling average of spending and expense percentiles.
+    """
+    from analytics.buckets import GRANULARITIES
+    reports = get_report_gen().for_user(current_user_id())
+    try:
+        if request.args.get('range'):
+            date_range = reports.parse_range(request.args['range'])
+            if date_range is None:
+                raise ValueError('unknown range')
+            start_date, end_date = date_range
+        else:
+            start_date = parse_date_param(request.args.get('start'))
+            end_date = parse_date_param(request.args.get('end'), end_of_day=True) or app_now()
+            if start_date is None or start_date > end_date:
+                raise ValueError('start must be on or before end')
+        granularity = request.args.get('granularity') or reports.pick_granularity(start_date, end_date)
+        if granularity not in GRANULARITIES:
+            raise ValueError('bad granularity')
+        max_points, compact = chart_options()
+    except (ValueError, TypeError):
+        return jsonify({'error': 'Give range, or start (and optionally end) as YYYY-MM-DD, '
+                                 'granularity day, week or month, and max_points between 3 and '
+                                 f'{Config.CHART_MAX_POINTS_LIMIT}.'}), 400
+    
+    days = (end_date.date() - start_date.date()).days + 1
+    if days // {'day': 1, 'week': 7, 'month': 28}[granularity] > Config.REPORT_MAX_BUCKETS:
+        return jsonify({'error': 'Range too long for that granularity; use a coarser one.'}), 400
+    
+    analysis = request.args.get('analysis') in ('1', 'true')
+    return json_response(*report_body(start_date, end_date, granularity, current_user_id(),
+                                      max_points, compact, analysis))
+
+def report_body(start_date, end_date, granularity, user_id=None, max_points=None, compact=False, analysis=False):
+    """Serialized range report and its ETag, cached like summaries"""
+    user_id = user_id or Config.DEFAULT_USER_ID
+    max_points = max_points or Config.CHART_MAX_POINTS
+    cache_key = SummaryCache.make_key(
+        f'report:{granularity}:{max_points}:{int(compact)}:{int(analysis)}', start_date, end_date, user_id
+    )
+    
+    cached = get_summary_cache().get(cache_key)
+    if cached is None:
+        reports = get_report_gen().for_user(user_id)
+        response_text, data = reports.generate_report(start_date, end_date, granularity)
+        buckets = data['buckets']
+        if compact:
+            # Parallel arrays instead of one object per bucket
+            buckets = {
+                'labels': [bucket['label'] for bucket in buckets],
+                'expense': [bucket['expense'] for bucket in buckets],
+                'savings': [bucket['savings'] for bucket in buckets]
+            }
+        payload = {
+            'summary': response_text,
+            'data': {
+                'start': start_date.date().isoformat(),
+                'end': end_date.date().isoformat(),
+                'granularity': granularity,
+                'total_expenses': data['total_expenses'],
+                'total_savings': data['total_savings'],
+                'net': data['total_savings'] - data['total_expenses'],
+                'transaction_count': data['transaction_count'],
+                'category_breakdown': data['category_breakdown'],
+                'buckets': buckets
+            },
+            'charts': {
+                'pie': get_chart_gen().generate_category_pie_chart(data['category_breakdown']),
+                'trend': get_chart_gen().generate_bucket_trend(data['buckets'], max_points=max_points),
+                'comparison': get_chart_gen().generate_bucket_comparison(data['buckets'], max_points=max_points)
+            }
+        }
+        if analysis:
+            # Per-day and per-transaction statistics the rollups cannot give, from the columnar engine
+            spending = reports.get_spending_analysis(start_date, end_date, granularity)
+            payload['analysis'] = {
+                'rolling_average': spending['rolling_average'],
+                'percentiles': spending['percentiles']
+            }
+        body = encode_payload(payload, compact)
+        cached = (body, hashlib.sha1(body).hexdigest())
+        get_summary_cache().put(cache_key, cached)
+    
+    return cached
 
 @app.route('/api/transactions/recent')
 def get_recent_transactions():
-    response = report_gen.get_recent_transactions(limit=20)
+    response = get_report_gen().for_user(current_user_id()).get_recent_transactions(limit=20)
     return jsonify({'response': response})
 
+def encode_cursor(row):
+    raw = json.dumps([row['date'], row['transaction_id']]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+def decode_cursor(cursor):
+    # Cursors issued before dates were epochs carry the ISO string
+    date, transaction_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    return to_epoch(date), int(transaction_id)
+
+def parse_date_param(value, end_of_day=False):
+    """Parse YYYY-MM-DD[ HH:MM:SS]; a bare end date covers that whole day"""
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value)
+    if end_of_day and len(value) == 10:
+        parsed = datetime.combine(parsed.date(), time.max)
+    return parsed
+
+def transaction_filters():
+    """Listing filters from the query string (raises ValueError on bad input)"""
+    transaction_type = request.args.get('type')
+    if transaction_type and transaction_type not in ('expense', 'savings'):
+        raise ValueError("type must be 'expense' or 'savings'")
+    
+    category_id = request.args.get('category_id')
+    return {
+        'transaction_type': transaction_type,
+        'category_id': int(category_id) if category_id else None,
+        'start_date': parse_date_param(request.args.get('start')),
+        'end_date': parse_date_param(request.args.get('end'), end_of_day=True)
+    }
+
+def transaction_to_dict(row):
+    return {
+        'transaction_id': row['transaction_id'],
+        'transaction_type': row['transaction_type'],
+        'amount': row['amount'],
+        'category_id': row['category_id'],
+        'category_name': row['category_name'],
+        'description': row['description'],
+        'date': format_epoch(row['date'])
+    }
+
+@app.route('/api/transactions')
+def list_transactions():
+    """Keyset-paginated transactions, newest first; pass next_cursor back as ?cursor="""
+    try:
+        filters = transaction_filters()
+        limit = min(max(int(request.args.get('limit', 50)), 1), Config.TRANSACTIONS_PAGE_MAX)
+        cursor = request.args.get('cursor')
+        after = decode_cursor(cursor) if cursor else None
+    except (ValueError, TypeError):
+        return jsonify({'error': 'Invalid filter, limit or cursor.'}), 400
+    
+    transactions = get_transaction_model().for_user(current_user_id())
+    rows = transactions.get_transactions_page(limit, after=after, **filters)
+    return jsonify({
+        'transactions': [transaction_to_dict(row) for row in rows],
+        'next_cursor': encode_cursor(rows[-1]) if len(rows) == limit else None
+    })
+
+EXPORT_FIELDS = ['transaction_id', 'transaction_type', 'amount', 'category_id',
+                 'category_name', 'description', 'date']
+
+@app.route('/api/transactions/export')
+def export_transactions():
+    """Stream every matching transaction as NDJSON (default) or CSV"""
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in ('ndjson', 'csv'):
+        return jsonify({'error': "format must be 'ndjson' or 'csv'."}), 400
+    try:
+        filters = transaction_filters()
+    except (ValueError, TypeError):
+        return jsonify({'error': 'Invalid filter.'}), 400
+    
+    transactions = get_transaction_model().for_user(current_user_id())
+    rows = transactions.iter_transactions(page_size=Config.EXPORT_PAGE_SIZE, **filters)
+    
+    if export_format == 'csv':
+        def generate():
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(EXPORT_FIELDS)
+            for row in rows:
+                record = transaction_to_dict(row)
+                writer.writerow([record[field] for field in EXPORT_FIELDS])
+                if buffer.tell() > 65536:
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+            yield buffer.getvalue()
+        mimetype = 'text/csv'
+    else:
+        def generate():
+            chunk = []
+            for row in rows:
+                chunk.append(json.dumps(transaction_to_dict(row)))
+                if len(chunk) >= 500:
+                    yield '\n'.join(chunk) + '\n'
+                    chunk = []
+            if chunk:
+                yield '\n'.join(chunk) + '\n'
+        mimetype = 'application/x-ndjson'
+    
+    response = Response(stream_with_context(generate()), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename=transactions.{export_format}'
+    return response
+
+@app.route('/api/import', methods=['POST'])
+def import_chat_log():
+    """Import a chat log: JSON {"lines": [...]}, an uploaded file, or a plain-text body"""
+    limit = Config.IMPORT_MAX_LINES
+    # Bodies over MAX_CONTENT_LENGTH are refused (413) before any of this reads them
+    if request.is_json:
+        payload = request.get_json(silent=True)
+        lines = payload.get('lines') if isinstance(payload, dict) else None
+        if not isinstance(lines, list) or not all(isinstance(line, str) for line in lines):
+            return jsonify({'error': 'Expected {"lines": [...]} with a list of strings.'}), 400
+    else:
+        stream = request.files['file'].stream if 'file' in request.files else request.stream
+        # One line past the limit is enough to reject the import
+        lines = [line.decode('utf-8', errors='replace') for line in itertools.islice(stream, limit + 1)]
+    if len(lines) > limit:
+        return jsonify({'error': f'At most {limit} lines per import.'}), 413
+    
+    transactions = get_transaction_model().for_user(current_user_id())
+    stats = {'lines': 0, 'imported': 0, 'skipped': 0}
+    # Lines are parsed here; the writer only gets each batch's prepared rows,
+    # one job at a time, so chat writes queued meanwhile are not held up
+    for start in range(0, len(lines), Config.IMPORT_BATCH_SIZE):
+        rows = list(parse_rows(lines[start:start + Config.IMPORT_BATCH_SIZE], get_parser(), stats))
+        stats['imported'] += get_db_executor().write(
+            transactions.create_transactions, rows, batch_size=Config.IMPORT_BATCH_SIZE
+        ).result()
+    return jsonify(stats)
+
+@app.errorhandler(413)
+def request_too_large(error):
+    return jsonify({'error': f'Request bodies are limited to {Config.MAX_CONTENT_LENGTH} bytes.'}), 413
+
+def admin_required(view):
+    """Require X-Admin-Token to match ADMIN_TOKEN; admin endpoints are off while it is unset"""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if not Config.ADMIN_TOKEN:
+            return jsonify({'error': 'Admin endpoints are disabled; set ADMIN_TOKEN.'}), 503
+        token = request.headers.get('X-Admin-Token', '')
+        if not hmac.compare_digest(token.encode(), Config.ADMIN_TOKEN.encode()):
+            return jsonify({'error': 'Invalid admin token.'}), 403
+        return view(*args, **kwargs)
+    return wrapper
+
+@app.route('/metrics')
+@admin_required
+def prometheus_metrics():
+    """Request, stage and query metrics in the Prometheus text format"""
+    return Response(metrics.registry.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/snapshot', methods=['POST'])
+@admin_required
+def take_snapshot():
+    """Snapshot the database to SNAPSHOT_STORE now (skipped when nothing changed)"""
+    if get_snapshotter() is None:
+        return jsonify({'error': 'Snapshots are off; set SNAPSHOT_STORE.'}), 404
+    # The backup only sees committed transactions, so writes carry on meanwhile
+    uploaded = get_snapshotter().snapshot()
+    return jsonify({'snapshots': uploaded})
+
+@app.route('/api/warmup')
+def warmup():
+    """Build every lazily initialized component now (e.g. from a scheduled ping after deploy)"""
+    start = timer.perf_counter()
+    built = warm_up()
+    return jsonify({'built': built, 'ms': round((timer.perf_counter() - start) * 1000, 1)})
+
+@app.route('/api/responses')
+@admin_required
+def list_responses():
+    return jsonify({'responses': [dict(row) for row in get_response_gen().get_predefined_responses()]})
+
+@app.route('/api/responses/<response_type>', methods=['PUT'])
+@admin_required
+def update_response(response_type):
+    payload = request.get_json(silent=True) or {}
+    response_text = payload.get('response_text', '').strip()
+    if not response_text:
+        return jsonify({'error': 'response_text is required.'}), 400
+    
+    if not get_response_gen().update_predefined_response(response_type, response_text, payload.get('keywords')):
+        return jsonify({'error': 'Response type not found.'}), 404
+    if get_snapshotter() is not None:
+        get_snapshotter().mark_dirty()
+    return jsonify({'response_type': response_type, 'response_text': response_text})
+
+def category_to_dict(category):
+    return {
+        'category_id': category['category_id'],
+        'category_name': category['category_name'],
+        'category_type': category['category_type'],
+        'keywords': [k for k in (category['keywords'] or '').split(',') if k]
+    }
+
+CATEGORY_FIELDS = ('category_name', 'category_type', 'keywords')
+
+def validate_category_payload(payload, partial=False):
+    if not isinstance(payload, dict):
+        return 'Expected a JSON object.'
+    unknown = sorted(set(payload) - set(CATEGORY_FIELDS))
+    if unknown:
+        return f"Unknown field(s): {', '.join(unknown)}."
+    if 'category_name' in payload or not partial:
+        name = payload.get('category_name')
+        if not isinstance(name, str) or not name.strip():
+            return 'category_name must be a non-empty string.'
+    if 'category_type' in payload or not partial:
+        if payload.get('category_type') not in ('expense', 'savings'):
+            return "category_type must be 'expense' or 'savings'."
+    keywords = payload.get('keywords', '')
+    if not isinstance(keywords, str) and not (
+        isinstance(keywords, list) and all(isinstance(k, str) for k in keywords)
+    ):
+        return 'keywords must be a string or a list of strings.'
+    if partial and not payload:
+        return f"Nothing to update; send any of {', '.join(CATEGORY_FIELDS)}."
+    return None
+
+@app.route('/api/categories')
+def list_categories():
+    return jsonify({'categories': [category_to_dict(c) for c in get_category_model().get_all_categories()]})
+
+@app.route('/api/categories', methods=['POST'])
+@admin_required
+def create_category():
+    payload = request.get_json(silent=True) or {}
+    error = validate_category_payload(payload)
+    if error:
+        return jsonify({'error': error}), 400
+    
+    try:
+        category = get_category_model().create_category(
+            payload['category_name'].strip(),
+            payload['category_type'],
+            payload.get('keywords', '')
+        )
+    except sqlite3.IntegrityError:
+        return jsonify({'error': 'A category with that name already exists.'}), 409
+    
+    return jsonify(category_to_dict(category)), 201
+
+@app.route('/api/categories/<int:category_id>', methods=['PUT'])
+@admin_required
+def update_category(category_id):
+    payload = request.get_json(silent=True) or {}
+    error = validate_category_payload(payload, partial=True)
+    if error:
+        return jsonify({'error': error}), 400
+    
+    updates = {field: payload[field] for field in CATEGORY_FIELDS if field in payload}
+    if 'category_name' in updates:
+        updates['category_name'] = updates['category_name'].strip()
+    try:
+        category = get_category_model().update_category(category_id, **updates)
+    except sqlite3.IntegrityError:
+        return jsonify({'error': 'A category with that name already exists.'}), 409
+    
+    if category is None:
+        return jsonify({'error': 'Category not found.'}), 404
+    
+    return jsonify(category_to_dict(category))
+
 if __name__ == '__main__':
+    # A long-running server pays the startup cost before serving
+    warm_up()
     app.run(debug=True, port=5000)
 
 # For Vercel deployment - export app at module level
@@ -0,0 +1,152 @@
+"""ASGI entry point: non-blocking /chat and /api/summary, Flask for the rest.
+
+    pip install asgiref uvicorn
+    uvicorn asgi:application
+
+/chat and /api/summary/<period> are handled natively here, so the event
+loop never waits on SQLite: their database work runs on app.db_executor
+(a bounded reader pool and the single writer thread). Every other route is
+passed through to the Flask app via asgiref's WSGI adapter. The plain WSGI
+entry point (app.py) keeps working unchanged for Vercel and `python app.py`.
+
+With MULTI_USER, only requests carrying a bearer token take the native
+path; session-cookie (browser) requests go through Flask, which owns the
+session. Native requests are traced into the same metrics as Flask's
+(see monitoring/metrics.py), under the Flask endpoint names.
+"""
+import json
+from urllib.parse import parse_qs
+
+try:
+    from asgiref.wsgi import WsgiToAsgi
+except ImportError as exc:  # pragma: no cover - optional dependency
+    raise ImportError('The ASGI entry point needs asgiref: pip install asgiref') from exc
+
+from app import (
+    app, chart_options, get_db_executor, gzip_body, handle_chat, shutdown, summary_body, user_id_for_token, warm_up
+)
+from config import Config
+from monitoring import metrics
+
+flask_application = WsgiToAsgi(app)
+
+SUMMARY_PREFIX = '/api/summary/'
+
+
+async def read_body(receive):
+    body = b''
+    while True:
+        message = await receive()
+        body += message.get('body', b'')
+        if not message.get('more_body'):
+            return body
+
+
+async def send_response(send, status, body, content_type=b'application/json', headers=()):
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', content_type), (b'content-length', str(len(body)).encode())]
+                   + list(headers)
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+def request_user_id(scope):
+    """User id for the native handlers, or None to let Flask resolve the session"""
+    if not Config.MULTI_USER:
+        return Config.DEFAULT_USER_ID
+    auth = dict(scope['headers']).get(b'authorization', b'').decode('latin-1')
+    if auth.startswith('Bearer ') and auth[7:].strip():
+        return user_id_for_token(auth[7:].strip())
+    return None
+
+
+async def chat(receive, send, user_id):
+    try:
+        payload = json.loads(await read_body(receive) or b'{}')
+        user_message = payload.get('message', '')
+    except (ValueError, AttributeError):
+        await send_response(send, 400, b'{"error": "Invalid JSON body."}')
+        return 400
+
+    if not user_message:
+        result = {'response': 'Please enter a message.'}
+    else:
+        result = await get_db_executor().run_read(handle_chat, user_message, user_id)
+    await send_response(send, 200, json.dumps(result).encode('utf-8'))
+    return 200
+
+
+def summary_response(period, user_id, max_points, compact, accept_encoding):
+    """summary_body plus gzip_body, together on the executor so compression stays off the event loop"""
+    return gzip_body(*summary_body(period, user_id, max_points, compact), accept_encoding)
+
+
+async def summary(scope, send, user_id):
+    """Same query parameters, validation, gzip and ETags as the Flask get_summary route"""
+    period = scope['path'][len(SUMMARY_PREFIX):]
+    query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+    try:
+        max_points, compact = chart_options({key: values[0] for key, values in query.items()})
+    except ValueError as exc:
+        await send_response(send, 400, json.dumps({'error': str(exc)}).encode('utf-8'))
+        return 400
+
+    headers = dict(scope['headers'])
+    body, etag, gzipped = await get_db_executor().run_read(
+        summary_response, period, user_id, max_points, compact,
+        headers.get(b'accept-encoding', b'').decode('latin-1')
+    )
+    quoted = f'"{etag}"'.encode()
+    response_headers = [(b'etag', quoted), (b'vary', b'Accept-Encoding')]
+
+    if_none_match = headers.get(b'if-none-match', b'')
+    if quoted in [tag.strip() for tag in if_none_match.split(b',')]:
+        await send({'type': 'http.response.start', 'status': 304, 'headers': response_headers})
+        await send({'type': 'http.response.body', 'body': b''})
+        return 304
+
+    if gzipped:
+        response_headers.append((b'content-encoding', b'gzip'))
+    await send_response(send, 200, body, headers=response_headers)
+    return 200
+
+
+async def traced(endpoint, handler, *args):
+    trace, token = metrics.start_trace(endpoint)
+    status = 500
+    try:
+        status = await handler(*args)
+    finally:
+        metrics.finish_trace(trace, token, status)
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            # Build the app's lazily initialized components before taking traffic
+            warm_up()
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            shutdown()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+        return
+
+    if scope['type'] == 'http':
+        user_id = request_user_id(scope)
+        if user_id is not None and scope['path'] == '/chat' and scope['method'] == 'POST':
+            await traced('chat', chat, receive, send, user_id)
+            return
+        if user_id is not None and scope['path'].startswith(SUMMARY_PREFIX) and scope['method'] == 'GET':
+            await traced('get_summary', summary, scope, send, user_id)
+            return
+
+    await flask_application(scope, receive, send)
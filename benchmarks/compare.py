@@ -0,0 +1,62 @@
+"""Compare two benchmark result files and flag regressions.
+
+Usage:
+    python benchmarks/compare.py base.json new.json [--threshold 10] [--min-ms 0.1]
+
+Prints every metric present in both runs with its relative change,
+oriented so that positive means better. Metrics that got worse by more
+than --threshold percent are marked REGRESSION and make the exit status 1,
+so the comparison can gate a CI job. Latencies whose base value is under
+--min-ms are still listed but never flagged: at that size the run-to-run
+jitter of a shared machine is larger than any real change. Compare runs
+made on the same host at the same scale.
+"""
+import argparse
+import json
+import sys
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(base, new, threshold, min_ms=0.0):
+    """[(name, base value, new value, improvement %, regressed)] for metrics in both runs"""
+    rows = []
+    for name, current in new['results'].items():
+        previous = base['results'].get(name)
+        if previous is None or not previous['value']:
+            continue
+        change = (current['value'] - previous['value']) / previous['value'] * 100
+        improvement = change if current['better'] == 'higher' else -change
+        regressed = improvement < -threshold and not (previous['unit'] == 'ms' and previous['value'] < min_ms)
+        rows.append((name, previous['value'], current['value'], improvement, regressed))
+    return rows
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('base')
+    arg_parser.add_argument('new')
+    arg_parser.add_argument('--threshold', type=float, default=10.0, help='allowed slowdown in percent')
+    arg_parser.add_argument('--min-ms', type=float, default=0.1, help='never flag latencies faster than this')
+    args = arg_parser.parse_args()
+
+    base, new = load(args.base), load(args.new)
+    for key in ('rows', 'users', 'days', 'seed'):
+        if base['meta'].get(key) != new['meta'].get(key):
+            print(f"warning: {key} differs ({base['meta'].get(key)} vs {new['meta'].get(key)})", file=sys.stderr)
+
+    rows = compare(base, new, args.threshold, args.min_ms)
+    print(f"{base['meta'].get('commit')} -> {new['meta'].get('commit')}")
+    print(f"{'metric':<40}{'base':>12}{'new':>12}{'better by':>11}")
+    for name, previous, current, improvement, regressed in rows:
+        flag = '  REGRESSION' if regressed else ''
+        print(f'{name:<40}{previous:>12.3f}{current:>12.3f}{improvement:>10.1f}%{flag}')
+
+    sys.exit(1 if any(row[4] for row in rows) else 0)
+
+
+if __name__ == '__main__':
+    main()
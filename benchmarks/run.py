@@ -0,0 +1,228 @@
+"""End-to-end benchmark suite: parsing, inserts, summaries, charts and HTTP endpoints.
+
+Usage:
+    python benchmarks/run.py [--rows 100000] [--users 10] [--days 365] [--repeat 30]
+                             [--only parse,summary] [--output results.json]
+    python benchmarks/compare.py base.json results.json
+
+Builds a seeded synthetic database (benchmarks/synthetic.py) of 10k-10M
+rows in a temporary directory, points the app at it and runs each case.
+Results are written as JSON: ``meta`` (commit, versions, scale) and a
+flat ``results`` map of metric name -> {value, unit, better}, which
+compare.py diffs between two runs. The single-user app serves the first
+(heaviest) synthetic user.
+"""
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import build_database, generate_messages, generate_transactions
+from config import Config
+
+PERIODS = ['today', 'week', 'month', 'year']
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * q / 100), len(ordered) - 1)]
+
+
+def latency(name, fn, repeat, results):
+    """Time fn `repeat` times after one warm-up call; records name.p50_ms and name.p95_ms"""
+    fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    results[f'{name}.p50_ms'] = metric(statistics.median(samples) * 1000, 'ms', 'lower')
+    results[f'{name}.p95_ms'] = metric(percentile(samples, 95) * 1000, 'ms', 'lower')
+
+
+def metric(value, unit, better):
+    return {'value': round(value, 4), 'unit': unit, 'better': better}
+
+
+def bench_parse(ctx, results):
+    parser = ctx.app.parser
+    messages = generate_messages(ctx.args.messages, seed=1)
+    for message in messages[:200]:
+        parser.parse_message(message)
+    start = time.perf_counter()
+    for message in messages:
+        parser.parse_message(message)
+    elapsed = time.perf_counter() - start
+    results['parse.messages_per_sec'] = metric(len(messages) / elapsed, 'msg/s', 'higher')
+    latency('parse.single', lambda: parser.parse_message(messages[0]), ctx.args.repeat * 10, results)
+
+
+def bench_summary(ctx, results):
+    reports = ctx.app.report_gen
+    for period in PERIODS:
+        latency(f'summary.{period}', lambda: reports.generate_summary(period), ctx.args.repeat, results)
+
+
+def bench_charts(ctx, results):
+    app = ctx.app
+    chart_gen = app.chart_gen
+    transactions = app.transaction_model
+    _, data = app.report_gen.generate_summary('year')
+    end = datetime.now()
+    start = end - timedelta(days=ctx.args.days)
+    _, report = app.report_gen.generate_report(start, end, 'day')
+
+    latency('charts.pie', lambda: chart_gen.generate_category_pie_chart(data['category_breakdown']),
+            ctx.args.repeat, results)
+    latency('charts.daily_trend_year', lambda: chart_gen.generate_daily_spending_trend(
+        transactions.get_daily_totals(data['start_date'], data['end_date']), max_points=Config.CHART_MAX_POINTS
+    ), ctx.args.repeat, results)
+    latency('charts.bucket_comparison_daily', lambda: chart_gen.generate_bucket_comparison(
+        report['buckets'], max_points=Config.CHART_MAX_POINTS
+    ), ctx.args.repeat, results)
+    latency('charts.summary_payload_year', lambda: app.build_summary_payload('year'), ctx.args.repeat, results)
+
+
+def bench_http(ctx, results):
+    app = ctx.app
+    client = app.app.test_client()
+    repeat = ctx.args.repeat
+
+    def get(path):
+        response = client.get(path)
+        assert response.status_code == 200, (path, response.status_code)
+
+    def chat(message):
+        response = client.post('/chat', json={'message': message})
+        assert response.status_code == 200, (message, response.status_code)
+
+    latency('http.chat_record', lambda: chat('spent 120 on lunch'), repeat, results)
+    latency('http.chat_query', lambda: chat('how much did I spend this week?'), repeat, results)
+    for period in ('today', 'month', 'year'):
+        def cold(period=period):
+            app.summary_cache.clear()
+            get(f'/api/summary/{period}')
+        latency(f'http.summary_{period}_cold', cold, repeat, results)
+        latency(f'http.summary_{period}_warm', lambda period=period: get(f'/api/summary/{period}'),
+                repeat, results)
+    def report_cold():
+        app.summary_cache.clear()
+        get('/api/report?range=last_365_days')
+    latency('http.report_year_cold', report_cold, repeat, results)
+    latency('http.transactions_page', lambda: get('/api/transactions?limit=50'), repeat, results)
+    latency('http.recent', lambda: get('/api/transactions/recent'), repeat, results)
+
+
+def bench_insert(ctx, results):
+    transactions = ctx.app.transaction_model
+    now = datetime.now()
+    count = ctx.args.inserts
+    start = time.perf_counter()
+    for i in range(count):
+        transactions.create_transaction('expense', 50 + i % 100, 1 + i % 8, 'bench insert', now)
+    results['insert.single_rows_per_sec'] = metric(count / (time.perf_counter() - start), 'rows/s', 'higher')
+
+    rows = [row[:5] for row in generate_transactions(count * 10, seed=2)]
+    start = time.perf_counter()
+    transactions.create_transactions(rows, batch_size=Config.IMPORT_BATCH_SIZE)
+    results['insert.bulk_rows_per_sec'] = metric(len(rows) / (time.perf_counter() - start), 'rows/s', 'higher')
+
+
+# Inserts run last so they don't change the data the read cases see
+CASES = {
+    'parse': bench_parse,
+    'summary': bench_summary,
+    'charts': bench_charts,
+    'http': bench_http,
+    'insert': bench_insert,
+}
+
+
+class Context:
+    def __init__(self, app, args):
+        self.app = app
+        self.args = args
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--rows', type=int, default=100000, help='synthetic transactions (10k-10M)')
+    arg_parser.add_argument('--users', type=int, default=10)
+    arg_parser.add_argument('--days', type=int, default=365)
+    arg_parser.add_argument('--seed', type=int, default=0)
+    arg_parser.add_argument('--repeat', type=int, default=30, help='samples per latency metric')
+    arg_parser.add_argument('--messages', type=int, default=20000, help='messages for parse throughput')
+    arg_parser.add_argument('--inserts', type=int, default=2000, help='single inserts (bulk inserts 10x)')
+    arg_parser.add_argument('--only', help=f'comma-separated cases ({", ".join(CASES)})')
+    arg_parser.add_argument('--output', help='write JSON here (default: stdout)')
+    args = arg_parser.parse_args()
+
+    selected = args.only.split(',') if args.only else list(CASES)
+    unknown = [name for name in selected if name not in CASES]
+    if unknown:
+        arg_parser.error(f'unknown case(s): {", ".join(unknown)}')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        Config.DATABASE_PATH = os.path.join(tmp, 'benchmark.db')
+        print(f'building {args.rows:,} rows for {args.users} users...', file=sys.stderr)
+        data = build_database(Config.DATABASE_PATH, args.rows, args.users, args.days, args.seed)
+
+        start = time.perf_counter()
+        import app as app_module
+        results = {
+            'data.load_rows_per_sec': metric(data['load_rows_per_sec'], 'rows/s', 'higher'),
+            'app.import_ms': metric((time.perf_counter() - start) * 1000, 'ms', 'lower'),
+        }
+        ctx = Context(app_module, args)
+        for name in selected:
+            print(f'running {name}...', file=sys.stderr)
+            CASES[name](ctx, results)
+        app_module.db.close_all()
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+            'rows': args.rows,
+            'users': args.users,
+            'days': args.days,
+            'seed': args.seed,
+            'repeat': args.repeat,
+            'db_bytes': data['db_bytes'],
+            'build_seconds': round(data['seconds'], 2),
+            'cases': selected,
+        },
+        'results': results,
+    }
+    text = json.dumps(report, indent=2, sort_keys=False)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+        print(f'wrote {args.output}', file=sys.stderr)
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
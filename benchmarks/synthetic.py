@@ -0,0 +1,136 @@
+"""Synthetic users, transactions and chat messages for the benchmark suite.
+
+Everything is seeded, so the same arguments build the same database and
+message stream on every commit. Users get a Zipf-like share of the rows
+(the first user, ``Config.DEFAULT_USER_ID``, is the heaviest, and is the
+one the single-user app serves). Dates are spread uniformly over the last
+``days`` days.
+
+``build_database`` bulk-loads straight through sqlite3 at the latest
+schema: the transaction indexes and rollup triggers are dropped for the
+load, then the indexes are rebuilt and the rollups backfilled once at the
+end, which is several times faster than maintaining them row by row.
+"""
+import bisect
+import os
+import random
+import sqlite3
+import time
+from datetime import datetime
+
+from config import Config
+from database.epoch import to_epoch
+from database.migrations import migrate
+from database.rollups import backfill_rollups, create_rollups, drop_rollups
+
+DESCRIPTIONS = {
+    'expense': ['spent {} on lunch', 'paid {} for the jeep fare', 'bought groceries for {}',
+                'spent {} on electricity bill', 'paid {} for movie tickets', 'coffee {}',
+                'paid {} for medicine', 'bought school books for {}'],
+    'savings': ['saved {}', 'received salary {}', 'got a gift of {}'],
+}
+
+MESSAGE_TEMPLATES = [
+    # (weight, template)
+    (30, 'spent {amount} on lunch'), (10, 'I spent {amount} pesos on groceries today'),
+    (10, 'paid {amount} for the jeep fare'), (5, 'bought new shoes for {amount}'),
+    (5, 'paid {amount} php electricity bill'), (5, 'saved {amount}'),
+    (3, 'received salary {amount}'), (2, 'got {amount} as a gift'),
+    (6, 'show today summary'), (5, 'how much did I spend this week?'),
+    (3, 'display monthly report'), (2, 'show this year'),
+    (3, 'hello'), (2, 'help'), (2, 'how can i save money?'),
+    (2, 'update {amount} in food on december {day}'), (2, 'spent on food'),
+    (2, 'spent {amount} and saved {amount}'), (1, 'asdf qwerty'),
+]
+
+
+def user_ids(count):
+    """The default user first, then user-0001, user-0002, ..."""
+    return [Config.DEFAULT_USER_ID] + [f'user-{i:04d}' for i in range(1, count)]
+
+
+def generate_transactions(count, users=1, days=365, seed=0, end=None):
+    """Yield (transaction_type, amount, category_id, description, epoch date, user_id) rows"""
+    rng = random.Random(seed)
+    ids = user_ids(users)
+    cumulative = []
+    total = 0.0
+    for rank in range(users):
+        total += 1 / (rank + 1)
+        cumulative.append(total)
+
+    end_epoch = to_epoch(end or datetime.now())
+    span = days * 86400
+    category_count = len(Config.DEFAULT_CATEGORIES)
+    expense_templates = DESCRIPTIONS['expense']
+    savings_templates = DESCRIPTIONS['savings']
+
+    for _ in range(count):
+        user_id = ids[bisect.bisect_left(cumulative, rng.random() * total)]
+        if rng.random() < 0.85:
+            transaction_type, templates = 'expense', expense_templates
+        else:
+            transaction_type, templates = 'savings', savings_templates
+        amount = round(rng.uniform(10, 2000), 2)
+        description = templates[rng.randrange(len(templates))].format(amount)
+        yield (transaction_type, amount, rng.randint(1, category_count), description,
+               end_epoch - rng.randrange(span), user_id)
+
+
+def generate_messages(count, seed=0):
+    """Chat messages with a realistic mix of records, queries and small talk"""
+    rng = random.Random(seed)
+    weights = [weight for weight, _ in MESSAGE_TEMPLATES]
+    templates = [template for _, template in MESSAGE_TEMPLATES]
+    return [
+        template.format(amount=rng.randint(10, 5000), day=rng.randint(1, 28))
+        for template in rng.choices(templates, weights, k=count)
+    ]
+
+
+def build_database(path, rows, users=1, days=365, seed=0, batch_size=50000):
+    """Create a database at `path` holding `rows` synthetic transactions; returns load stats"""
+    start = time.perf_counter()
+    conn = sqlite3.connect(path)
+    migrate(conn)
+    conn.execute('PRAGMA journal_mode = WAL')
+    conn.execute('PRAGMA synchronous = OFF')
+
+    cursor = conn.cursor()
+    cursor.execute('BEGIN')
+    indexes = cursor.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = 'transactions' AND sql IS NOT NULL"
+    ).fetchall()
+    for name, _ in indexes:
+        cursor.execute(f'DROP INDEX {name}')
+    drop_rollups(cursor)
+    conn.commit()
+
+    generated = generate_transactions(rows, users=users, days=days, seed=seed)
+    query = ('INSERT INTO transactions (transaction_type, amount, category_id, description, date, user_id) '
+             'VALUES (?, ?, ?, ?, ?, ?)')
+    while True:
+        batch = [row for _, row in zip(range(batch_size), generated)]
+        if not batch:
+            break
+        conn.executemany(query, batch)
+        conn.commit()
+    load_seconds = time.perf_counter() - start
+
+    cursor.execute('BEGIN')
+    for _, sql in indexes:
+        cursor.execute(sql)
+    create_rollups(cursor)
+    backfill_rollups(cursor)
+    conn.commit()
+    conn.close()
+
+    seconds = time.perf_counter() - start
+    return {
+        'rows': rows,
+        'users': users,
+        'days': days,
+        'seconds': seconds,
+        'load_rows_per_sec': rows / load_seconds if load_seconds else 0.0,
+        'db_bytes': os.path.getsize(path),
+    }
@@ -1,6 +1,7 @@
 """Chatbot package initializer."""
 
 __all__ = [
+    'importer',
     'message_parser',
     'patterns',
     'response_generator'
@@ -0,0 +1,190 @@
+"""Amount and date extraction, with every pattern compiled once at import.
+
+Dates are resolved against ``now()``; tests and replays can pin it with
+``set_clock`` or pass ``now=`` to ``extract_date`` directly.
+"""
+import re
+from datetime import datetime, timedelta
+
+from database.epoch import app_now
+
+_clock = app_now
+
+
+def set_clock(clock=None):
+    """Use clock() as the current time for relative dates (None restores app_now)"""
+    global _clock
+    _clock = clock or app_now
+
+
+def now():
+    return _clock()
+
+
+MONTHS = {
+    'january': 1, 'jan': 1,
+    'february': 2, 'feb': 2,
+    'march': 3, 'mar': 3,
+    'april': 4, 'apr': 4,
+    'may': 5,
+    'june': 6, 'jun': 6,
+    'july': 7, 'jul': 7,
+    'august': 8, 'aug': 8,
+    'september': 9, 'sep': 9, 'sept': 9,
+    'october': 10, 'oct': 10,
+    'november': 11, 'nov': 11,
+    'december': 12, 'dec': 12
+}
+
+WEEKDAYS = {
+    'monday': 0, 'mon': 0,
+    'tuesday': 1, 'tue': 1, 'tues': 1,
+    'wednesday': 2, 'wed': 2,
+    'thursday': 3, 'thu': 3, 'thur': 3, 'thurs': 3,
+    'friday': 4, 'fri': 4,
+    'saturday': 5, 'sat': 5,
+    'sunday': 6, 'sun': 6
+}
+
+
+def _alternation(words):
+    # Longest first so 'sept' wins over 'sep' and 'june' over 'jun'
+    return '|'.join(sorted(words, key=len, reverse=True))
+
+
+# 1,250 / 1250 / 12.50 / 1.5k / 2k, optionally followed by a currency word. The
+# pattern starts with a plain digit (the "not inside a number" check comes right
+# after it) so the regex engine can skip ahead to digits instead of trying a
+# lookbehind at every position.
+AMOUNT_REGEX = re.compile(
+    r'(\d(?<![\d,]\d)(?:\d{0,2}(?:,\d{3})+|\d*))(\.\d{1,2})?(?:\s*(k)\b)?\s*(?:pesos?|php|₱)?',
+    re.IGNORECASE
+)
+
+ISO_DATE_REGEX = re.compile(r'\b(\d{4})-(\d{1,2})-(\d{1,2})\b')
+
+RELATIVE_DAY_REGEX = re.compile(r'\b(today|yesterday)\b', re.IGNORECASE)
+
+DAYS_AGO_REGEX = re.compile(r'\b(\d{1,3}|a)\s+days?\s+ago\b', re.IGNORECASE)
+
+WEEKDAY_REGEX = re.compile(
+    rf'\b(last\s+)?({_alternation(WEEKDAYS)})\b',
+    re.IGNORECASE
+)
+
+MONTH_DAY_REGEX = re.compile(
+    rf'\b(?:on\s+)?({_alternation(MONTHS)})\b\.?\s*(\d{{1,2}})?(?:st|nd|rd|th)?\b(?:,?\s*(\d{{4}}))?',
+    re.IGNORECASE
+)
+
+# A month name ending exactly where a number starts ("dec 25", "march 3")
+MONTH_BEFORE_REGEX = re.compile(rf'\b({_alternation(MONTHS)})\b\.?\s*$', re.IGNORECASE)
+
+
+# Every date form needs one of these words, or a '-' for ISO dates
+DATE_WORDS = frozenset(MONTHS) | frozenset(WEEKDAYS) | {'today', 'yesterday', 'ago'}
+WORD_REGEX = re.compile(r'[a-z]+')
+
+
+def _may_have_date(message):
+    """Cheap pre-check that lets most messages skip the date regexes"""
+    return '-' in message or not DATE_WORDS.isdisjoint(WORD_REGEX.findall(message.lower()))
+
+
+def _midnight(moment):
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _find_date(message, current):
+    """Return (datetime, span) for the first supported date form, or (None, None)"""
+    if not _may_have_date(message):
+        return None, None
+
+    m = ISO_DATE_REGEX.search(message)
+    if m:
+        try:
+            return datetime(int(m.group(1)), int(m.group(2)), int(m.group(3))), m.span()
+        except ValueError:
+            return None, m.span()
+
+    m = RELATIVE_DAY_REGEX.search(message)
+    if m:
+        days = 0 if m.group(1).lower() == 'today' else 1
+        return _midnight(current) - timedelta(days=days), m.span()
+
+    m = DAYS_AGO_REGEX.search(message)
+    if m:
+        days = 1 if m.group(1).lower() == 'a' else int(m.group(1))
+        return _midnight(current) - timedelta(days=days), m.span()
+
+    m = WEEKDAY_REGEX.search(message)
+    if m:
+        back = (current.weekday() - WEEKDAYS[m.group(2).lower()]) % 7
+        if m.group(1) and back == 0:
+            # "last friday" said on a Friday means a week ago
+            back = 7
+        return _midnight(current) - timedelta(days=back), m.span()
+
+    m = MONTH_DAY_REGEX.search(message)
+    if m:
+        month = MONTHS[m.group(1).lower()]
+        day = int(m.group(2)) if m.group(2) else 1
+        year = int(m.group(3)) if m.group(3) else current.year
+        try:
+            return datetime(year, month, day), m.span()
+        except ValueError:
+            return None, m.span()
+
+    return None, None
+
+
+def extract_date(message, now=None):
+    """Extract a date: ISO (2024-12-01), today/yesterday, 'N days ago',
+    '[last] friday', or 'december 1[, 2024]'. Returns a datetime at
+    midnight or None.
+    """
+    date, _ = _find_date(message, now or _clock())
+    return date
+
+
+def _date_number_span(message, start, end):
+    """Span of the date that the number at [start, end) is part of, or None
+
+    Plain string checks decide first whether a date form is possible at all,
+    so the regexes only run for the few numbers that could be one.
+    """
+    m = None
+    if message[end:end + 1] == '-':
+        m = ISO_DATE_REGEX.match(message, start)
+    elif 'ago' in message:
+        m = DAYS_AGO_REGEX.match(message, start)
+    if m:
+        return m.span()
+
+    # Day of a month-day date: a month name right before the number
+    before = message[max(0, start - 12):start].rstrip(' .').rsplit(None, 1)
+    if before and before[-1].lower() in MONTHS:
+        m = MONTH_BEFORE_REGEX.search(message, max(0, start - 12), start)
+        if m:
+            return MONTH_DAY_REGEX.match(message, m.start()).span()
+
+    return None
+
+
+def extract_amount(message):
+    """Extract the first monetary amount, skipping numbers that belong to a date"""
+    position = 0
+    while True:
+        m = AMOUNT_REGEX.search(message, position)
+        if not m:
+            return None
+
+        date_span = _date_number_span(message, m.start(1), m.end(1))
+        if date_span:
+            position = max(date_span[1], m.end(1))
+            continue
+
+        amount = float(m.group(1).replace(',', '') + (m.group(2) or ''))
+        if m.group(3):
+            amount *= 1000
+        return amount
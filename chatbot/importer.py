@@ -0,0 +1,34 @@
+"""Bulk import of chat logs: parse every line, store the recorded transactions."""
+
+
+def parse_rows(lines, parser, stats):
+    """Yield a create_transactions row for every 'record_transaction' among lines.
+
+    Counts parsed and skipped lines into stats as it goes; no database writes
+    happen here, so the parsing can run off the writer thread.
+    """
+    for parsed in parser.parse_many(lines):
+        stats['lines'] += 1
+        if parsed['intent'] != 'record_transaction':
+            stats['skipped'] += 1
+            continue
+        yield (
+            parsed['action'],
+            parsed['amount'],
+            parsed['category_id'],
+            parsed['description'],
+            parsed['date']
+        )
+
+
+def import_messages(lines, parser, transaction_model, batch_size=500):
+    """Parse lines and bulk insert every 'record_transaction' among them.
+
+    Lines are streamed through MessageParser.parse_many and inserted in
+    batches, so memory stays flat regardless of input size. Returns counts
+    of parsed lines, imported transactions and skipped lines.
+    """
+    stats = {'lines': 0, 'imported': 0, 'skipped': 0}
+    rows = parse_rows(lines, parser, stats)
+    stats['imported'] = transaction_model.create_transactions(rows, batch_size=batch_size)
+    return stats
@@ -0,0 +1,132 @@
+"""Word-boundary keyword index for category matching.
+
+Single-word keywords live in a token hash; multi-word keywords live in a
+token trie. Matching walks the message's tokens once, so "ate" no longer
+matches inside "update". Categories can be added, replaced or removed
+one at a time without re-reading the others; ``with_category`` applies the
+change to a copy, so threads matching against the current index never see
+it half-updated.
+"""
+import re
+
+TOKEN_PATTERN = re.compile(r"[^\W_]+(?:'[^\W_]+)?")
+
+# Marks the end of a phrase in a trie node
+_PHRASE_END = None
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def _copy_trie(node):
+    return {token: child if token is _PHRASE_END else _copy_trie(child) for token, child in node.items()}
+
+
+class KeywordIndex:
+    def __init__(self):
+        # token or phrase tuple -> {category_id: category_info}
+        self._owners = {}
+        self._words = {}
+        self._trie = {}
+        self._category_keywords = {}
+
+    @classmethod
+    def from_categories(cls, categories):
+        index = cls()
+        for category in categories:
+            index.set_category(category)
+        return index
+
+    def with_category(self, category):
+        """A copy of this index with set_category applied; this one is left unchanged"""
+        index = KeywordIndex()
+        index._owners = {key: dict(owners) for key, owners in self._owners.items()}
+        index._words = dict(self._words)
+        index._trie = _copy_trie(self._trie)
+        index._category_keywords = dict(self._category_keywords)
+        index.set_category(category)
+        return index
+
+    def __len__(self):
+        return len(self._owners)
+
+    def set_category(self, category):
+        """Add a category row (or replace its keywords if already indexed)"""
+        self.remove_category(category['category_id'])
+
+        info = {
+            'category_id': category['category_id'],
+            'category_name': category['category_name'],
+            'category_type': category['category_type']
+        }
+        keys = set()
+        for keyword in (category['keywords'] or '').split(','):
+            tokens = tuple(tokenize(keyword))
+            if tokens:
+                keys.add(tokens)
+
+        for key in keys:
+            self._owners.setdefault(key, {})[info['category_id']] = info
+            self._refresh_key(key)
+        self._category_keywords[info['category_id']] = keys
+
+    def remove_category(self, category_id):
+        for key in self._category_keywords.pop(category_id, ()):
+            owners = self._owners.get(key, {})
+            owners.pop(category_id, None)
+            if not owners:
+                self._owners.pop(key, None)
+            self._refresh_key(key)
+
+    def _refresh_key(self, key):
+        # A keyword shared by several categories resolves to the newest one,
+        # as the old keyword dict did when later categories overwrote it
+        owners = self._owners.get(key)
+        winner = owners[max(owners)] if owners else None
+
+        if len(key) == 1:
+            if winner:
+                self._words[key[0]] = winner
+            else:
+                self._words.pop(key[0], None)
+            return
+
+        if winner:
+            node = self._trie
+            for token in key:
+                node = node.setdefault(token, {})
+            node[_PHRASE_END] = winner
+        else:
+            self._prune(self._trie, key)
+
+    def _prune(self, node, key):
+        if not key:
+            node.pop(_PHRASE_END, None)
+            return not node
+        child = node.get(key[0])
+        if child is not None and self._prune(child, key[1:]):
+            del node[key[0]]
+        return not node
+
+    def match(self, message):
+        """Category info of the first keyword in the message (longest phrase wins)"""
+        tokens = tokenize(message)
+        for start, token in enumerate(tokens):
+            found = None
+            node = self._trie.get(token)
+            position = start + 1
+            while node is not None:
+                if _PHRASE_END in node:
+                    found = node[_PHRASE_END]
+                if position >= len(tokens):
+                    break
+                node = node.get(tokens[position])
+                position += 1
+
+            if found is not None:
+                return found
+            if token in self._words:
+                return self._words[token]
+
+        return None
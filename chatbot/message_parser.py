@@ -1,69 +1,132 @@
+import time
+from chatbot import extractors
 from chatbot.patterns import *
+from chatbot.keyword_index import KeywordIndex
+from chatbot.parse_cache import ParseCache, message_template
 from models.category import Category
-from datetime import datetime
+from config import Config
+from monitoring.metrics import timed
 
 
 class MessageParser:
-    def __init__(self):
-        self.category_model = Category()
-        self.categories_dict = self.category_model.get_categories_dict()
-
+    def __init__(self, db=None, category_model=None, cache_size=None):
+        # Classifications by message template; amounts and dates are re-extracted per message
+        self.cache = ParseCache(Config.PARSE_CACHE_SIZE if cache_size is None else cache_size)
+        self.category_model = category_model or Category(db)
+        self.category_model.add_listener(self._on_category_changed)
+        self.reload_categories()
+
+    def reload_categories(self):
+        """Rebuild the category keyword index from the database"""
+        # Read the version first: a change racing with the load only
+        # causes one extra reload on the next check
+        self.categories_version = self.category_model.get_version()
+        self.keyword_index = KeywordIndex.from_categories(self.category_model.get_all_categories())
+        self.cache.clear()
+        self._next_version_check = time.monotonic() + Config.VERSION_CHECK_INTERVAL
+
+    def refresh_categories(self, force=False):
+        """Reload if categories changed in another worker (checked at most once per interval)"""
+        now = time.monotonic()
+        if not force and now < self._next_version_check:
+            return
+        self._next_version_check = now + Config.VERSION_CHECK_INTERVAL
+        if self.category_model.get_version() != self.categories_version:
+            self.reload_categories()
+
+    def _on_category_changed(self, category, version):
+        # Only our own write since the last sync: patch that one category into
+        # a copy and swap it in, as requests may be matching against the old one
+        if version == self.categories_version + 1:
+            self.keyword_index = self.keyword_index.with_category(category)
+            self.categories_version = version
+            self.cache.clear()
+        else:
+            self.reload_categories()
+
+    @timed('parse')
     def parse_message(self, message):
         """Parse user message and extract all relevant information"""
-        result = {
-            'intent': None,
-            'amount': None,
-            'action': None,
-            'category_id': None,
-            'category_name': None,
-            'description': message,
-            'time_period': None,
-            'date': datetime.now()
-        }
+        if self.cache.max_entries <= 0:
+            return self._bind(self._classify(message), message)
+
+        # Picks up category edits from other workers (which clear the cache)
+        self.refresh_categories()
+        template = message_template(message)
+        classification = self.cache.get(template)
+        if classification is None:
+            classification = self._classify(message)
+            self.cache.put(template, classification)
+        return self._bind(classification, message)
+
+    def _classify(self, message):
+        """Everything about the message that does not depend on its numbers"""
+        # One pass over the message finds every keyword of every class
+        hits = scan_keywords(message)
 
         # Check for conflicting keywords first
-        has_conflict, conflicting_actions = has_conflicting_keywords(message)
+        has_conflict, conflicting_actions = has_conflicting_keywords(message, hits)
         if has_conflict:
-            result['intent'] = 'ambiguous'
-            result['conflicting_actions'] = conflicting_actions
-            return result
+            return {'intent': 'ambiguous', 'conflicting_actions': conflicting_actions}
 
         # Determine intent
-        if is_greeting(message):
-            result['intent'] = 'greeting'
-            return result
+        if is_greeting(message, hits):
+            return {'intent': 'greeting'}
 
-        if is_help_request(message):
-            result['intent'] = 'help'
-            return result
+        if is_help_request(message, hits):
+            return {'intent': 'help'}
 
-        if is_delete_request(message):
-            result['intent'] = 'delete'
-            return result
+        if is_delete_request(message, hits):
+            return {'intent': 'delete'}
 
-        if is_query(message):
-            result['intent'] = 'query'
-            result['time_period'] = extract_time_period(message)
-            return result
+        if is_query(message, hits):
+            return {'intent': 'query', 'time_period': extract_time_period(message, hits)}
 
         # Update intent (e.g. "update 250 in food on december 1")
-        if is_update_request(message):
-            amount = extract_amount(message)
-            category_info = self.match_category(message)
-            date = extract_date(message)
+        if is_update_request(message, hits):
+            return {'intent': 'update', 'category': self.match_category(message)}
 
-            result['intent'] = 'update'
-            result['amount'] = amount
-            if category_info:
-                result['category_id'] = category_info['category_id']
-                result['category_name'] = category_info['category_name']
+        # Recording, unless the message turns out to have no amount
+        action = extract_action(message, hits)
+        return {
+            'intent': None,
+            'action': action,
+            'category': self.match_category(message) if action else None,
+            # Intent when there is neither an amount nor an action
+            'fallback': 'advice' if is_advice_request(message, hits) else 'unknown'
+        }
+
+    def _bind(self, classification, message):
+        """Build the parse result from a classification and this message's amount and date"""
+        result = {
+            'intent': classification['intent'],
+            'amount': None,
+            'action': None,
+            'category_id': None,
+            'category_name': None,
+            'description': message,
+            'time_period': classification.get('time_period'),
+            'date': extractors.now()
+        }
+        intent = result['intent']
+        if intent == 'ambiguous':
+            result['conflicting_actions'] = list(classification['conflicting_actions'])
+            return result
+
+        if intent == 'update':
+            result['amount'] = extract_amount(message)
+            self._set_category(result, classification['category'])
+            date = extract_date(message)
             if date:
                 result['date'] = date
             return result
 
+        if intent is not None:
+            return result
+
         # Extract transaction details for recording
         amount = extract_amount(message)
-        action = extract_action(message)
+        action = classification['action']
 
         # Check if user has action keyword but no amount
         if action and not amount:
@@ -75,36 +138,32 @@ class MessageParser:
             result['intent'] = 'record_transaction'
             result['amount'] = amount
             result['action'] = action
-
-            # Match category
-            category_info = self.match_category(message)
-            if category_info:
-                result['category_id'] = category_info['category_id']
-                result['category_name'] = category_info['category_name']
-
-            return result
-
-        # Check if it's an advice request
-        if 'save' in message.lower() or 'advice' in message.lower() or 'tip' in message.lower():
-            result['intent'] = 'advice'
+            self._set_category(result, classification['category'])
+            # "spent 30 on dinner yesterday" is recorded on that day (at
+            # midnight); a date naming today keeps the current time
+            date = extract_date(message, now=result['date'])
+            if date and date.date() != result['date'].date():
+                result['date'] = date
             return result
 
-        result['intent'] = 'unknown'
+        # Advice request, or nothing we understand
+        result['intent'] = classification['fallback']
         return result
 
-    def match_category(self, message):
-        """Match message against category keywords"""
-        message_lower = message.lower()
-        words = message_lower.split()
-
-        # Check each word against keywords
-        for word in words:
-            if word in self.categories_dict:
-                return self.categories_dict[word]
+    @staticmethod
+    def _set_category(result, category_info):
+        if category_info:
+            result['category_id'] = category_info['category_id']
+            result['category_name'] = category_info['category_name']
 
-        # Check multi-word phrases
-        for keyword, category_info in self.categories_dict.items():
-            if keyword in message_lower:
-                return category_info
+    def parse_many(self, messages):
+        """Parse an iterable of messages lazily, skipping blank lines"""
+        for message in messages:
+            message = message.strip()
+            if message:
+                yield self.parse_message(message)
 
-        return None
\ No newline at end of file
+    def match_category(self, message):
+        """Match message against category keywords (whole words and phrases)"""
+        self.refresh_categories()
+        return self.keyword_index.match(message)
\ No newline at end of file
@@ -0,0 +1,69 @@
+"""Bounded LRU cache of message classifications, keyed by message template.
+
+Chat traffic repeats a handful of shapes ("spent 50 on lunch", "show today
+summary"), so ``MessageParser`` caches what a message *is* (intent, action,
+category, time period) under its template: the lowercased message with
+every standalone number replaced by ``#``. Amounts and dates are not
+cached; they are re-extracted from each message and bound to the cached
+classification.
+
+This is exact because keyword scanning and category matching are case
+insensitive and no intent keyword contains a digit. A purely numeric
+category keyword would break it; the parser clears the cache whenever the
+category index changes.
+"""
+import re
+import threading
+from collections import OrderedDict
+
+# A run of digits standing alone ("50", both halves of "12.50", "1,250"
+# and "2024-12-01"); digits inside a word ("7eleven", "2k") are kept
+NUMBER_TOKEN = re.compile(r'\b\d+\b')
+
+
+def message_template(message):
+    """'spent 1,250 on Lunch' -> 'spent #,# on lunch'"""
+    return NUMBER_TOKEN.sub('#', message.lower())
+
+
+class ParseCache:
+    """LRU cache of template -> classification with hit/miss counters"""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, template):
+        with self._lock:
+            entry = self._entries.get(template)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(template)
+            self.hits += 1
+            return entry
+
+    def put(self, template, classification):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[template] = classification
+            self._entries.move_to_end(template)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0
+        }
@@ -1,7 +1,5 @@
 import re
-
-# Regex patterns
-AMOUNT_PATTERN = r'(\d+(?:\.\d{1,2})?)\s*(?:pesos?|php|₱)?'
+from chatbot import extractors
 
 # Action keywords
 EXPENSE_KEYWORDS = [
@@ -43,75 +41,127 @@ GREETING_KEYWORDS = ['hello', 'hi', 'hey', 'good morning', 'good afternoon', 'go
 # Help keywords
 HELP_KEYWORDS = ['help', 'what can you do', 'commands', 'how to use']
 
+# Advice keywords (checked only after every other intent)
+ADVICE_KEYWORDS = ['save', 'advice', 'tip']
+
+# Every keyword list, by class, for the single-pass scanner
+KEYWORD_CLASSES = {
+    'expense': EXPENSE_KEYWORDS,
+    'savings': SAVINGS_KEYWORDS,
+    'query': QUERY_KEYWORDS,
+    'time_period': list(TIME_PERIODS),
+    'delete': DELETE_KEYWORDS,
+    'update': UPDATE_KEYWORDS,
+    'greeting': GREETING_KEYWORDS,
+    'help': HELP_KEYWORDS,
+    'advice': ADVICE_KEYWORDS,
+}
+
+
+def _build_keyword_scanner(keyword_classes):
+    """Compile all keyword lists into one lookahead alternation.
+
+    At each position the regex matches the longest keyword starting there.
+    Every other keyword starting at that position is a prefix of it, so
+    mapping each keyword to the (class, keyword) pairs of all its prefixes
+    reproduces plain substring semantics in a single pass.
+    """
+    owners = {}
+    for keyword_class, keywords in keyword_classes.items():
+        for keyword in keywords:
+            owners.setdefault(keyword, []).append(keyword_class)
+
+    expansions = {}
+    for keyword in owners:
+        expansions[keyword] = tuple(
+            (keyword_class, prefix)
+            for prefix, prefix_classes in owners.items()
+            if keyword.startswith(prefix)
+            for keyword_class in prefix_classes
+        )
+
+    alternation = '|'.join(re.escape(k) for k in sorted(owners, key=len, reverse=True))
+    # Cheap first-character test so most positions skip the alternation
+    first_chars = re.escape(''.join(sorted({k[0] for k in owners})))
+    return re.compile(f'(?=[{first_chars}])(?=({alternation}))'), expansions
+
+
+KEYWORD_SCANNER, KEYWORD_EXPANSIONS = _build_keyword_scanner(KEYWORD_CLASSES)
+
+
+def scan_keywords(message):
+    """Scan the message once; returns {class: set of keywords found}"""
+    hits = {}
+    for match in KEYWORD_SCANNER.finditer(message.lower()):
+        for keyword_class, keyword in KEYWORD_EXPANSIONS[match.group(1)]:
+            hits.setdefault(keyword_class, set()).add(keyword)
+    return hits
+
 def extract_amount(message):
-    """Extract monetary amount from message"""
-    match = re.search(AMOUNT_PATTERN, message, re.IGNORECASE)
-    if match:
-        return float(match.group(1))
-    return None
+    """Extract monetary amount from message (see chatbot.extractors)"""
+    return extractors.extract_amount(message)
+
+def extract_date(message, now=None):
+    """Extract a date from a message (see chatbot.extractors); datetime or None"""
+    return extractors.extract_date(message, now=now)
 
-def extract_action(message):
+def extract_action(message, hits=None):
     """Determine if expense or savings"""
-    message_lower = message.lower()
+    if hits is None:
+        hits = scan_keywords(message)
     
-    for keyword in EXPENSE_KEYWORDS:
-        if keyword in message_lower:
-            return 'expense'
+    if 'expense' in hits:
+        return 'expense'
     
-    for keyword in SAVINGS_KEYWORDS:
-        if keyword in message_lower:
-            return 'savings'
+    if 'savings' in hits:
+        return 'savings'
     
     return None
 
-def extract_time_period(message):
+def extract_time_period(message, hits=None):
     """Extract time period from message"""
-    message_lower = message.lower()
+    if hits is None:
+        hits = scan_keywords(message)
     
-    for phrase, period in TIME_PERIODS.items():
-        if phrase in message_lower:
-            return period
+    found = hits.get('time_period')
+    if found:
+        # First phrase in TIME_PERIODS order wins, as with the old scan
+        for phrase, period in TIME_PERIODS.items():
+            if phrase in found:
+                return period
     
     return None
 
-def is_query(message):
+def is_query(message, hits=None):
     """Check if message is a query"""
-    message_lower = message.lower()
-    return any(keyword in message_lower for keyword in QUERY_KEYWORDS)
+    return 'query' in (hits if hits is not None else scan_keywords(message))
 
-def is_delete_request(message):
+def is_delete_request(message, hits=None):
     """Check if message is delete request"""
-    message_lower = message.lower()
-    return any(keyword in message_lower for keyword in DELETE_KEYWORDS)
+    return 'delete' in (hits if hits is not None else scan_keywords(message))
 
-def is_greeting(message):
+def is_greeting(message, hits=None):
     """Check if message is greeting"""
-    message_lower = message.lower()
-    return any(keyword in message_lower for keyword in GREETING_KEYWORDS)
+    return 'greeting' in (hits if hits is not None else scan_keywords(message))
 
-def is_help_request(message):
+def is_help_request(message, hits=None):
     """Check if message is help request"""
-    message_lower = message.lower()
-    return any(keyword in message_lower for keyword in HELP_KEYWORDS)
+    return 'help' in (hits if hits is not None else scan_keywords(message))
 
+def is_advice_request(message, hits=None):
+    """Check if message asks for saving advice"""
+    return 'advice' in (hits if hits is not None else scan_keywords(message))
 
-def has_conflicting_keywords(message):
+
+def has_conflicting_keywords(message, hits=None):
     """Check if message contains multiple conflicting action keywords"""
-    message_lower = message.lower()
-    
-    actions_found = []
-    
-    if any(keyword in message_lower for keyword in DELETE_KEYWORDS):
-        actions_found.append('delete')
-    
-    if any(keyword in message_lower for keyword in UPDATE_KEYWORDS):
-        actions_found.append('update')
-    
-    if any(keyword in message_lower for keyword in EXPENSE_KEYWORDS):
-        actions_found.append('expense')
+    if hits is None:
+        hits = scan_keywords(message)
     
-    if any(keyword in message_lower for keyword in SAVINGS_KEYWORDS):
-        actions_found.append('savings')
+    actions_found = [
+        action for action in ('delete', 'update', 'expense', 'savings')
+        if action in hits
+    ]
     
     # If more than one action type detected
     if len(actions_found) > 1:
@@ -120,54 +170,6 @@ def has_conflicting_keywords(message):
     return False, []
 
 
-def is_update_request(message):
+def is_update_request(message, hits=None):
     """Check if message is an update request"""
-    message_lower = message.lower()
-    return any(keyword in message_lower for keyword in UPDATE_KEYWORDS)
-
-
-def extract_date(message):
-    """Extract a date from a message. Supports formats like 'on december 1' or 'december'.
-
-    Returns a datetime.datetime or None.
-    """
-    import re
-    from datetime import datetime
-
-    message_lower = message.lower()
-
-    months = {
-        'january': 1, 'jan': 1,
-        'february': 2, 'feb': 2,
-        'march': 3, 'mar': 3,
-        'april': 4, 'apr': 4,
-        'may': 5,
-        'june': 6, 'jun': 6,
-        'july': 7, 'jul': 7,
-        'august': 8, 'aug': 8,
-        'september': 9, 'sep': 9, 'sept': 9,
-        'october': 10, 'oct': 10,
-        'november': 11, 'nov': 11,
-        'december': 12, 'dec': 12
-    }
-
-    # Look for patterns like 'on december 1' or 'december 1' or 'december'
-    pattern = re.compile(r"(?:on\s+)?(january|february|march|april|may|june|july|august|september|october|november|december|jan|feb|mar|apr|jun|jul|aug|sep|sept|oct|nov|dec)\s*(\d{1,2})?", re.IGNORECASE)
-    m = pattern.search(message_lower)
-    if m:
-        month_str = m.group(1)
-        day_str = m.group(2)
-        month = months.get(month_str.lower())
-        now = datetime.now()
-        year = now.year
-        try:
-            day = int(day_str) if day_str else 1
-        except Exception:
-            day = 1
-
-        try:
-            return datetime(year, month, day)
-        except Exception:
-            return None
-
-    return None
+    return 'update' in (hits if hits is not None else scan_keywords(message))
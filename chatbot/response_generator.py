@@ -1,12 +1,20 @@
-from database.db_manager import DatabaseManager
+from database.db_manager import get_database
 from models.transaction import Transaction
 from datetime import datetime, timedelta
 import re
+import time
+from config import Config
+from monitoring.metrics import timed
 
 class ResponseGenerator:
-    def __init__(self):
-        self.db = DatabaseManager()
+    def __init__(self, db=None, transaction_model=None):
+        self.db = db or get_database()
+        self.transaction_model = transaction_model or Transaction(self.db)
+        self._responses = None
+        self._responses_version = None
+        self._next_version_check = 0
     
+    @timed('respond')
     def generate_response(self, intent, **kwargs):
         """Generate appropriate response based on intent"""
         
@@ -37,7 +45,8 @@ class ResponseGenerator:
                 kwargs.get('amount'),
                 kwargs.get('category_id'),
                 kwargs.get('category_name'),
-                kwargs.get('date')
+                kwargs.get('date'),
+                kwargs.get('user_id')
             )
         
         elif intent == 'query':
@@ -50,14 +59,64 @@ class ResponseGenerator:
             return "I'm not sure what you mean. Try saying 'spent 50 on lunch' or 'show today summary'"
     
     def get_predefined_response(self, response_type):
-        """Get predefined response from database"""
-        query = 'SELECT response_text FROM chatbot_responses WHERE response_type = ? LIMIT 1'
-        result = self.db.fetch_one(query, (response_type,))
+        """Get predefined response (loaded from the database once, then cached)"""
+        # Read the cache once: invalidate_responses() may reset it from another thread
+        responses = self._responses
+        if responses is None or self._responses_changed():
+            self._responses_version = self.db.get_version('chatbot_responses')
+            responses = self._responses = self._load_responses()
         
-        if result:
-            return result['response_text']
+        response_text = responses.get(response_type)
+        if response_text:
+            return response_text
         return "Hello! How can I help you today?"
     
+    def _load_responses(self):
+        """Return {response_type: response_text}, first row per type winning"""
+        responses = {}
+        for row in self.get_predefined_responses():
+            responses.setdefault(row['response_type'], row['response_text'])
+        return responses
+    
+    def _responses_changed(self):
+        """True when another worker edited responses (checked at most once per interval)"""
+        now = time.monotonic()
+        if now < self._next_version_check:
+            return False
+        self._next_version_check = now + Config.VERSION_CHECK_INTERVAL
+        return self.db.get_version('chatbot_responses') != self._responses_version
+    
+    def invalidate_responses(self):
+        """Drop the cached responses; the next lookup reloads them"""
+        self._responses = None
+    
+    def get_predefined_responses(self):
+        """All predefined responses, in table order"""
+        query = 'SELECT response_id, keywords, response_text, response_type FROM chatbot_responses ORDER BY response_id'
+        return self.db.fetch_all(query)
+    
+    def update_predefined_response(self, response_type, response_text, keywords=None):
+        """Set the response text (and optionally keywords) of an existing response type
+
+        Returns False, changing nothing, when no response has that type.
+        """
+        existing = self.db.fetch_one(
+            'SELECT response_id, keywords FROM chatbot_responses WHERE response_type = ? ORDER BY response_id LIMIT 1',
+            (response_type,)
+        )
+        if not existing:
+            return False
+        
+        with self.db.transaction() as conn:
+            conn.execute(
+                'UPDATE chatbot_responses SET response_text = ?, keywords = ? WHERE response_id = ?',
+                (response_text, keywords or existing['keywords'], existing['response_id'])
+            )
+            self.db.bump_version(conn, 'chatbot_responses')
+        
+        self.invalidate_responses()
+        return True
+    
     def ambiguous_action_response(self, conflicting_actions):
         """Generate response for ambiguous commands with multiple actions"""
         actions_text = ', '.join(conflicting_actions)
@@ -86,7 +145,7 @@ class ResponseGenerator:
             return f"✓ Deleted: {transaction['amount']} pesos on {transaction['category_name']}"
         return "No recent transaction to delete."
 
-    def update_transaction_response(self, amount, category_id, category_name, date):
+    def update_transaction_response(self, amount, category_id, category_name, date, user_id=None):
         """Update a matching transaction's amount (most-recent match) and return a response."""
         if amount is None:
             return "I couldn't find the new amount to update. Please say something like 'update 250 in food on december 1'"
@@ -97,8 +156,6 @@ class ResponseGenerator:
         if not date:
             return "I couldn't find a date to match. Please include a date like 'on December 1'."
 
-        txn_model = Transaction()
-
         # Build start and end of day strings
         try:
             start_dt = datetime(date.year, date.month, date.day, 0, 0, 0)
@@ -109,22 +166,18 @@ class ResponseGenerator:
         start_str = start_dt.strftime('%Y-%m-%d %H:%M:%S')
         end_str = end_dt.strftime('%Y-%m-%d %H:%M:%S')
 
-        # Fetch transactions in that date range
-        transactions = txn_model.get_transactions(start_date=start_str, end_date=end_str)
-
-        # Find the most recent transaction matching the category
-        matching = None
-        for t in transactions:
-            # t may have category_id as integer or None
-            if t['category_id'] == category_id:
-                matching = t
-                break
+        # Most recent transaction for that category on that day, of this user
+        transaction_model = self.transaction_model.for_user(user_id)
+        transactions = transaction_model.get_transactions(
+            start_date=start_str, end_date=end_str, limit=1, category_id=category_id
+        )
+        matching = transactions[0] if transactions else None
 
         if not matching:
             return "No matching transaction found for that category and date."
 
         # Update the transaction amount
-        txn_model.update_transaction(matching['transaction_id'], amount=amount)
+        transaction_model.update_transaction(matching['transaction_id'], amount=amount)
 
         cat_name = category_name or 'Miscellaneous'
         return f"✓ Updated: set {cat_name} on {start_dt.strftime('%Y-%m-%d')} to {amount} pesos"
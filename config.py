@@ -3,6 +3,37 @@ import os
 class Config:
     # Database - use /tmp for Vercel serverless environment
     DATABASE_PATH = os.environ.get('DATABASE_PATH', '/tmp/financial_chatbot.db' if os.environ.get('VERCEL') else 'financial_chatbot.db')
+    DATABASE_TIMEOUT = float(os.environ.get('DATABASE_TIMEOUT', '5.0'))
+    DATABASE_JOURNAL_MODE = os.environ.get('DATABASE_JOURNAL_MODE', 'WAL')
+    DATABASE_SYNCHRONOUS = os.environ.get('DATABASE_SYNCHRONOUS', 'NORMAL')
+    DATABASE_STATEMENT_CACHE_SIZE = 256
+    # Hash-shard users over this many database files (1: a single file)
+    DATABASE_SHARDS = int(os.environ.get('DATABASE_SHARDS', '1'))
+    DB_READ_WORKERS = int(os.environ.get('DB_READ_WORKERS', '4'))
+    # Group-commit recorded transactions through a write-behind queue
+    WRITE_BEHIND = os.environ.get('WRITE_BEHIND', '').lower() in ('1', 'true', 'yes')
+    WRITE_BEHIND_MAX_BATCH = 64
+    # Seconds the writer lingers for more rows before committing (0: only what is queued)
+    WRITE_BEHIND_MAX_DELAY = float(os.environ.get('WRITE_BEHIND_MAX_DELAY', '0'))
+    IMPORT_BATCH_SIZE = 500
+    # Lines accepted by one /api/import request
+    IMPORT_MAX_LINES = int(os.environ.get('IMPORT_MAX_LINES', '50000'))
+    # Largest request body Flask accepts (413 beyond it), imports included
+    MAX_CONTENT_LENGTH = int(os.environ.get('MAX_CONTENT_LENGTH', str(8 * 1024 * 1024)))
+    TRANSACTIONS_PAGE_MAX = 500
+    EXPORT_PAGE_SIZE = 1000
+    REPORT_MAX_BUCKETS = 3700
+    # Chart series longer than this are downsampled; clients may ask for up to the limit
+    CHART_MAX_POINTS = 500
+    CHART_MAX_POINTS_LIMIT = 5000
+    GZIP_MIN_BYTES = 1024
+    GZIP_LEVEL = 6
+    SUMMARY_CACHE_SIZE = int(os.environ.get('SUMMARY_CACHE_SIZE', '128'))
+    SUMMARY_CACHE_TTL = float(os.environ.get('SUMMARY_CACHE_TTL', '30'))
+    # Message templates whose classification MessageParser keeps (0 disables the cache)
+    PARSE_CACHE_SIZE = int(os.environ.get('PARSE_CACHE_SIZE', '1024'))
+    # Seconds between checks for category/response edits made by other workers
+    VERSION_CHECK_INTERVAL = float(os.environ.get('VERSION_CHECK_INTERVAL', '1.0'))
     
     # Flask
     SECRET_KEY = 'your-secret-key-change-in-production'
@@ -12,14 +43,47 @@ class Config:
     SECRET_KEY = 'your-secret-key-change-in-production'
     DEBUG = True
     
-    # Default categories with keywords
+    # Users: with MULTI_USER each caller gets its own transactions, identified by a
+    # bearer token or, for the browser UI, a session cookie (set a real SECRET_KEY)
+    MULTI_USER = os.environ.get('MULTI_USER', '').lower() in ('1', 'true', 'yes')
+    DEFAULT_USER_ID = 'default'
+    
+    # IANA zone for transaction dates (see database/epoch.py); unset means server local time
+    TIMEZONE = os.environ.get('APP_TIMEZONE')
+    
+    # Admin API (responses, categories, metrics, snapshots): requests must send this as
+    # X-Admin-Token; while it is unset the admin endpoints answer 503
+    ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+    
+    # Snapshots of the database (database/snapshot.py): a directory or <scheme>://location
+    # (unset: off). A missing database is restored at startup; the first change is
+    # snapshotted at once, later ones at most every SNAPSHOT_INTERVAL seconds
+    SNAPSHOT_STORE = os.environ.get('SNAPSHOT_STORE')
+    SNAPSHOT_INTERVAL = float(os.environ.get('SNAPSHOT_INTERVAL', '300'))
+    SNAPSHOT_KEEP = int(os.environ.get('SNAPSHOT_KEEP', '5'))
+    SNAPSHOT_COMPRESSION = os.environ.get('SNAPSHOT_COMPRESSION', 'gz')
+    SNAPSHOT_COMPRESSION_LEVEL = int(os.environ.get('SNAPSHOT_COMPRESSION_LEVEL', '1'))
+    SNAPSHOT_BACKUP_PAGES = 1024
+    
+    # Build every app component at import instead of on first use (long-running servers)
+    WARM_UP = os.environ.get('WARM_UP', '').lower() in ('1', 'true', 'yes')
+    
+    # Instrumentation: per-request stage/query metrics, served at /metrics
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1').lower() in ('1', 'true', 'yes')
+    # Profile a sample of requests and dump pstats for those slower than PROFILE_SLOW_MS (unset: off)
+    PROFILE_SLOW_MS = float(os.environ['PROFILE_SLOW_MS']) if os.environ.get('PROFILE_SLOW_MS') else None
+    PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', '0.01'))
+    PROFILE_DIR = os.environ.get('PROFILE_DIR', 'profiles')
+    
+    # Default categories with keywords. Matching is by whole word, so compounds and
+    # plurals (jeepney, snacks) need keywords of their own
     DEFAULT_CATEGORIES = [
-        ('Food', 'expense', 'lunch,dinner,breakfast,meal,food,restaurant,ate,eat,groceries,snack,coffee'),
-        ('Transportation', 'expense', 'taxi,jeep,bus,fare,gas,commute,grab,uber,transport,travel'),
-        ('Bills', 'expense', 'electricity,water,intern  et,rent,bill,utilities'),
-        ('Entertainment', 'expense', 'movie,cinema,concert,game,entertainment,fun,party'),
+        ('Food', 'expense', 'lunch,dinner,breakfast,meal,meals,food,restaurant,ate,eat,groceries,grocery,snack,snacks,coffee'),
+        ('Transportation', 'expense', 'taxi,jeep,jeepney,bus,fare,fares,gas,gasoline,commute,grab,uber,transport,travel'),
+        ('Bills', 'expense', 'electricity,water,intern  et,rent,bill,bills,utilities'),
+        ('Entertainment', 'expense', 'movie,movies,cinema,concert,game,games,entertainment,fun,party'),
         ('Shopping', 'expense', 'shopping,clothes,shoes,mall,bought,purchase'),
-        ('Health', 'expense', 'medicine,doctor,hospital,health,medical,pharmacy'),
+        ('Health', 'expense', 'medicine,medicines,doctor,hospital,health,medical,pharmacy'),
         ('Education', 'expense', 'school,books,tuition,education,course,training'),
         ('Miscellaneous', 'expense', 'other,misc,miscellaneous,various'),
         ('Salary', 'savings', 'salary,wage,paycheck,savings,pay'),
@@ -1,94 +1,180 @@
+import atexit
 import sqlite3
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 from config import Config
+from database.migrations import migrate
+from monitoring.metrics import CONNECTIONS, stage, traced_query
 
 class DatabaseManager:
+    """SQLite access with one long-lived connection per thread.
+
+    Connections are opened lazily the first time a thread touches the
+    database and then reused for every later query on that thread, so the
+    connection setup, PRAGMA tuning and prepared-statement cache are paid
+    once instead of per statement. Call ``release_connection`` at the end
+    of a request and ``close_all`` on shutdown. Connections left behind by
+    threads that have exited are closed the next time a thread opens one.
+    """
+
     def __init__(self, db_path=None):
         self.db_path = db_path or Config.DATABASE_PATH
+        self._local = threading.local()
+        self._connections = {}
+        self._lock = threading.Lock()
         self.init_database()
-    
-    def get_connection(self):
-        conn = sqlite3.connect(self.db_path)
+
+    def _connect(self):
+        CONNECTIONS.inc()
+        with stage('db_connect'):
+            return self._open()
+
+    def _open(self):
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=Config.DATABASE_TIMEOUT,
+            cached_statements=Config.DATABASE_STATEMENT_CACHE_SIZE,
+            # Each connection is only used by its own thread; this lets a
+            # dead thread's connection be closed from another one
+            check_same_thread=False
+        )
         conn.row_factory = sqlite3.Row
+        # WAL lets readers proceed while a write is in progress; with WAL,
+        # synchronous=NORMAL only fsyncs at checkpoints and stays durable
+        # against application crashes.
+        conn.execute(f'PRAGMA journal_mode = {Config.DATABASE_JOURNAL_MODE}')
+        conn.execute(f'PRAGMA synchronous = {Config.DATABASE_SYNCHRONOUS}')
+        conn.execute('PRAGMA foreign_keys = ON')
+        return conn
+
+    def get_connection(self):
+        """Return this thread's connection, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._lock:
+                self._prune()
+                self._connections[threading.current_thread()] = conn
         return conn
-    
+
+    def _prune(self):
+        """Close connections owned by threads that have exited (caller holds the lock)"""
+        for thread in [thread for thread in self._connections if not thread.is_alive()]:
+            self._connections.pop(thread).close()
+
+    def release_connection(self, exception=None):
+        """End-of-request hook: drop any uncommitted work, keep the connection open"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and conn.in_transaction:
+            conn.rollback()
+
+    def close_connection(self):
+        """Close this thread's connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            self._local.conn = None
+            with self._lock:
+                self._connections.pop(threading.current_thread(), None)
+            conn.close()
+
+    def close_all(self):
+        """Close every pooled connection (shutdown hook)"""
+        with self._lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+    def init_app(self, app):
+        """Register request teardown and shutdown hooks on a Flask app"""
+        app.teardown_appcontext(self.release_connection)
+        atexit.register(self.close_all)
+
     def init_database(self):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        # Create tables
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS categories (
-                category_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                category_name TEXT UNIQUE NOT NULL,
-                category_type TEXT NOT NULL,
-                keywords TEXT
-            )
-        ''')
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS transactions (
-                transaction_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                transaction_type TEXT NOT NULL,
-                amount REAL NOT NULL,
-                category_id INTEGER,
-                description TEXT,
-                date DATETIME NOT NULL,
-                FOREIGN KEY (category_id) REFERENCES categories(category_id)
-            )
-        ''')
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS chatbot_responses (
-                response_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                keywords TEXT NOT NULL,
-                response_text TEXT NOT NULL,
-                response_type TEXT
-            )
-        ''')
-        
-        # Insert default categories if empty
-        cursor.execute('SELECT COUNT(*) FROM categories')
-        if cursor.fetchone()[0] == 0:
-            for cat_name, cat_type, keywords in Config.DEFAULT_CATEGORIES:
-                cursor.execute(
-                    'INSERT INTO categories (category_name, category_type, keywords) VALUES (?, ?, ?)',
-                    (cat_name, cat_type, keywords)
-                )
-        
-        # Insert default responses if empty
-        cursor.execute('SELECT COUNT(*) FROM chatbot_responses')
-        if cursor.fetchone()[0] == 0:
-            for keywords, response, resp_type in Config.DEFAULT_RESPONSES:
-                cursor.execute(
-                    'INSERT INTO chatbot_responses (keywords, response_text, response_type) VALUES (?, ?, ?)',
-                    (keywords, response, resp_type)
-                )
-        
-        conn.commit()
-        conn.close()
-    
+        """Bring the schema up to date (a single PRAGMA read when already current)"""
+        migrate(self.get_connection())
+
+    @traced_query
     def execute_query(self, query, params=()):
         conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        conn.commit()
-        lastrowid = cursor.lastrowid
-        conn.close()
-        return lastrowid
-    
+        try:
+            cursor = conn.execute(query, params)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return cursor.lastrowid
+
+    @traced_query
+    def execute_many(self, query, params_seq):
+        """Run one statement for every parameter tuple inside a single transaction"""
+        conn = self.get_connection()
+        try:
+            cursor = conn.executemany(query, params_seq)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return cursor.rowcount
+
+    @contextmanager
+    def transaction(self):
+        """Run several statements on this thread's connection as one commit"""
+        conn = self.get_connection()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    def get_version(self, name):
+        """Change counter of a cached table (see data_versions)"""
+        row = self.fetch_one('SELECT version FROM data_versions WHERE name = ?', (name,))
+        return row['version'] if row else 0
+
+    def bump_version(self, conn, name):
+        """Increment a change counter inside the caller's transaction; returns the new value"""
+        conn.execute(
+            'INSERT INTO data_versions (name, version) VALUES (?, 1) '
+            'ON CONFLICT (name) DO UPDATE SET version = version + 1',
+            (name,)
+        )
+        return conn.execute('SELECT version FROM data_versions WHERE name = ?', (name,)).fetchone()[0]
+
+    @traced_query
     def fetch_all(self, query, params=()):
         conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        results = cursor.fetchall()
-        conn.close()
-        return results
-    
+        return conn.execute(query, params).fetchall()
+
+    @traced_query
     def fetch_one(self, query, params=()):
         conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        result = cursor.fetchone()
-        conn.close()
-        return result
\ No newline at end of file
+        return conn.execute(query, params).fetchone()
+
+    @traced_query
+    def fetch_tuples(self, query, params=()):
+        """Like fetch_all but plain tuples, skipping sqlite3.Row construction"""
+        cursor = self.get_connection().cursor()
+        cursor.row_factory = None
+        return cursor.execute(query, params).fetchall()
+
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def get_database(db_path=None):
+    """Return the process-wide DatabaseManager for db_path, creating it once"""
+    db_path = db_path or Config.DATABASE_PATH
+    db = _registry.get(db_path)
+    if db is None:
+        with _registry_lock:
+            db = _registry.get(db_path)
+            if db is None:
+                db = DatabaseManager(db_path)
+                _registry[db_path] = db
+    return db
@@ -0,0 +1,105 @@
+"""Transaction timestamps stored as integer epochs.
+
+Since migration 6, ``transactions.date`` holds whole seconds since
+1970-01-01 00:00 on the app's wall clock (``Config.TIMEZONE``, or the
+server's local time when unset). Keeping the local wall clock rather than
+UTC makes a calendar day plain integer arithmetic (``date // 86400``) both
+in SQL and in Python, so rollups and day buckets need no timezone tables.
+
+Conversions happen at the edges: ``to_epoch`` accepts naive datetimes
+(taken as local wall clock), aware datetimes (converted to the app's
+timezone first), dates, ISO strings and epochs; ``from_epoch`` returns
+naive local datetimes. Both accept the old ISO text values, and triggers
+rewrite any text date that still gets written into an epoch. ``app_now``
+is the current time on the same wall clock.
+"""
+import calendar
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+from config import Config
+
+SECONDS_PER_DAY = 86400
+
+_EPOCH = datetime(1970, 1, 1)
+
+# date(1970, 1, 1).toordinal()
+EPOCH_ORDINAL = 719163
+
+
+def app_timezone():
+    return ZoneInfo(Config.TIMEZONE) if Config.TIMEZONE else None
+
+
+def app_now():
+    """Current time as a naive datetime on the app's wall clock"""
+    tz = app_timezone()
+    return datetime.now(tz).replace(tzinfo=None) if tz else datetime.now()
+
+
+def to_epoch(value):
+    """Epoch seconds (app wall clock) for a datetime, date, ISO string or epoch; None stays None"""
+    if value is None or isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    elif not isinstance(value, datetime):
+        value = datetime.combine(value, time.min)
+    if value.tzinfo is not None:
+        value = value.astimezone(app_timezone()).replace(tzinfo=None)
+    return calendar.timegm(value.timetuple())
+
+
+def from_epoch(value):
+    """Naive local datetime for a stored date (epoch, or legacy ISO text)"""
+    if isinstance(value, int):
+        return _EPOCH + timedelta(seconds=value)
+    if value is None:
+        return None
+    return datetime.fromisoformat(value)
+
+
+def format_epoch(value):
+    """'YYYY-MM-DD HH:MM:SS' for API output"""
+    return from_epoch(value).isoformat(sep=' ') if value is not None else None
+
+
+def day_number(value):
+    return to_epoch(value) // SECONDS_PER_DAY
+
+
+def day_label(number):
+    """'YYYY-MM-DD' for a day number (days since 1970-01-01)"""
+    return date.fromordinal(number + EPOCH_ORDINAL).isoformat()
+
+
+def epoch_sql(column):
+    """SQL expression giving the epoch of a date column, whether it holds an epoch or legacy text
+
+    Text is cut to whole seconds before strftime, which would otherwise round.
+    """
+    return (f"(CASE WHEN typeof({column}) = 'text' "
+            f"THEN CAST(strftime('%s', substr({column}, 1, 19)) AS INTEGER) ELSE {column} END)")
+
+
+# Rows written by code that still binds datetimes (text) are rewritten as epochs
+NORMALIZE_TRIGGERS_SQL = [
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_transactions_epoch_insert
+    AFTER INSERT ON transactions
+    WHEN typeof(NEW.date) = 'text'
+    BEGIN
+        UPDATE transactions SET date = {epoch_sql('NEW.date')}
+        WHERE transaction_id = NEW.transaction_id;
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_transactions_epoch_update
+    AFTER UPDATE OF date ON transactions
+    WHEN typeof(NEW.date) = 'text'
+    BEGIN
+        UPDATE transactions SET date = {epoch_sql('NEW.date')}
+        WHERE transaction_id = NEW.transaction_id;
+    END
+    ''',
+]
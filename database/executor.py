@@ -0,0 +1,39 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+
+class DatabaseExecutor:
+    """Bounded thread pool for database reads plus a single writer thread.
+
+    Each pool thread keeps its own pooled connection (see DatabaseManager),
+    so at most ``max_readers`` connections read concurrently. Every write
+    goes through the one writer thread, in submission order, so SQLite never
+    sees two writers competing for the lock. Work runs in a copy of the
+    submitting context, so request traces (monitoring.metrics) follow it.
+    """
+
+    def __init__(self, max_readers=4):
+        self.readers = ThreadPoolExecutor(max_workers=max_readers, thread_name_prefix='db-read')
+        self.writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='db-write')
+
+    def read(self, fn, *args, **kwargs):
+        """Run fn on the reader pool; returns a concurrent.futures.Future"""
+        return self.readers.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+    def write(self, fn, *args, **kwargs):
+        """Queue fn for the writer thread; returns a concurrent.futures.Future"""
+        return self.writer.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+    # asyncio is imported where it is used: only the ASGI entry point awaits
+    # these, and WSGI workers shouldn't pay for the import on a cold start
+    async def run_read(self, fn, *args, **kwargs):
+        import asyncio
+        return await asyncio.wrap_future(self.read(fn, *args, **kwargs))
+
+    async def run_write(self, fn, *args, **kwargs):
+        import asyncio
+        return await asyncio.wrap_future(self.write(fn, *args, **kwargs))
+
+    def shutdown(self, wait=True):
+        self.writer.shutdown(wait=wait)
+        self.readers.shutdown(wait=wait)
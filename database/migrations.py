@@ -0,0 +1,248 @@
+"""Versioned schema migrations.
+
+The schema version lives in SQLite's ``PRAGMA user_version``. Each entry in
+``MIGRATIONS`` upgrades the schema by one version; ``migrate`` applies the
+pending ones in order, each inside its own write transaction, so a database
+that is already current costs a single PRAGMA read.
+"""
+from config import Config
+from database.epoch import NORMALIZE_TRIGGERS_SQL
+from database.rollups import (
+    DAY_KEYS, TRIGGER_NAMES, USER_DAY_KEYS, USER_EPOCH_DAY_KEYS, backfill_rollups, create_rollups, drop_rollups,
+    rollup_trigger_sql
+)
+
+
+def create_base_schema(cursor):
+    """Version 1: core tables plus default categories and responses"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS categories (
+            category_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            category_name TEXT UNIQUE NOT NULL,
+            category_type TEXT NOT NULL,
+            keywords TEXT
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS transactions (
+            transaction_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            transaction_type TEXT NOT NULL,
+            amount REAL NOT NULL,
+            category_id INTEGER,
+            description TEXT,
+            date DATETIME NOT NULL,
+            FOREIGN KEY (category_id) REFERENCES categories(category_id)
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS chatbot_responses (
+            response_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            keywords TEXT NOT NULL,
+            response_text TEXT NOT NULL,
+            response_type TEXT
+        )
+    ''')
+
+    # Databases created before versioning already have their seed rows
+    cursor.execute('SELECT COUNT(*) FROM categories')
+    if cursor.fetchone()[0] == 0:
+        cursor.executemany(
+            'INSERT INTO categories (category_name, category_type, keywords) VALUES (?, ?, ?)',
+            Config.DEFAULT_CATEGORIES
+        )
+
+    cursor.execute('SELECT COUNT(*) FROM chatbot_responses')
+    if cursor.fetchone()[0] == 0:
+        cursor.executemany(
+            'INSERT INTO chatbot_responses (keywords, response_text, response_type) VALUES (?, ?, ?)',
+            Config.DEFAULT_RESPONSES
+        )
+
+
+def add_transaction_indexes(cursor):
+    """Version 2: indexes for date-range, category and type lookups"""
+    # Leading on date and carrying the summary columns, so period summaries
+    # are answered from the index alone
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_transactions_date
+        ON transactions (date, transaction_type, category_id, amount)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_transactions_category_date
+        ON transactions (category_id, date)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_transactions_type_date
+        ON transactions (transaction_type, date)
+    ''')
+
+
+def add_daily_rollups(cursor):
+    """Version 3: trigger-maintained daily rollup of transactions"""
+    create_rollups(cursor, DAY_KEYS)
+    backfill_rollups(cursor, DAY_KEYS)
+
+
+def add_data_versions(cursor):
+    """Version 4: change counters for cached tables (categories, responses)"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS data_versions (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL
+        )
+    ''')
+    cursor.executemany(
+        'INSERT OR IGNORE INTO data_versions (name, version) VALUES (?, 0)',
+        [('categories',), ('chatbot_responses',)]
+    )
+
+
+def add_user_scoping(cursor):
+    """Version 5: per-user transactions, user-leading indexes and rollups"""
+    # Existing rows belong to the single user the app had before
+    cursor.execute(
+        f"ALTER TABLE transactions ADD COLUMN user_id TEXT NOT NULL DEFAULT '{Config.DEFAULT_USER_ID}'"
+    )
+
+    # Every query is now scoped to one user, so the indexes lead on user_id
+    for name in ('idx_transactions_date', 'idx_transactions_category_date', 'idx_transactions_type_date'):
+        cursor.execute(f'DROP INDEX IF EXISTS {name}')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_transactions_user_date
+        ON transactions (user_id, date, transaction_type, category_id, amount)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_transactions_user_category_date
+        ON transactions (user_id, category_id, date)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_transactions_user_type_date
+        ON transactions (user_id, transaction_type, date)
+    ''')
+
+    drop_rollups(cursor)
+    create_rollups(cursor, USER_DAY_KEYS)
+    backfill_rollups(cursor, USER_DAY_KEYS)
+
+
+def store_dates_as_epochs(cursor):
+    """Version 6: transaction dates as integer epoch seconds, rollup days as day numbers"""
+    drop_rollups(cursor)
+
+    # ISO text is the app's wall clock, which strftime('%s') reads as UTC:
+    # exactly the local-wall-clock epoch database/epoch.py uses. Fractional
+    # seconds are cut off first (strftime would round them, moving
+    # 23:59:59.999999 into the next day) so this truncates like to_epoch.
+    cursor.execute('''
+        UPDATE transactions SET date = CAST(strftime('%s', substr(date, 1, 19)) AS INTEGER)
+        WHERE typeof(date) = 'text'
+    ''')
+    for trigger_sql in NORMALIZE_TRIGGERS_SQL:
+        cursor.execute(trigger_sql)
+
+    create_rollups(cursor, USER_EPOCH_DAY_KEYS)
+    backfill_rollups(cursor, USER_EPOCH_DAY_KEYS)
+
+
+def truncate_text_dates(cursor):
+    """Version 7: recreate the date triggers so legacy text dates truncate to whole seconds
+
+    Databases migrated to version 6 before the fix kept triggers that rounded
+    fractional seconds. The stored epochs and rollups stay as they are.
+    """
+    for name in TRIGGER_NAMES + ('trg_transactions_epoch_insert', 'trg_transactions_epoch_update'):
+        cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+    for trigger_sql in NORMALIZE_TRIGGERS_SQL + rollup_trigger_sql(USER_EPOCH_DAY_KEYS):
+        cursor.execute(trigger_sql)
+
+
+def order_user_date_index_by_id(cursor):
+    """Version 8: transaction_id right after date in the (user, date) covering index
+
+    Whole-second dates tie often; listings break ties by id, and with the id
+    next to the date the index still yields that order without a sort.
+    """
+    cursor.execute('DROP INDEX IF EXISTS idx_transactions_user_date')
+    cursor.execute('''
+        CREATE INDEX idx_transactions_user_date
+        ON transactions (user_id, date, transaction_id, transaction_type, category_id, amount)
+    ''')
+
+
+# Keywords added to the default categories once matching went by whole words
+COMPOUND_KEYWORDS = {
+    'Food': ('meals', 'grocery', 'snacks'),
+    'Transportation': ('jeepney', 'fares', 'gasoline'),
+    'Bills': ('bills',),
+    'Entertainment': ('movies', 'games'),
+    'Health': ('medicines',),
+}
+
+
+def add_compound_keywords(cursor):
+    """Version 9: keywords for compounds and plurals ("jeepney", "snacks") to the default categories
+
+    Whole-word matching no longer finds "jeep" inside "jeepney". Keywords a
+    category already has are not repeated, and renamed categories are left
+    alone. Bumps the categories version so running workers reload.
+    """
+    for name, keywords in COMPOUND_KEYWORDS.items():
+        row = cursor.execute('SELECT category_id, keywords FROM categories WHERE category_name = ?',
+                             (name,)).fetchone()
+        if row is None:
+            continue
+        existing = [k.strip() for k in (row[1] or '').split(',') if k.strip()]
+        missing = [k for k in keywords if k not in existing]
+        if missing:
+            cursor.execute('UPDATE categories SET keywords = ? WHERE category_id = ?',
+                           (','.join(existing + missing), row[0]))
+    cursor.execute("UPDATE data_versions SET version = version + 1 WHERE name = 'categories'")
+
+
+# (version, migration) pairs in ascending order. Never edit a released
+# migration; append a new one instead.
+MIGRATIONS = [
+    (1, create_base_schema),
+    (2, add_transaction_indexes),
+    (3, add_daily_rollups),
+    (4, add_data_versions),
+    (5, add_user_scoping),
+    (6, store_dates_as_epochs),
+    (7, truncate_text_dates),
+    (8, order_user_date_index_by_id),
+    (9, add_compound_keywords),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn):
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+def migrate(conn, target_version=LATEST_VERSION):
+    """Apply pending migrations up to target_version; returns the versions applied"""
+    if get_schema_version(conn) >= target_version:
+        return []
+
+    applied = []
+    for version, migration in MIGRATIONS:
+        if version > target_version:
+            break
+
+        # Take the write lock before re-checking so concurrent cold starts
+        # don't both run the same migration
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if get_schema_version(conn) < version:
+                migration(conn.cursor())
+                conn.execute(f'PRAGMA user_version = {int(version)}')
+                applied.append(version)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    return applied
@@ -0,0 +1,179 @@
+"""Daily rollup of transactions: one row per (user, day, category, type).
+
+``daily_rollups`` is kept current by triggers on ``transactions`` (see
+migrations 3, 5 and 6), so every insert, update and delete adjusts the
+affected day's sum and count in the same database transaction.
+Uncategorized transactions are stored under category_id 0, and days are
+day numbers (days since 1970-01-01, see database/epoch.py).
+
+The table, triggers and backfill are generated from a key layout: an
+ordered list of (column, type, expression) triples, where ``{row}`` in
+the expression stands for NEW, OLD or the transactions table. Migrations
+pass the layout of their schema version so older steps stay replayable.
+"""
+from database.epoch import SECONDS_PER_DAY, epoch_sql
+
+_CATEGORY_KEY = ('category_id', 'INTEGER', 'COALESCE({row}.category_id, 0)')
+_TYPE_KEY = ('transaction_type', 'TEXT', '{row}.transaction_type')
+_USER_KEY = ('user_id', 'TEXT', '{row}.user_id')
+
+# Migration 3: global rollups over ISO text dates
+DAY_KEYS = (('day', 'TEXT', 'date({row}.date)'), _CATEGORY_KEY, _TYPE_KEY)
+
+# Migration 5: rollups partitioned by user, user_id leading the key
+USER_DAY_KEYS = (_USER_KEY,) + DAY_KEYS
+
+# Migration 6: epoch dates, days as integer day numbers
+USER_EPOCH_DAY_KEYS = (
+    _USER_KEY,
+    ('day', 'INTEGER', epoch_sql('{row}.date') + f' / {SECONDS_PER_DAY}'),
+    _CATEGORY_KEY,
+    _TYPE_KEY,
+)
+
+ROLLUP_KEYS = USER_EPOCH_DAY_KEYS
+
+TRIGGER_NAMES = (
+    'trg_transactions_rollup_insert',
+    'trg_transactions_rollup_delete',
+    'trg_transactions_rollup_update',
+)
+
+
+def _columns(keys):
+    return ', '.join(column for column, _, _ in keys)
+
+
+def _expressions(keys, row):
+    return ', '.join(expression.format(row=row) for _, _, expression in keys)
+
+
+def _match(keys, row):
+    return ' AND '.join(f'{column} = {expression.format(row=row)}' for column, _, expression in keys)
+
+
+def rollup_table_sql(keys=ROLLUP_KEYS):
+    key_columns = ',\n        '.join(f'{column} {sql_type} NOT NULL' for column, sql_type, _ in keys)
+    return f'''
+    CREATE TABLE IF NOT EXISTS daily_rollups (
+        {key_columns},
+        total REAL NOT NULL,
+        count INTEGER NOT NULL,
+        PRIMARY KEY ({_columns(keys)})
+    ) WITHOUT ROWID
+    '''
+
+
+def rollup_trigger_sql(keys=ROLLUP_KEYS):
+    add_new = f'''
+        INSERT INTO daily_rollups ({_columns(keys)}, total, count)
+        VALUES ({_expressions(keys, 'NEW')}, NEW.amount, 1)
+        ON CONFLICT ({_columns(keys)})
+        DO UPDATE SET total = total + excluded.total, count = count + 1;
+    '''
+    remove_old = f'''
+        UPDATE daily_rollups SET total = total - OLD.amount, count = count - 1
+        WHERE {_match(keys, 'OLD')};
+        DELETE FROM daily_rollups
+        WHERE {_match(keys, 'OLD')} AND count <= 0;
+    '''
+    watched = ', '.join(
+        dict.fromkeys(['amount', 'category_id', 'date', 'transaction_type'] + [c for c, _, _ in keys if c != 'day'])
+    )
+    insert_trigger, delete_trigger, update_trigger = TRIGGER_NAMES
+    return [
+        f'''
+        CREATE TRIGGER IF NOT EXISTS {insert_trigger}
+        AFTER INSERT ON transactions
+        BEGIN
+            {add_new}
+        END
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS {delete_trigger}
+        AFTER DELETE ON transactions
+        BEGIN
+            {remove_old}
+        END
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS {update_trigger}
+        AFTER UPDATE OF {watched} ON transactions
+        BEGIN
+            {remove_old}
+            {add_new}
+        END
+        ''',
+    ]
+
+
+def raw_daily_sql(keys=ROLLUP_KEYS):
+    """Rollup rows computed straight from the transactions table"""
+    group_by = ', '.join(str(i + 1) for i in range(len(keys)))
+    selected = ', '.join(
+        f'{expression.format(row="transactions")} AS {column}' for column, _, expression in keys
+    )
+    return f'''
+    SELECT {selected}, SUM(amount) AS total, COUNT(*) AS count
+    FROM transactions
+    GROUP BY {group_by}
+    '''
+
+
+def create_rollups(cursor, keys=ROLLUP_KEYS):
+    """Create the rollup table and its triggers"""
+    cursor.execute(rollup_table_sql(keys))
+    for trigger_sql in rollup_trigger_sql(keys):
+        cursor.execute(trigger_sql)
+
+
+def drop_rollups(cursor):
+    """Drop the rollup table and its triggers (before recreating them with a new layout)"""
+    for name in TRIGGER_NAMES:
+        cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+    cursor.execute('DROP TABLE IF EXISTS daily_rollups')
+
+
+def backfill_rollups(cursor, keys=ROLLUP_KEYS):
+    """Recompute every rollup row from the raw transactions table"""
+    cursor.execute('DELETE FROM daily_rollups')
+    cursor.execute(
+        f'INSERT INTO daily_rollups ({_columns(keys)}, total, count) ' + raw_daily_sql(keys)
+    )
+
+
+def rebuild_rollups(conn):
+    """Rebuild the rollup table in one transaction"""
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        backfill_rollups(conn.cursor())
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def verify_rollups(conn, tolerance=0.005):
+    """Compare rollups with the raw table; returns a list of mismatches.
+
+    Each mismatch is the rollup key (user_id, day, category_id,
+    transaction_type) followed by expected and actual, which are
+    (total, count) tuples, or None when missing.
+    """
+    width = len(ROLLUP_KEYS)
+    expected = {
+        tuple(row[:width]): (row[width], row[width + 1])
+        for row in conn.execute(raw_daily_sql())
+    }
+    actual = {
+        tuple(row[:width]): (row[width], row[width + 1])
+        for row in conn.execute(f'SELECT {_columns(ROLLUP_KEYS)}, total, count FROM daily_rollups')
+    }
+
+    mismatches = []
+    for key in sorted(set(expected) | set(actual)):
+        want = expected.get(key)
+        got = actual.get(key)
+        if want is None or got is None or want[1] != got[1] or abs(want[0] - got[0]) > tolerance:
+            mismatches.append(key + (want, got))
+    return mismatches
@@ -0,0 +1,55 @@
+"""Hash sharding of users over several SQLite files.
+
+With ``Config.DATABASE_SHARDS`` > 1 each user's transactions live in one
+of N database files next to ``Config.DATABASE_PATH`` (``name.shard3.db``),
+chosen by a stable hash of the user id, so no file holds more than about
+1/N of the rows and writers for different shards never share a lock.
+Categories and chatbot responses stay managed in the primary database;
+``sync_categories`` copies the category table to every shard so their
+foreign keys and name joins keep working.
+"""
+import os
+import zlib
+
+from config import Config
+from database.db_manager import get_database
+
+
+def shard_index(user_id, shards=None):
+    shards = shards or Config.DATABASE_SHARDS
+    return zlib.crc32(str(user_id).encode('utf-8')) % shards
+
+
+def shard_path(index, db_path=None):
+    root, ext = os.path.splitext(db_path or Config.DATABASE_PATH)
+    return f'{root}.shard{index}{ext or ".db"}'
+
+
+def get_user_database(user_id):
+    """Database holding this user's transactions (the default user stays in the primary one)"""
+    if Config.DATABASE_SHARDS <= 1 or user_id == Config.DEFAULT_USER_ID:
+        return get_database()
+    return get_database(shard_path(shard_index(user_id)))
+
+
+def shard_databases():
+    return [get_database(shard_path(i)) for i in range(Config.DATABASE_SHARDS)]
+
+
+def sync_categories(source_db):
+    """Copy the primary category table to every shard"""
+    if Config.DATABASE_SHARDS <= 1:
+        return
+    rows = [
+        (c['category_id'], c['category_name'], c['category_type'], c['keywords'])
+        for c in source_db.fetch_all('SELECT * FROM categories')
+    ]
+    for shard_db in shard_databases():
+        with shard_db.transaction() as conn:
+            conn.executemany(
+                'INSERT INTO categories (category_id, category_name, category_type, keywords) '
+                'VALUES (?, ?, ?, ?) '
+                'ON CONFLICT (category_id) DO UPDATE SET category_name = excluded.category_name, '
+                'category_type = excluded.category_type, keywords = excluded.keywords',
+                rows
+            )
@@ -0,0 +1,304 @@
+"""Compressed snapshots of a SQLite database, for instances whose disk is ephemeral.
+
+On Vercel the database lives in /tmp and every new instance starts empty.
+``create_snapshot`` copies the live database with SQLite's online backup
+API, without stopping writers (in WAL mode a single consistent step,
+otherwise ``Config.SNAPSHOT_BACKUP_PAGES`` pages per step). Every snapshot
+is a full copy of the database; nothing is incremental. The copy is
+compressed and uploaded to a ``SnapshotStore``. ``restore_latest``
+downloads the newest snapshot and moves it into place before the app opens
+the database.
+
+Snapshot names carry the time and a content hash
+(``<prefix>-20261018T120000123456Z-<sha>.db.gz``). A snapshot whose content
+matches the newest stored one is skipped, so an idle instance uploads
+nothing. ``LocalDirectoryStore`` is the built-in backend. Register others,
+such as object storage, with ``register_store``.
+"""
+import gzip
+import hashlib
+import lzma
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+
+from config import Config
+
+COMPRESSORS = {
+    # name (and file suffix) -> open(path, mode, level)
+    'gz': lambda path, mode, level: gzip.open(path, mode, compresslevel=level),
+    'xz': lambda path, mode, level: lzma.open(path, mode, preset=level),
+}
+COPY_CHUNK = 1 << 20
+
+
+class SnapshotStore:
+    """Where snapshots are kept. A backend implements these four methods"""
+
+    def list(self, prefix=''):
+        """Snapshot names starting with prefix, oldest first"""
+        raise NotImplementedError
+
+    def upload(self, local_path, name):
+        raise NotImplementedError
+
+    def download(self, name, local_path):
+        raise NotImplementedError
+
+    def delete(self, name):
+        raise NotImplementedError
+
+
+class LocalDirectoryStore(SnapshotStore):
+    """Snapshots as files in a directory (a mounted volume, or a stand-in for object storage in tests)"""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def list(self, prefix=''):
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        # The UTC timestamp in the name sorts chronologically
+        return sorted(name for name in names if name.startswith(prefix) and not name.endswith('.part'))
+
+    def upload(self, local_path, name):
+        os.makedirs(self.directory, exist_ok=True)
+        target = os.path.join(self.directory, name)
+        shutil.copyfile(local_path, target + '.part')
+        os.replace(target + '.part', target)
+
+    def download(self, name, local_path):
+        shutil.copyfile(os.path.join(self.directory, name), local_path)
+
+    def delete(self, name):
+        try:
+            os.remove(os.path.join(self.directory, name))
+        except FileNotFoundError:
+            pass
+
+
+STORES = {'file': LocalDirectoryStore}
+
+
+def register_store(scheme, factory):
+    """Make open_store('<scheme>://<location>') call factory(location)"""
+    STORES[scheme] = factory
+
+
+def open_store(url):
+    """A store for 'file:///path', '<registered scheme>://...', or a plain directory path"""
+    scheme, sep, location = url.partition('://')
+    if not sep:
+        return LocalDirectoryStore(url)
+    try:
+        factory = STORES[scheme]
+    except KeyError:
+        raise ValueError(f'Unknown snapshot store scheme {scheme!r} (known: {", ".join(STORES)})') from None
+    return factory(location)
+
+
+def snapshot_prefix(db_path):
+    """Name prefix for snapshots of one database file"""
+    return os.path.splitext(os.path.basename(db_path))[0] + '-'
+
+
+def _content_hash(name):
+    # <prefix>-<time>-<hash>.db.<ext>
+    return name.rsplit('.db.', 1)[0].rsplit('-', 1)[-1]
+
+
+def backup_to(db_path, target_path, pages=None, sleep=0.0):
+    """Copy the whole live database to target_path with the online backup API"""
+    pages = pages or Config.SNAPSHOT_BACKUP_PAGES
+    source = sqlite3.connect(db_path, timeout=Config.DATABASE_TIMEOUT)
+    target = sqlite3.connect(target_path)
+    try:
+        # In WAL mode the copy reads a consistent snapshot without blocking
+        # writers, so one step is best (a write from another connection
+        # between steps would restart the copy). Under a rollback journal,
+        # copying `pages` at a time lets writers in between steps.
+        if source.execute('PRAGMA journal_mode').fetchone()[0] == 'wal':
+            pages = -1
+        source.backup(target, pages=pages, sleep=sleep)
+        # A standalone file: no WAL to carry around
+        target.execute('PRAGMA journal_mode = DELETE')
+    finally:
+        target.close()
+        source.close()
+
+
+def create_snapshot(db_path, store, compression=None, level=None, keep=None):
+    """Back up, compress and upload db_path. Returns the stats dict, or None when unchanged"""
+    compression = compression or Config.SNAPSHOT_COMPRESSION
+    level = Config.SNAPSHOT_COMPRESSION_LEVEL if level is None else level
+    keep = Config.SNAPSHOT_KEEP if keep is None else keep
+    opener = COMPRESSORS[compression]
+    prefix = snapshot_prefix(db_path)
+    stats = {'started': time.perf_counter()}
+
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(db_path))) as tmp:
+        copy_path = os.path.join(tmp, 'snapshot.db')
+        backup_to(db_path, copy_path)
+        stats['backup_seconds'] = time.perf_counter() - stats['started']
+
+        # Hashing is much cheaper than compressing: skip unchanged content before paying for it
+        digest = hashlib.sha256()
+        with open(copy_path, 'rb') as src:
+            for chunk in iter(lambda: src.read(COPY_CHUNK), b''):
+                digest.update(chunk)
+        content_hash = digest.hexdigest()[:16]
+        existing = store.list(prefix)
+        if existing and _content_hash(existing[-1]) == content_hash:
+            return None
+
+        compressed_path = os.path.join(tmp, f'snapshot.db.{compression}')
+        with open(copy_path, 'rb') as src, opener(compressed_path, 'wb', level) as dst:
+            shutil.copyfileobj(src, dst, COPY_CHUNK)
+
+        stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%fZ')
+        name = f'{prefix}{stamp}-{content_hash}.db.{compression}'
+        store.upload(compressed_path, name)
+        stats.update(name=name, db_bytes=os.path.getsize(copy_path),
+                     snapshot_bytes=os.path.getsize(compressed_path))
+
+    for old in (existing + [name])[:-keep] if keep > 0 else ():
+        store.delete(old)
+    stats['seconds'] = time.perf_counter() - stats.pop('started')
+    return stats
+
+
+def restore_snapshot(store, name, db_path, verify=True):
+    """Download snapshot `name` and atomically replace db_path with it. Returns stats"""
+    start = time.perf_counter()
+    opener = COMPRESSORS.get(name.rsplit('.', 1)[-1])
+    if opener is None:
+        raise ValueError(f'Unknown snapshot format: {name}')
+
+    directory = os.path.dirname(os.path.abspath(db_path))
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        compressed_path = os.path.join(tmp, name)
+        store.download(name, compressed_path)
+        restored_path = os.path.join(tmp, 'restored.db')
+        with opener(compressed_path, 'rb', None) as src, open(restored_path, 'wb') as dst:
+            shutil.copyfileobj(src, dst, COPY_CHUNK)
+
+        if verify:
+            conn = sqlite3.connect(restored_path)
+            try:
+                result = conn.execute('PRAGMA quick_check').fetchone()[0]
+            finally:
+                conn.close()
+            if result != 'ok':
+                raise sqlite3.DatabaseError(f'Snapshot {name} failed quick_check: {result}')
+
+        # A WAL left from an older file would be replayed into the restored one
+        for stale in (db_path + '-wal', db_path + '-shm'):
+            if os.path.exists(stale):
+                os.remove(stale)
+        db_bytes = os.path.getsize(restored_path)
+        os.replace(restored_path, db_path)
+
+    return {'name': name, 'db_bytes': db_bytes, 'seconds': time.perf_counter() - start}
+
+
+def restore_latest(store, db_path, only_if_missing=True, verify=True):
+    """Restore the newest snapshot of db_path; None when there is none (or the file already has data)"""
+    if only_if_missing and os.path.exists(db_path) and os.path.getsize(db_path) > 0:
+        return None
+    names = store.list(snapshot_prefix(db_path))
+    if not names:
+        return None
+    return restore_snapshot(store, names[-1], db_path, verify)
+
+
+class Snapshotter:
+    """Snapshots a set of database files at most once per `interval` seconds after they change.
+
+    ``mark_dirty`` is cheap and safe to call after every write; it hands a
+    snapshot to ``submit`` (e.g. starting a background thread) when one is
+    due. The first change after startup is snapshotted right away. A change
+    inside the interval arms a single timer for the end of the interval, so
+    it is saved then even if no further write arrives.
+    """
+
+    def __init__(self, store, db_paths, interval=300.0, submit=None, clock=time.monotonic):
+        self.store = store
+        self.db_paths = list(db_paths)
+        self.interval = interval
+        self.submit = submit or (lambda fn: fn())
+        self.clock = clock
+        self.snapshots = 0
+        self.last_stats = None
+        self._dirty = False
+        self._pending = False
+        self._last = None
+        self._timer = None
+        self._lock = threading.Lock()
+        # One snapshot at a time, whether submitted, requested or flushed
+        self._snapshot_lock = threading.Lock()
+
+    def restore(self):
+        """Restore every database file that is missing locally; returns the stats of those restored"""
+        return [stats for stats in (restore_latest(self.store, path) for path in self.db_paths) if stats]
+
+    def mark_dirty(self, *args):
+        with self._lock:
+            self._dirty = True
+        self._schedule()
+
+    def _schedule(self):
+        """Submit a snapshot if one is due, or arm the timer for when it will be"""
+        with self._lock:
+            if not self._dirty or self._pending:
+                return
+            wait = 0 if self._last is None else self._last + self.interval - self.clock()
+            if wait > 0:
+                if self._timer is None:
+                    self._timer = threading.Timer(wait, self._on_timer)
+                    self._timer.daemon = True
+                    self._timer.start()
+                return
+            self._pending = True
+        self.submit(self.snapshot)
+
+    def _on_timer(self):
+        with self._lock:
+            self._timer = None
+        self._schedule()
+
+    def snapshot(self):
+        """Snapshot every file now; returns the stats of those uploaded"""
+        with self._snapshot_lock:
+            with self._lock:
+                self._dirty = False
+            try:
+                uploaded = [stats for stats in (create_snapshot(path, self.store) for path in self.db_paths
+                                                if os.path.exists(path)) if stats]
+            finally:
+                with self._lock:
+                    self._pending = False
+                    self._last = self.clock()
+        self.snapshots += len(uploaded)
+        if uploaded:
+            self.last_stats = uploaded[-1]
+        # Writes made while the copy was taken wait for the next interval
+        self._schedule()
+        return uploaded
+
+    def flush(self):
+        """Wait for a snapshot in progress, then snapshot if anything changed since (shutdown hook)"""
+        with self._snapshot_lock:
+            dirty = self._dirty
+        if dirty:
+            self.snapshot()
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
@@ -0,0 +1,161 @@
+import atexit
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class WriteBehindQueue:
+    """Group-commit queue for single-row writes.
+
+    ``submit`` enqueues a statement and returns a Future. Commits run as
+    jobs handed to ``submit_job`` (app.py passes ``DatabaseExecutor.write``,
+    so they share the one writer thread with every other write; standalone
+    the queue starts a writer thread of its own). Each job takes the first
+    waiting statement plus everything queued behind it (up to
+    ``max_batch``) and runs them in one transaction, so statements that
+    arrive while a commit is in flight share the next one; other writes
+    queued meanwhile run between two group commits. ``max_delay``
+    optionally lingers that long for more statements, holding the writer
+    meanwhile; the default of 0 adds no latency when traffic is light.
+
+    Durability: a Future resolves only after the COMMIT covering its
+    statement, so a caller that waits on it (Transaction.create_transaction
+    does) reads its own write and never acknowledges a row that is still in
+    memory. Statements still queued when the process is killed are lost,
+    but nobody has been told they succeeded. ``close`` (registered with
+    atexit) drains the queue before returning.
+    """
+
+    def __init__(self, db, max_batch=64, max_delay=0.0, submit_job=None):
+        self.db = db
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.commits = 0
+        self.statements = 0
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._scheduled = False
+        self._closed = False
+        self._own_writer = None
+        if submit_job is None:
+            self._own_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='db-write-behind')
+            submit_job = self._own_writer.submit
+        self._submit_job = submit_job
+        # Thread the commit jobs run on, once known
+        self._writer = None
+        atexit.register(self.close)
+
+    def submit(self, query, params=()):
+        """Queue one statement; the Future resolves to its lastrowid once committed"""
+        if self._closed:
+            raise RuntimeError('write-behind queue is closed')
+        return self._put(query, params)
+
+    def flush(self, timeout=None):
+        """Block until everything submitted so far has been committed"""
+        self.submit(None).result(timeout)
+
+    def close(self):
+        """Commit what is queued, then stop accepting statements"""
+        if self._closed:
+            return
+        self._closed = True
+        self._put(None, ()).result()
+        if self._own_writer is not None:
+            self._own_writer.shutdown()
+
+    def _put(self, query, params):
+        future = Future()
+        if threading.get_ident() == self._writer:
+            # A job on the writer thread can't wait for a commit queued behind it
+            self._commit(self.db.get_connection(), [(query, params, future)])
+            return future
+        self._queue.put((query, params, future))
+        self._schedule()
+        return future
+
+    def _schedule(self):
+        with self._lock:
+            if self._scheduled or self._queue.empty():
+                return
+            self._scheduled = True
+        try:
+            self._submit_job(self._run)
+        except RuntimeError:
+            # The writer has shut down (interpreter exit): commit the rest here
+            while self._commit_next():
+                pass
+            self._release()
+
+    def _run(self):
+        self._writer = threading.get_ident()
+        try:
+            self._commit_next()
+        finally:
+            self._release()
+
+    def _release(self):
+        with self._lock:
+            self._scheduled = False
+        # Statements queued while this job held the flag
+        self._schedule()
+
+    def _commit_next(self):
+        try:
+            first = self._queue.get_nowait()
+        except queue.Empty:
+            return False
+        self._commit(self.db.get_connection(), self._next_batch(first))
+        return True
+
+    def _next_batch(self, first):
+        batch = [first]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            try:
+                remaining = deadline - time.monotonic()
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _commit(self, conn, batch):
+        try:
+            results = [
+                conn.execute(query, params).lastrowid if query is not None else None
+                for query, params, _ in batch
+            ]
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            # One bad statement must not fail its neighbours: retry them one by one
+            for item in batch:
+                self._commit_one(conn, item)
+            return
+
+        self.commits += 1
+        self.statements += len(batch)
+        for (_, _, future), result in zip(batch, results):
+            future.set_result(result)
+
+    def _commit_one(self, conn, item):
+        query, params, future = item
+        try:
+            result = conn.execute(query, params).lastrowid if query is not None else None
+            conn.commit()
+        except Exception as exc:
+            conn.rollback()
+            future.set_exception(exc)
+            return
+        self.commits += 1
+        self.statements += 1
+        future.set_result(result)
+
+    def stats(self):
+        return {
+            'commits': self.commits,
+            'statements': self.statements,
+            'avg_group': self.statements / self.commits if self.commits else 0.0,
+            'pending': self._queue.qsize()
+        }
@@ -1,8 +1,13 @@
-from database.db_manager import DatabaseManager
+from database.db_manager import get_database
 
 class Category:
-    def __init__(self):
-        self.db = DatabaseManager()
+    def __init__(self, db=None):
+        self.db = db or get_database()
+        self.listeners = []
+    
+    def add_listener(self, listener):
+        """Register listener(category, version), called after every category change"""
+        self.listeners.append(listener)
     
     def get_all_categories(self):
         query = 'SELECT * FROM categories'
@@ -12,6 +17,57 @@ class Category:
         query = 'SELECT * FROM categories WHERE category_id = ?'
         return self.db.fetch_one(query, (category_id,))
     
+    def get_version(self):
+        """Change counter bumped by every category write, in any worker"""
+        return self.db.get_version('categories')
+    
+    def create_category(self, category_name, category_type, keywords=''):
+        query = 'INSERT INTO categories (category_name, category_type, keywords) VALUES (?, ?, ?)'
+        with self.db.transaction() as conn:
+            cursor = conn.execute(query, (category_name, category_type, self.normalize_keywords(keywords)))
+            version = self.db.bump_version(conn, 'categories')
+        
+        category = self.get_category_by_id(cursor.lastrowid)
+        self._notify(category, version)
+        return category
+    
+    def update_category(self, category_id, **kwargs):
+        allowed_fields = ['category_name', 'category_type', 'keywords']
+        updates = []
+        params = []
+        
+        for key, value in kwargs.items():
+            if key in allowed_fields:
+                if key == 'keywords':
+                    value = self.normalize_keywords(value)
+                updates.append(f'{key} = ?')
+                params.append(value)
+        
+        if not updates:
+            return None
+        
+        params.append(category_id)
+        query = f'UPDATE categories SET {", ".join(updates)} WHERE category_id = ?'
+        with self.db.transaction() as conn:
+            if conn.execute(query, tuple(params)).rowcount == 0:
+                return None
+            version = self.db.bump_version(conn, 'categories')
+        
+        category = self.get_category_by_id(category_id)
+        self._notify(category, version)
+        return category
+    
+    def _notify(self, category, version):
+        for listener in self.listeners:
+            listener(category, version)
+    
+    @staticmethod
+    def normalize_keywords(keywords):
+        """Accept a list or comma-separated string; store lowercase, comma-separated"""
+        if isinstance(keywords, str):
+            keywords = keywords.split(',')
+        return ','.join(k.strip().lower() for k in keywords or [] if k.strip())
+    
     def get_categories_dict(self):
         """Returns dict of {keyword: category_id} for matching"""
         categories = self.get_all_categories()
@@ -28,4 +84,4 @@ class Category:
                         'category_type': cat['category_type']
                     }
         
-        return keywords_dict
\ No newline at end of file
+        return keywords_dict
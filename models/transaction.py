@@ -1,32 +1,162 @@
-from database.db_manager import DatabaseManager
-from datetime import datetime
+import copy
+from config import Config
+from database.db_manager import get_database
+from database.epoch import EPOCH_ORDINAL, SECONDS_PER_DAY, app_now, day_label, day_number, from_epoch, to_epoch
+from database.sharding import get_user_database
+from datetime import datetime, time, timedelta
+
+# Record field -> selected column, in TransactionRecord's positional order
+RECORD_COLUMNS = {
+    'transaction_id': 't.transaction_id',
+    'transaction_type': 't.transaction_type',
+    'amount': 't.amount',
+    'category_id': 't.category_id',
+    'category_name': 'c.category_name',
+    'date': 't.date',
+    'description': 't.description',
+}
+
+# What listings and charts read; description holds the whole raw message
+SUMMARY_FIELDS = ('transaction_id', 'transaction_type', 'amount', 'category_id', 'category_name', 'date')
+
+class TransactionRecord:
+    """Compact transaction row with its date converted once, at fetch time.
+
+    Fields that were not fetched are None. Item access (record['amount'])
+    is kept for code written against sqlite3.Row.
+    """
+    __slots__ = tuple(RECORD_COLUMNS)
+    
+    def __init__(self, transaction_id=None, transaction_type=None, amount=None, category_id=None,
+                 category_name=None, date=None, description=None):
+        self.transaction_id = transaction_id
+        self.transaction_type = transaction_type
+        self.amount = amount
+        self.category_id = category_id
+        self.category_name = category_name
+        self.date = from_epoch(date)
+        self.description = description
+    
+    def __getitem__(self, key):
+        return getattr(self, key)
+    
+    def __repr__(self):
+        return f'TransactionRecord({self.transaction_id}, {self.transaction_type}, {self.amount}, {self.date})'
 
 class Transaction:
-    def __init__(self):
-        self.db = DatabaseManager()
+    """Transactions of one user; every query and write is scoped to ``user_id``"""
+
+    def __init__(self, db=None, write_queue=None, user_id=None):
+        self.db = db or get_database()
+        # Optional WriteBehindQueue: single inserts are group-committed by its writer
+        self.write_queue = write_queue
+        self.user_id = user_id or Config.DEFAULT_USER_ID
+        self.listeners = []
+    
+    def for_user(self, user_id):
+        """This model scoped to another user, sharing its listeners
+
+        With sharding the copy reads and writes that user's shard; the
+        write-behind queue only serves the primary database.
+        """
+        if user_id is None or user_id == self.user_id:
+            return self
+        scoped = copy.copy(self)
+        scoped.user_id = user_id
+        if Config.DATABASE_SHARDS > 1:
+            scoped.db = get_user_database(user_id)
+            scoped.write_queue = None
+        return scoped
+    
+    def add_listener(self, listener):
+        """Register listener(dates, user_id), called with the dates touched by every write"""
+        self.listeners.append(listener)
+    
+    def _notify(self, dates):
+        for listener in self.listeners:
+            listener(dates, self.user_id)
     
     def create_transaction(self, transaction_type, amount, category_id, description='', date=None):
         if date is None:
-            date = datetime.now()
+            date = app_now()
         
         query = '''
-            INSERT INTO transactions (transaction_type, amount, category_id, description, date)
-            VALUES (?, ?, ?, ?, ?)
+            INSERT INTO transactions (transaction_type, amount, category_id, description, date, user_id)
+            VALUES (?, ?, ?, ?, ?, ?)
         '''
-        transaction_id = self.db.execute_query(
-            query, 
-            (transaction_type, amount, category_id, description, date)
-        )
+        params = (transaction_type, amount, category_id, description, to_epoch(date), self.user_id)
+        if self.write_queue is not None:
+            # Waits for the group commit, so the caller reads its own write
+            transaction_id = self.write_queue.submit(query, params).result()
+        else:
+            transaction_id = self.db.execute_query(query, params)
+        self._notify([date])
         return transaction_id
     
-    def get_transactions(self, start_date=None, end_date=None, limit=None):
+    def create_transactions(self, rows, batch_size=500):
+        """Bulk insert (transaction_type, amount, category_id, description, date) rows.
+
+        Rows are consumed lazily and committed in batches of batch_size,
+        each batch one executemany inside one transaction. Dates may be
+        datetimes, ISO strings or epochs. Returns the number of rows inserted.
+        """
         query = '''
-            SELECT t.*, c.category_name, c.category_type 
+            INSERT INTO transactions (transaction_type, amount, category_id, description, date, user_id)
+            VALUES (?, ?, ?, ?, ?, ?)
+        '''
+        inserted = 0
+        batch = []
+        
+        for row in rows:
+            transaction_type, amount, category_id, description, date = row
+            batch.append((transaction_type, amount, category_id, description, to_epoch(date), self.user_id))
+            if len(batch) >= batch_size:
+                inserted += self._insert_batch(query, batch)
+                batch = []
+        
+        if batch:
+            inserted += self._insert_batch(query, batch)
+        
+        return inserted
+    
+    def _insert_batch(self, query, batch):
+        inserted = self.db.execute_many(query, batch)
+        if self.listeners:
+            self._notify({day_label(row[4] // SECONDS_PER_DAY) for row in batch})
+        return inserted
+    
+    def get_transactions(self, start_date=None, end_date=None, limit=None, category_id=None):
+        query, params = self.build_transactions_query(
+            to_epoch(start_date), to_epoch(end_date), limit, category_id, self.user_id
+        )
+        return self.db.fetch_all(query, params)
+    
+    def get_records(self, start_date=None, end_date=None, limit=None, category_id=None, fields=SUMMARY_FIELDS):
+        """Like get_transactions, as TransactionRecords holding only `fields`"""
+        # Unrequested fields are selected as NULL so rows map positionally onto the record
+        columns = ', '.join(
+            column if field in fields else 'NULL' for field, column in RECORD_COLUMNS.items()
+        )
+        query, params = self.build_transactions_query(
+            to_epoch(start_date), to_epoch(end_date), limit, category_id, self.user_id, columns
+        )
+        return [TransactionRecord(*row) for row in self.db.fetch_tuples(query, params)]
+
+    @staticmethod
+    def build_transactions_query(start_date=None, end_date=None, limit=None, category_id=None,
+                                 user_id=Config.DEFAULT_USER_ID, columns='t.*, c.category_name, c.category_type'):
+        """Build the listing query and its parameters (also used for plan checks); dates are epochs"""
+        query = f'''
+            SELECT {columns}
             FROM transactions t
             LEFT JOIN categories c ON t.category_id = c.category_id
-            WHERE 1=1
+            WHERE t.user_id = ?
         '''
-        params = []
+        params = [user_id]
+        
+        if category_id is not None:
+            query += ' AND t.category_id = ?'
+            params.append(category_id)
         
         if start_date:
             query += ' AND date >= ?'
@@ -36,26 +166,224 @@ class Transaction:
             query += ' AND date <= ?'
             params.append(end_date)
         
-        query += ' ORDER BY date DESC'
+        # Dates are whole seconds: the id keeps rows of the same second in insertion order
+        query += ' ORDER BY t.date DESC, t.transaction_id DESC'
         
         if limit:
             query += ' LIMIT ?'
             params.append(limit)
         
+        return query, tuple(params)
+    
+    def get_transactions_page(self, limit=50, after=None, transaction_type=None,
+                              category_id=None, start_date=None, end_date=None):
+        """One page of transactions, newest first, using keyset pagination.
+
+        `after` is the (date, transaction_id) of the last row of the previous
+        page; the next page starts strictly after it, so every page costs
+        an index seek no matter how deep the listing goes. Rows keep the
+        stored epoch date.
+        """
+        query = '''
+            SELECT t.transaction_id, t.transaction_type, t.amount, t.category_id,
+                   c.category_name, t.description, t.date
+            FROM transactions t
+            LEFT JOIN categories c ON t.category_id = c.category_id
+            WHERE t.user_id = ?
+        '''
+        params = [self.user_id]
+        
+        if transaction_type:
+            query += ' AND t.transaction_type = ?'
+            params.append(transaction_type)
+        
+        if category_id is not None:
+            query += ' AND t.category_id = ?'
+            params.append(category_id)
+        
+        if start_date:
+            query += ' AND t.date >= ?'
+            params.append(to_epoch(start_date))
+        
+        if end_date:
+            query += ' AND t.date <= ?'
+            params.append(to_epoch(end_date))
+        
+        if after:
+            query += ' AND (t.date, t.transaction_id) < (?, ?)'
+            params.extend((to_epoch(after[0]), after[1]))
+        
+        query += ' ORDER BY t.date DESC, t.transaction_id DESC LIMIT ?'
+        params.append(limit)
+        
         return self.db.fetch_all(query, tuple(params))
     
+    def iter_transactions(self, page_size=1000, **filters):
+        """Yield every matching transaction, newest first, one keyset page at a time"""
+        after = None
+        while True:
+            page = self.get_transactions_page(page_size, after=after, **filters)
+            yield from page
+            if len(page) < page_size:
+                return
+            after = (page[-1]['date'], page[-1]['transaction_id'])
+    
+    @staticmethod
+    def split_date_range(start_date, end_date):
+        """Split [start_date, end_date] into whole days and partial edges.
+
+        Returns (edges, days): edges is a list of (start, end, end_inclusive)
+        ranges to read from the raw table, days is (first_day, last_day) day
+        numbers to read from daily_rollups, or None when the range has no
+        whole day.
+        """
+        if not isinstance(start_date, datetime) or not isinstance(end_date, datetime):
+            return [(start_date, end_date, True)], None
+
+        first_day = start_date.date()
+        if start_date > datetime.combine(first_day, time.min):
+            first_day += timedelta(days=1)
+
+        last_day = end_date.date()
+        if end_date < datetime.combine(last_day, time.max):
+            last_day -= timedelta(days=1)
+
+        if first_day > last_day:
+            return [(start_date, end_date, True)], None
+
+        edges = []
+        first_midnight = datetime.combine(first_day, time.min)
+        if start_date < first_midnight:
+            edges.append((start_date, first_midnight, False))
+
+        after_last = datetime.combine(last_day + timedelta(days=1), time.min)
+        if end_date >= after_last:
+            edges.append((after_last, end_date, True))
+
+        return edges, (day_number(first_day), day_number(last_day))
+
+    @staticmethod
+    def _range_conditions(start_date, end_date, end_inclusive, params):
+        conditions = ''
+        if start_date:
+            conditions += ' AND date >= ?'
+            params.append(to_epoch(start_date))
+        if end_date:
+            conditions += ' AND date <= ?' if end_inclusive else ' AND date < ?'
+            params.append(to_epoch(end_date))
+        return conditions
+
+    def get_totals(self, start_date=None, end_date=None):
+        """Sum and count per (transaction_type, category_name) for a date range.
+
+        Whole days come from daily_rollups; only the partial days at the
+        edges of the range are summed from the raw transactions table.
+        """
+        edges, days = self.split_date_range(start_date, end_date)
+        rows = []
+
+        for edge_start, edge_end, end_inclusive in edges:
+            params = [self.user_id]
+            query = '''
+                SELECT t.transaction_type, c.category_name,
+                       SUM(t.amount) AS total, COUNT(*) AS count
+                FROM transactions t
+                LEFT JOIN categories c ON t.category_id = c.category_id
+                WHERE t.user_id = ?
+            ''' + self._range_conditions(edge_start, edge_end, end_inclusive, params)
+            query += ' GROUP BY t.transaction_type, c.category_name'
+            rows.extend(self.db.fetch_all(query, tuple(params)))
+
+        if days:
+            query = '''
+                SELECT r.transaction_type, c.category_name,
+                       SUM(r.total) AS total, SUM(r.count) AS count
+                FROM daily_rollups r
+                LEFT JOIN categories c ON r.category_id = c.category_id
+                WHERE r.user_id = ? AND r.day >= ? AND r.day <= ?
+                GROUP BY r.transaction_type, c.category_name
+            '''
+            rows.extend(self.db.fetch_all(query, (self.user_id,) + days))
+
+        totals = {}
+        for row in rows:
+            key = (row['transaction_type'], row['category_name'])
+            entry = totals.setdefault(key, {
+                'transaction_type': key[0],
+                'category_name': key[1],
+                'total': 0,
+                'count': 0
+            })
+            entry['total'] += row['total']
+            entry['count'] += row['count']
+
+        return list(totals.values())
+
+    def get_daily_totals(self, start_date=None, end_date=None, transaction_type='expense'):
+        """Return [(day, total)] sorted by day ('YYYY-MM-DD') for one transaction type"""
+        edges, days = self.split_date_range(start_date, end_date)
+        daily = {}
+
+        for edge_start, edge_end, end_inclusive in edges:
+            params = [self.user_id, transaction_type]
+            query = f'''
+                SELECT date / {SECONDS_PER_DAY} AS day, SUM(amount) AS total
+                FROM transactions
+                WHERE user_id = ? AND transaction_type = ?
+            ''' + self._range_conditions(edge_start, edge_end, end_inclusive, params)
+            query += ' GROUP BY day'
+            for row in self.db.fetch_all(query, tuple(params)):
+                daily[row['day']] = daily.get(row['day'], 0) + row['total']
+
+        if days:
+            query = '''
+                SELECT day, SUM(total) AS total
+                FROM daily_rollups
+                WHERE user_id = ? AND transaction_type = ? AND day >= ? AND day <= ?
+                GROUP BY day
+            '''
+            for row in self.db.fetch_all(query, (self.user_id, transaction_type) + days):
+                daily[row['day']] = daily.get(row['day'], 0) + row['total']
+
+        return [(day_label(day), total) for day, total in sorted(daily.items())]
+    
+    def get_column_rows(self, start_date=None, end_date=None):
+        """(day ordinal, amount, type code, category id) tuples for analytics.columnar
+
+        The day ordinal (date.toordinal()) is computed by SQLite; type code is
+        0 for expenses and 1 for savings; uncategorized rows get category 0.
+        """
+        params = [self.user_id]
+        query = f'''
+            SELECT date / {SECONDS_PER_DAY} + {EPOCH_ORDINAL}, amount,
+                   transaction_type = 'savings', COALESCE(category_id, 0)
+            FROM transactions
+            WHERE user_id = ?
+        ''' + self._range_conditions(start_date, end_date, True, params)
+        return self.db.fetch_tuples(query, tuple(params))
+    
     def get_last_transaction(self):
         query = '''
             SELECT t.*, c.category_name 
             FROM transactions t
             LEFT JOIN categories c ON t.category_id = c.category_id
-            ORDER BY date DESC LIMIT 1
+            WHERE t.user_id = ?
+            ORDER BY t.date DESC, t.transaction_id DESC LIMIT 1
         '''
-        return self.db.fetch_one(query)
+        return self.db.fetch_one(query, (self.user_id,))
+    
+    def get_transaction_date(self, transaction_id):
+        row = self.db.fetch_one(
+            'SELECT date FROM transactions WHERE transaction_id = ? AND user_id = ?',
+            (transaction_id, self.user_id)
+        )
+        return from_epoch(row['date']) if row else None
     
     def delete_transaction(self, transaction_id):
-        query = 'DELETE FROM transactions WHERE transaction_id = ?'
-        self.db.execute_query(query, (transaction_id,))
+        old_date = self.get_transaction_date(transaction_id) if self.listeners else None
+        query = 'DELETE FROM transactions WHERE transaction_id = ? AND user_id = ?'
+        self.db.execute_query(query, (transaction_id, self.user_id))
+        self._notify([old_date])
         return True
     
     def update_transaction(self, transaction_id, **kwargs):
@@ -66,12 +394,14 @@ class Transaction:
         for key, value in kwargs.items():
             if key in allowed_fields:
                 updates.append(f'{key} = ?')
-                params.append(value)
+                params.append(to_epoch(value) if key == 'date' else value)
         
         if not updates:
             return False
         
-        params.append(transaction_id)
-        query = f'UPDATE transactions SET {", ".join(updates)} WHERE transaction_id = ?'
+        old_date = self.get_transaction_date(transaction_id) if self.listeners else None
+        params.extend([transaction_id, self.user_id])
+        query = f'UPDATE transactions SET {", ".join(updates)} WHERE transaction_id = ? AND user_id = ?'
         self.db.execute_query(query, tuple(params))
+        self._notify([old_date, kwargs.get('date')])
         return True
\ No newline at end of file
@@ -0,0 +1,330 @@
+"""Request instrumentation: stage timers, query accounting and Prometheus metrics.
+
+Every request gets a ``RequestTrace`` held in a context variable. Code on
+the hot path reports into it: ``stage('parse')`` / ``@timed('parse')``
+time a named stage, and DatabaseManager reports each query through
+``observe_query``. DatabaseExecutor runs its work inside the caller's
+context, so queries on the reader pool or writer thread count toward the
+request that queued them. When the request ends, its totals are folded
+into process-wide histograms that ``registry.render()`` serves in the
+Prometheus text format.
+
+Everything is in-process counters behind one lock per metric: a stage
+costs two perf_counter calls and a dict update, and with
+``Config.METRICS_ENABLED`` off (or ``set_enabled(False)``) the hooks
+return immediately.
+"""
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+from functools import wraps
+
+from config import Config
+
+DURATION_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+_enabled = Config.METRICS_ENABLED
+
+
+def set_enabled(enabled):
+    global _enabled
+    _enabled = bool(enabled)
+
+
+def is_enabled():
+    return _enabled
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic count per label combination"""
+    kind = 'counter'
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values):
+        return self._values.get(label_values, 0)
+
+    def render(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f'{self.name}{_format_labels(self.labels, key)} {_format_value(v)}' for key, v in items]
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label combination"""
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labels=(), buckets=DURATION_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts (last is +Inf), sum, count]
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, *label_values):
+        series = self._series.get(label_values)
+        return series[2] if series else 0
+
+    def render(self):
+        with self._lock:
+            items = sorted((key, (list(s[0]), s[1], s[2])) for key, s in self._series.items())
+        lines = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += bucket_count
+                le = bound if isinstance(bound, str) else _format_value(float(bound))
+                lines.append(f'{self.name}_bucket{_format_labels(self.labels, key, [("le", le)])} {cumulative}')
+            lines.append(f'{self.name}_sum{_format_labels(self.labels, key)} {_format_value(total)}')
+            lines.append(f'{self.name}_count{_format_labels(self.labels, key)} {count}')
+        return lines
+
+
+class Gauge:
+    """Value read from a callback at scrape time (a number, or {label values: number}).
+
+    Pass kind='counter' when the callback reads a monotonic count kept elsewhere.
+    """
+
+    def __init__(self, name, help_text, callback, labels=(), kind='gauge'):
+        self.kind = kind
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.callback = callback
+
+    def render(self):
+        value = self.callback()
+        items = sorted(value.items()) if isinstance(value, dict) else [((), value)]
+        return [f'{self.name}{_format_labels(self.labels, key)} {_format_value(v)}' for key, v in items]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, help_text, labels=()):
+        return self._register(Counter(name, help_text, labels))
+
+    def histogram(self, name, help_text, labels=(), buckets=DURATION_BUCKETS):
+        return self._register(Histogram(name, help_text, labels, buckets))
+
+    def gauge(self, name, help_text, callback, labels=(), kind='gauge'):
+        return self._register(Gauge(name, help_text, callback, labels, kind))
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format (version 0.0.4)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+REQUESTS = registry.counter('chatbot_requests_total', 'Requests served', ('endpoint', 'status'))
+REQUEST_SECONDS = registry.histogram(
+    'chatbot_request_duration_seconds', 'Request latency until the response is returned', ('endpoint',)
+)
+STAGE_SECONDS = registry.histogram('chatbot_stage_duration_seconds', 'Time spent per named stage', ('stage',))
+QUERY_SECONDS = registry.histogram('chatbot_db_query_duration_seconds', 'SQLite statement latency')
+REQUEST_QUERIES = registry.histogram(
+    'chatbot_db_queries_per_request', 'SQLite statements run per request', ('endpoint',), QUERY_COUNT_BUCKETS
+)
+REQUEST_QUERY_SECONDS = registry.histogram(
+    'chatbot_db_time_per_request_seconds', 'Total SQLite statement time per request', ('endpoint',)
+)
+CONNECTIONS = registry.counter('chatbot_db_connections_opened_total', 'SQLite connections opened')
+
+
+class RequestTrace:
+    """Stage timings and query totals of one request"""
+    __slots__ = ('endpoint', 'started', 'stages', 'queries', 'query_seconds')
+
+    def __init__(self, endpoint):
+        self.endpoint = endpoint
+        self.started = time.perf_counter()
+        self.stages = {}
+        self.queries = 0
+        self.query_seconds = 0.0
+
+    def server_timing(self):
+        """Server-Timing header value (milliseconds per stage, plus db)"""
+        entries = [f'{name};dur={seconds * 1000:.2f}' for name, seconds in self.stages.items()]
+        entries.append(f'db;dur={self.query_seconds * 1000:.2f};desc="{self.queries} queries"')
+        return ', '.join(entries)
+
+
+_current = ContextVar('request_trace', default=None)
+
+
+def current_trace():
+    return _current.get()
+
+
+def start_trace(endpoint):
+    """Begin tracing a request in this context; returns (trace, token), or (None, None) when disabled"""
+    if not _enabled:
+        return None, None
+    trace = RequestTrace(endpoint)
+    return trace, _current.set(trace)
+
+
+def finish_trace(trace, token, status=200):
+    """Fold a finished request into the histograms; returns its duration in seconds"""
+    if trace is None:
+        return 0.0
+    _current.reset(token)
+    elapsed = time.perf_counter() - trace.started
+    REQUESTS.inc(trace.endpoint, str(status))
+    REQUEST_SECONDS.observe(elapsed, trace.endpoint)
+    REQUEST_QUERIES.observe(trace.queries, trace.endpoint)
+    REQUEST_QUERY_SECONDS.observe(trace.query_seconds, trace.endpoint)
+    return elapsed
+
+
+def _record_stage(name, elapsed):
+    STAGE_SECONDS.observe(elapsed, name)
+    trace = _current.get()
+    if trace is not None:
+        trace.stages[name] = trace.stages.get(name, 0.0) + elapsed
+
+
+class stage:
+    """Context manager timing a block as a named stage of the current request"""
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name):
+        self.name = name
+        self.start = None
+
+    def __enter__(self):
+        if _enabled:
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.start is not None:
+            _record_stage(self.name, time.perf_counter() - self.start)
+        return False
+
+
+def timed(name):
+    """Decorator form of ``stage``"""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _record_stage(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def observe_query(seconds):
+    QUERY_SECONDS.observe(seconds)
+    trace = _current.get()
+    if trace is not None:
+        trace.queries += 1
+        trace.query_seconds += seconds
+
+
+def traced_query(fn):
+    """Decorator for DatabaseManager statement methods"""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not _enabled:
+            return fn(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            observe_query(time.perf_counter() - start)
+    return wrapper
+
+
+def init_app(app, profiler=None):
+    """Trace every Flask request: histograms, a Server-Timing header and optional slow-request profiles
+
+    The profiler lives in ``app.extensions['request_profiler']`` and may be swapped at runtime.
+    """
+    from flask import g, request
+
+    app.extensions['request_profiler'] = profiler
+
+    @app.before_request
+    def begin_request_trace():
+        g.request_trace = start_trace(request.endpoint or 'unmatched')
+        active = app.extensions['request_profiler']
+        g.request_profile = (active, active.start()) if active is not None and _enabled else None
+
+    @app.after_request
+    def add_server_timing(response):
+        trace, _ = g.get('request_trace', (None, None))
+        if trace is not None:
+            response.headers['Server-Timing'] = trace.server_timing()
+            g.response_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def end_request_trace(exc=None):
+        # after_request is skipped when the view raises; teardown always runs,
+        # so the trace context and the profiler are released here
+        trace, token = g.pop('request_trace', (None, None))
+        status = 500 if exc is not None else g.pop('response_status', 500)
+        elapsed = finish_trace(trace, token, status)
+        active, profile = g.pop('request_profile', None) or (None, None)
+        if profile is not None:
+            active.stop(profile, elapsed, trace.endpoint)
@@ -0,0 +1,70 @@
+"""Opt-in cProfile dumps for slow requests.
+
+cProfile is too costly to run on every request, so ``SlowRequestProfiler``
+profiles a random sample of them (``Config.PROFILE_SAMPLE_RATE``) and keeps
+the profile only when the request took at least
+``Config.PROFILE_SLOW_MS``. Kept profiles are written as pstats files
+(``<time>-<seq>-<endpoint>-<ms>ms.pstats``) to ``Config.PROFILE_DIR``; only the
+newest ``max_files`` are kept. Inspect one with
+``python -m pstats <file>`` or snakeviz.
+"""
+import cProfile
+import itertools
+import os
+import random
+import re
+import threading
+import time
+
+from monitoring.metrics import registry
+
+PROFILES = registry.counter(
+    'chatbot_slow_request_profiles_total', 'Request profiles written for slow requests', ('endpoint',)
+)
+
+
+class SlowRequestProfiler:
+    def __init__(self, threshold_ms, directory, sample_rate=1.0, max_files=50):
+        self.threshold = threshold_ms / 1000
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.max_files = max_files
+        self._lock = threading.Lock()
+        self._sequence = itertools.count(1)
+
+    def start(self):
+        """Profile of this request, or None when it is not sampled"""
+        if random.random() >= self.sample_rate:
+            return None
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler is already active on this thread
+            return None
+        return profile
+
+    def stop(self, profile, elapsed, endpoint):
+        """Stop profiling; dump the stats when the request was slow. Returns the file path or None"""
+        profile.disable()
+        if elapsed < self.threshold:
+            return None
+        name = re.sub(r'[^A-Za-z0-9_.-]', '_', endpoint)
+        path = os.path.join(
+            self.directory,
+            f'{time.strftime("%Y%m%d-%H%M%S")}-{next(self._sequence)}-{name}-{elapsed * 1000:.0f}ms.pstats'
+        )
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            profile.dump_stats(path)
+            self._prune()
+        PROFILES.inc(endpoint)
+        return path
+
+    def _prune(self):
+        dumps = sorted(
+            (entry for entry in os.scandir(self.directory) if entry.name.endswith('.pstats')),
+            key=lambda entry: entry.stat().st_mtime
+        )
+        for entry in dumps[:-self.max_files]:
+            os.remove(entry.path)
@@ -0,0 +1,46 @@
+"""Synthetic transaction data shared by the benchmark scripts."""
+import random
+from datetime import datetime, timedelta
+
+from config import Config
+from database.epoch import to_epoch
+
+DESCRIPTIONS = {
+    'expense': ['spent {} on lunch', 'paid {} for the jeep fare', 'bought groceries for {}',
+                'spent {} on electricity bill', 'paid {} for movie tickets'],
+    'savings': ['saved {}', 'received salary {}', 'got a gift of {}'],
+}
+
+
+def generate_rows(count, days=365, seed=0, end=None):
+    """Yield (transaction_type, amount, category_id, description, date) tuples spread over `days`"""
+    rng = random.Random(seed)
+    end = end or datetime.now()
+    span = days * 86400
+    category_count = len(Config.DEFAULT_CATEGORIES)
+    for _ in range(count):
+        transaction_type = 'expense' if rng.random() < 0.85 else 'savings'
+        amount = round(rng.uniform(10, 2000), 2)
+        description = rng.choice(DESCRIPTIONS[transaction_type]).format(amount)
+        date = end - timedelta(seconds=rng.randrange(span))
+        yield (transaction_type, amount, rng.randint(1, category_count), description, date)
+
+
+def populate(conn, count, days=365, seed=0, batch_size=50000, user_id=None):
+    """Bulk-load `count` synthetic transactions through a sqlite3 connection
+
+    Dates are written as epochs from schema version 6 on, as ISO text before.
+    """
+    user_id = user_id or Config.DEFAULT_USER_ID
+    convert = to_epoch if conn.execute('PRAGMA user_version').fetchone()[0] >= 6 else str
+    rows = generate_rows(count, days=days, seed=seed)
+    while True:
+        batch = [row[:4] + (convert(row[4]), user_id) for _, row in zip(range(batch_size), rows)]
+        if not batch:
+            break
+        conn.executemany(
+            'INSERT INTO transactions (transaction_type, amount, category_id, description, date, user_id) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            batch
+        )
+        conn.commit()
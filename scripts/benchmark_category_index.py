@@ -0,0 +1,92 @@
+"""Benchmark category matching with a large custom keyword set.
+
+Usage:
+    python scripts/benchmark_category_index.py [--categories 200] [--messages 20000]
+
+Adds synthetic categories (8 keywords each, a quarter of them multi-word
+phrases) and compares the old word-then-substring scan over the keyword
+dict with the KeywordIndex used by MessageParser. Also times an
+incremental category edit against a full index rebuild.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark_parser import build_corpus
+from chatbot.keyword_index import KeywordIndex
+from database.db_manager import DatabaseManager
+from models.category import Category
+
+
+def legacy_match(categories_dict, message):
+    """Previous MessageParser.match_category"""
+    message_lower = message.lower()
+    for word in message_lower.split():
+        if word in categories_dict:
+            return categories_dict[word]
+    for keyword, category_info in categories_dict.items():
+        if keyword in message_lower:
+            return category_info
+    return None
+
+
+def add_categories(category_model, count, seed=0):
+    rng = random.Random(seed)
+    syllables = ['ka', 'lo', 'mi', 'ran', 'to', 'su', 'pe', 'gar', 'vin', 'dol', 'qua', 'zen']
+    for i in range(count):
+        keywords = []
+        for j in range(8):
+            word = ''.join(rng.choice(syllables) for _ in range(3)) + str(i)
+            keywords.append(f'{word} plan' if j % 4 == 0 else word)
+        category_model.create_category(f'Custom {i}', 'expense', keywords)
+
+
+def rate(fn, corpus):
+    start = time.perf_counter()
+    for message in corpus:
+        fn(message)
+    return len(corpus) / (time.perf_counter() - start)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--categories', type=int, default=200)
+    arg_parser.add_argument('--messages', type=int, default=20000)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, 'categories.db'))
+        category_model = Category(db)
+        add_categories(category_model, args.categories)
+
+        categories = category_model.get_all_categories()
+        categories_dict = category_model.get_categories_dict()
+
+        start = time.perf_counter()
+        index = KeywordIndex.from_categories(categories)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        index.with_category(categories[-1])
+        update_ms = (time.perf_counter() - start) * 1000
+
+        corpus = build_corpus(args.messages)
+        custom = [k for k in categories_dict if k[-1].isdigit()]
+        rng = random.Random(1)
+        corpus = [m if i % 3 else f'spent 40 on {rng.choice(custom)}' for i, m in enumerate(corpus)]
+
+        print(f'{len(categories_dict)} keywords in {len(categories)} categories')
+        print(f'index build {build_ms:.2f} ms, incremental category update {update_ms:.3f} ms')
+        print(f"{'matcher':<16}{'messages/sec':>14}")
+        print(f"{'legacy scan':<16}{rate(lambda m: legacy_match(categories_dict, m), corpus):>14.0f}")
+        print(f"{'keyword index':<16}{rate(index.match, corpus):>14.0f}")
+        db.close_all()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""Measure chart payload size and client-side cost before/after downsampling.
+
+Usage:
+    python scripts/benchmark_chart_payload.py [--rows 200000] [--years 5] [--max-points 500]
+
+Requests a multi-year daily report and the yearly summary through the
+Flask test client in four encodings (full series, downsampled, compact,
+compact + gzip) and reports bytes on the wire, chart points shipped, and
+two render-time proxies: JSON decode time and the number of points the
+browser has to lay out.
+"""
+import argparse
+import gzip
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_data import populate
+from config import Config
+
+VARIANTS = [
+    ('full series', {'max_points': 5000}, {}),
+    ('downsampled', {}, {}),
+    ('compact', {'compact': 1}, {}),
+    ('compact + gzip', {'compact': 1}, {'Accept-Encoding': 'gzip'}),
+]
+
+
+def chart_points(payload):
+    charts = payload.get('charts') or {}
+    return sum(len(chart['labels']) for chart in charts.values() if chart)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--rows', type=int, default=200000)
+    arg_parser.add_argument('--years', type=int, default=5)
+    arg_parser.add_argument('--max-points', type=int, default=500)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        Config.DATABASE_PATH = os.path.join(tmp, 'charts.db')
+        import app as app_module
+
+        Config.CHART_MAX_POINTS = args.max_points
+        populate(app_module.db.get_connection(), args.rows, days=365 * args.years)
+        client = app_module.app.test_client()
+
+        endpoints = [
+            (f'{args.years}y by day', f'/api/report?range=last_{365 * args.years}_days&granularity=day'),
+            ('year summary', '/api/summary/year'),
+        ]
+        print(f'{args.rows:,} rows over {args.years} years, max_points={args.max_points}')
+        print(f"{'endpoint':<16}{'encoding':<16}{'bytes':>10}{'points':>8}{'decode ms':>11}")
+        for name, url in endpoints:
+            for label, params, headers in VARIANTS:
+                query = ''.join(f'&{key}={value}' for key, value in params.items())
+                full_url = url + (query if '?' in url else '?' + query[1:] if query else '')
+                response = client.get(full_url, headers=headers)
+                wire = response.data
+                start = time.perf_counter()
+                raw = gzip.decompress(wire) if response.headers.get('Content-Encoding') == 'gzip' else wire
+                payload = json.loads(raw)
+                decode_ms = (time.perf_counter() - start) * 1000
+                print(f'{name:<16}{label:<16}{len(wire):>10,}{chart_points(payload):>8}{decode_ms:>11.2f}')
+        app_module.db.close_all()
+
+
+if __name__ == '__main__':
+    main()
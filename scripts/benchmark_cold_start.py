@@ -0,0 +1,120 @@
+"""Measure cold-start cost of the app: import, first response, and the slowest imports.
+
+Usage:
+    python scripts/benchmark_cold_start.py [--runs 10] [--budget-ms 600] [--importtime 10]
+
+Each run starts a fresh interpreter, the way a serverless instance does on
+a cold start, against an existing database (schema already at the latest
+version), and reports:
+
+  import          `import app`
+  first /chat     import + the first chat request (parser, models, writer)
+  first summary   import + the first /api/summary request (analytics stack)
+  eager import    `import app` with WARM_UP=1 (everything built up front)
+
+Runs with --importtime also print the slowest top-level imports from
+``python -X importtime``. Exits 1 when a median time-to-first-response
+exceeds --budget-ms, so the script can guard cold start in CI.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = '''
+import sys, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+request = sys.argv[1]
+if request != 'none':
+    client = app.app.test_client()
+    if request == 'chat':
+        response = client.post('/chat', json={'message': 'how much did I spend today?'})
+    else:
+        response = client.get('/api/summary/today')
+    assert response.status_code == 200, response.status_code
+print(imported - start, time.perf_counter() - start)
+'''
+
+CASES = [
+    # (name, request, extra environment, counts against the budget)
+    ('import', 'none', {}, False),
+    ('first /chat', 'chat', {}, True),
+    ('first summary', 'summary', {}, True),
+    ('eager import', 'none', {'WARM_UP': '1'}, False),
+]
+
+
+def run_probe(db_path, request, env_extra):
+    env = dict(os.environ, DATABASE_PATH=db_path, **env_extra)
+    out = subprocess.run(
+        [sys.executable, '-c', PROBE, request],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    imported, total = out.stdout.strip().splitlines()[-1].split()
+    return float(total) if request != 'none' else float(imported)
+
+
+def slowest_imports(db_path, count):
+    """(cumulative us, module) of the slowest direct imports of app"""
+    env = dict(os.environ, DATABASE_PATH=db_path)
+    out = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import app'],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Direct imports of app are indented by exactly two spaces
+        if name.startswith('   ') and not name.startswith('    '):
+            rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:count]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--runs', type=int, default=10)
+    arg_parser.add_argument('--budget-ms', type=float, default=600.0,
+                            help='max median time to first response')
+    arg_parser.add_argument('--importtime', type=int, default=0, metavar='N',
+                            help='also list the N slowest imports')
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'cold_start.db')
+        run_probe(db_path, 'chat', {})
+
+        results = []
+        for name, request, env_extra, budgeted in CASES:
+            samples = [run_probe(db_path, request, env_extra) for _ in range(args.runs)]
+            results.append((name, samples, budgeted))
+
+        imports = slowest_imports(db_path, args.importtime) if args.importtime else []
+
+    over_budget = False
+    print(f"{'cold start':<16}{'median ms':>12}{'max ms':>10}")
+    for name, samples, budgeted in results:
+        median = statistics.median(samples) * 1000
+        flag = ''
+        if budgeted and median > args.budget_ms:
+            flag = f'  OVER BUDGET ({args.budget_ms:.0f} ms)'
+            over_budget = True
+        print(f'{name:<16}{median:>12.1f}{max(samples) * 1000:>10.1f}{flag}')
+
+    if imports:
+        print(f"\n{'import':<40}{'cumulative ms':>14}")
+        for cumulative, module in imports:
+            print(f'{module:<40}{cumulative / 1000:>14.1f}')
+
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""Benchmark the columnar analytics path against the row-by-row loops.
+
+Usage:
+    python scripts/benchmark_columnar.py [--rows 1000000] [--days 1095] [--repeat 3]
+
+Over the whole table (multi-year by default) compares:
+  row loops   - get_transactions + ChartGenerator.generate_spending_trend
+                + the summary loop generate_summary used to run per row
+  columnar    - TransactionColumns with NumPy (when installed)
+  array       - TransactionColumns on array-module columns (no NumPy)
+Each columnar run loads the columns and computes daily, weekly and monthly
+buckets, the category breakdown, a 7-day rolling average and percentiles.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_data import populate
+from analytics import columnar
+from analytics.chart_generator import ChartGenerator
+from analytics.columnar import TransactionColumns
+from database.db_manager import DatabaseManager
+from models.transaction import Transaction
+
+
+def row_loops(transaction_model):
+    transactions = transaction_model.get_transactions()
+    ChartGenerator().generate_spending_trend(transactions)
+    total_expenses = 0
+    total_savings = 0
+    category_breakdown = {}
+    for trans in transactions:
+        amount = trans['amount']
+        category = trans['category_name'] or 'Uncategorized'
+        if trans['transaction_type'] == 'expense':
+            total_expenses += amount
+            category_breakdown[category] = category_breakdown.get(category, 0) + amount
+        else:
+            total_savings += amount
+
+
+def columnar_run(use_numpy):
+    def run(transaction_model):
+        columns = TransactionColumns.load(transaction_model, use_numpy=use_numpy)
+        columns.totals()
+        for granularity in columnar.GRANULARITIES:
+            columns.bucket_totals(granularity)
+        columns.category_totals()
+        columns.rolling_average(7)
+        columns.percentiles()
+    return run
+
+
+def measure(fn, transaction_model, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(transaction_model)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--rows', type=int, default=1000000)
+    arg_parser.add_argument('--days', type=int, default=1095)
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    args = arg_parser.parse_args()
+
+    strategies = [('row loops', row_loops)]
+    if columnar.np is not None:
+        strategies.append(('columnar numpy', columnar_run(True)))
+    else:
+        print('NumPy not installed; skipping the vectorized run')
+    strategies.append(('columnar array', columnar_run(False)))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, 'columnar.db'))
+        populate(db.get_connection(), args.rows, days=args.days)
+        transaction_model = Transaction(db)
+
+        print(f'{args.rows:,} rows over {args.days} days')
+        print(f"{'strategy':<16}{'seconds':>10}")
+        for name, fn in strategies:
+            print(f'{name:<16}{measure(fn, transaction_model, args.repeat):>10.3f}')
+        db.close_all()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""Benchmark pooled connections against the old connect-per-query behaviour.
+
+Usage:
+    python scripts/benchmark_db_pool.py [--inserts 2000] [--queries 500]
+
+Runs against a throwaway database in a temp directory and prints
+inserts/sec and summary queries/sec for both strategies.
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.db_manager import DatabaseManager
+from database.epoch import to_epoch
+
+SUMMARY_QUERY = '''
+    SELECT t.*, c.category_name, c.category_type
+    FROM transactions t
+    LEFT JOIN categories c ON t.category_id = c.category_id
+    WHERE 1=1 AND date >= ? AND date <= ?
+    ORDER BY date DESC
+'''
+
+INSERT_QUERY = '''
+    INSERT INTO transactions (transaction_type, amount, category_id, description, date)
+    VALUES (?, ?, ?, ?, ?)
+'''
+
+
+class ConnectPerQueryManager(DatabaseManager):
+    """Previous behaviour: a fresh connection (default journal, full sync) per statement"""
+
+    def get_connection(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def execute_query(self, query, params=()):
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute(query, params)
+        conn.commit()
+        lastrowid = cursor.lastrowid
+        conn.close()
+        return lastrowid
+
+    def fetch_all(self, query, params=()):
+        conn = self.get_connection()
+        results = conn.execute(query, params).fetchall()
+        conn.close()
+        return results
+
+
+def run(manager, inserts, queries):
+    now = datetime.now()
+
+    start = time.perf_counter()
+    for i in range(inserts):
+        manager.execute_query(
+            INSERT_QUERY,
+            ('expense', 50 + i % 100, 1 + i % 8, 'spent on lunch', to_epoch(now - timedelta(minutes=i)))
+        )
+    insert_rate = inserts / (time.perf_counter() - start)
+
+    day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    start = time.perf_counter()
+    for _ in range(queries):
+        manager.fetch_all(SUMMARY_QUERY, (to_epoch(day_start), to_epoch(now)))
+    query_rate = queries / (time.perf_counter() - start)
+
+    return insert_rate, query_rate
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--inserts', type=int, default=2000)
+    arg_parser.add_argument('--queries', type=int, default=500)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+        for name, cls in (('connect-per-query', ConnectPerQueryManager), ('pooled', DatabaseManager)):
+            manager = cls(os.path.join(tmp, f'{name}.db'))
+            results[name] = run(manager, args.inserts, args.queries)
+            manager.close_all()
+
+    print(f"{'strategy':<20}{'inserts/sec':>14}{'summaries/sec':>16}")
+    for name, (insert_rate, query_rate) in results.items():
+        print(f'{name:<20}{insert_rate:>14.0f}{query_rate:>16.0f}')
+
+
+if __name__ == '__main__':
+    main()
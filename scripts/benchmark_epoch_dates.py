@@ -0,0 +1,113 @@
+"""Benchmark ISO text dates (schema 5) against integer epoch dates (schema 6).
+
+Usage:
+    python scripts/benchmark_epoch_dates.py [--rows 1000000] [--repeat 5]
+
+Builds the same synthetic table twice, once at schema version 5 (dates as
+ISO text) and once at the latest version (epoch seconds), then times a
+month listing with per-row date conversion, a yearly raw per-day
+aggregation and an index range count, and reports the file sizes.
+"""
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_data import populate
+from database.epoch import SECONDS_PER_DAY, from_epoch, to_epoch
+from database.migrations import migrate
+
+LISTING = '''
+    SELECT transaction_id, amount, date FROM transactions
+    WHERE user_id = 'default' AND date >= ? AND date <= ? ORDER BY date DESC
+'''
+
+TEXT_DAILY = '''
+    SELECT date(date) AS day, SUM(amount) FROM transactions
+    WHERE user_id = 'default' AND date >= ? AND date <= ? GROUP BY day
+'''
+
+EPOCH_DAILY = f'''
+    SELECT date / {SECONDS_PER_DAY} AS day, SUM(amount) FROM transactions
+    WHERE user_id = 'default' AND date >= ? AND date <= ? GROUP BY day
+'''
+
+RANGE_COUNT = "SELECT COUNT(*) FROM transactions WHERE user_id = 'default' AND date >= ? AND date <= ?"
+
+
+def median_ms(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def build(path, rows, version=None):
+    conn = sqlite3.connect(path)
+    if version is None:
+        migrate(conn)
+    else:
+        migrate(conn, target_version=version)
+    populate(conn, rows)
+    conn.execute('VACUUM')
+    return conn
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--rows', type=int, default=1000000)
+    arg_parser.add_argument('--repeat', type=int, default=5)
+    args = arg_parser.parse_args()
+
+    now = datetime.now()
+    month = (now - timedelta(days=30), now)
+    year = (now - timedelta(days=365), now)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        text_path = os.path.join(tmp, 'text.db')
+        epoch_path = os.path.join(tmp, 'epoch.db')
+        text_conn = build(text_path, args.rows, version=5)
+        epoch_conn = build(epoch_path, args.rows)
+
+        def text_params(bounds):
+            return tuple(str(d) for d in bounds)
+
+        def epoch_params(bounds):
+            return tuple(to_epoch(d) for d in bounds)
+
+        cases = {
+            'month listing': (
+                lambda: [datetime.fromisoformat(r[2]) for r in text_conn.execute(LISTING, text_params(month))],
+                lambda: [from_epoch(r[2]) for r in epoch_conn.execute(LISTING, epoch_params(month))],
+            ),
+            'year per-day sums': (
+                lambda: text_conn.execute(TEXT_DAILY, text_params(year)).fetchall(),
+                lambda: epoch_conn.execute(EPOCH_DAILY, epoch_params(year)).fetchall(),
+            ),
+            'year range count': (
+                lambda: text_conn.execute(RANGE_COUNT, text_params(year)).fetchone(),
+                lambda: epoch_conn.execute(RANGE_COUNT, epoch_params(year)).fetchone(),
+            ),
+        }
+
+        print(f'{args.rows:,} rows, median ms')
+        print(f"{'query':<20}{'ISO text':>12}{'epoch':>12}")
+        for name, (text_fn, epoch_fn) in cases.items():
+            print(f'{name:<20}{median_ms(text_fn, args.repeat):>12.2f}{median_ms(epoch_fn, args.repeat):>12.2f}')
+
+        text_conn.close()
+        epoch_conn.close()
+        mib = 1024 * 1024
+        print(f"{'file size MiB':<20}{os.path.getsize(text_path) / mib:>12.1f}{os.path.getsize(epoch_path) / mib:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
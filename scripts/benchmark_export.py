@@ -0,0 +1,72 @@
+"""Benchmark memory use of exporting every transaction.
+
+Usage:
+    python scripts/benchmark_export.py [--rows 1000000]
+
+Compares materializing the whole table (get_transactions() without a limit,
+then serializing the list) with the streaming /api/transactions/export
+endpoint, which walks keyset pages. Peak memory is measured with
+tracemalloc.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_data import populate
+from config import Config
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, elapsed, peak / 1024 / 1024
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--rows', type=int, default=1000000)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # bench_data has already imported Config, so the environment variable would be ignored
+        Config.DATABASE_PATH = os.path.join(tmp, 'export.db')
+        import app as app_module
+
+        populate(app_module.db.get_connection(), args.rows)
+        client = app_module.app.test_client()
+
+        def materialized():
+            rows = app_module.transaction_model.get_transactions()
+            body = '\n'.join(json.dumps(dict(row)) for row in rows)
+            return len(body)
+
+        def streamed(export_format):
+            def run():
+                response = client.get(f'/api/transactions/export?format={export_format}', buffered=False)
+                size = sum(len(chunk) for chunk in response.response)
+                response.close()
+                return size
+            return run
+
+        print(f'{args.rows:,} rows')
+        print(f"{'strategy':<18}{'MB out':>10}{'seconds':>10}{'peak MiB':>10}")
+        for name, fn in (('fetchall + dump', materialized),
+                         ('stream ndjson', streamed('ndjson')),
+                         ('stream csv', streamed('csv'))):
+            size, elapsed, peak = measure(fn)
+            print(f'{name:<18}{size / 1e6:>10.1f}{elapsed:>10.2f}{peak:>10.1f}')
+        app_module.db.close_all()
+
+
+if __name__ == '__main__':
+    main()
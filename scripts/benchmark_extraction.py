@@ -0,0 +1,92 @@
+"""Benchmark amount/date extraction against the previous implementations.
+
+Usage:
+    python scripts/benchmark_extraction.py [--messages 100000]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark_parser import build_corpus
+from chatbot import extractors
+
+LEGACY_AMOUNT_PATTERN = r'(\d+(?:\.\d{1,2})?)\s*(?:pesos?|php|₱)?'
+
+EXTRA_LINES = [
+    'update {amount} in food on december {day}', 'spent 1,{amount:03d} on rent',
+    'spent {day}.5k on a phone', 'paid {amount} for groceries yesterday',
+    'bought shoes for {amount} last friday', 'spent {amount} 2 days ago',
+    '2025-03-{day:02d} paid {amount} for internet',
+]
+
+
+def legacy_extract_amount(message):
+    match = re.search(LEGACY_AMOUNT_PATTERN, message, re.IGNORECASE)
+    if match:
+        return float(match.group(1))
+    return None
+
+
+def legacy_extract_date(message):
+    """Previous extract_date: rebuilds its month table and regex on every call"""
+    import re
+    from datetime import datetime
+
+    message_lower = message.lower()
+    months = {
+        'january': 1, 'jan': 1, 'february': 2, 'feb': 2, 'march': 3, 'mar': 3,
+        'april': 4, 'apr': 4, 'may': 5, 'june': 6, 'jun': 6, 'july': 7, 'jul': 7,
+        'august': 8, 'aug': 8, 'september': 9, 'sep': 9, 'sept': 9,
+        'october': 10, 'oct': 10, 'november': 11, 'nov': 11, 'december': 12, 'dec': 12
+    }
+    pattern = re.compile(r"(?:on\s+)?(january|february|march|april|may|june|july|august|september|october|november|december|jan|feb|mar|apr|jun|jul|aug|sep|sept|oct|nov|dec)\s*(\d{1,2})?", re.IGNORECASE)
+    m = pattern.search(message_lower)
+    if m:
+        try:
+            return datetime(datetime.now().year, months.get(m.group(1).lower()), int(m.group(2) or 1))
+        except Exception:
+            return None
+    return None
+
+
+def rate(fn, corpus):
+    start = time.perf_counter()
+    for message in corpus:
+        fn(message)
+    return len(corpus) / (time.perf_counter() - start)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--messages', type=int, default=100000)
+    args = arg_parser.parse_args()
+
+    rng = random.Random(2)
+    corpus = build_corpus(args.messages)
+    corpus = [
+        m if i % 4 else rng.choice(EXTRA_LINES).format(amount=rng.randint(10, 999), day=rng.randint(1, 28))
+        for i, m in enumerate(corpus)
+    ]
+
+    fixed_now = datetime(2026, 10, 18, 12, 0)
+    extractors.set_clock(lambda: fixed_now)
+
+    print(f"{'function':<26}{'messages/sec':>14}")
+    print(f"{'legacy extract_amount':<26}{rate(legacy_extract_amount, corpus):>14.0f}")
+    print(f"{'extract_amount':<26}{rate(extractors.extract_amount, corpus):>14.0f}")
+    print(f"{'legacy extract_date':<26}{rate(legacy_extract_date, corpus):>14.0f}")
+    print(f"{'extract_date':<26}{rate(extractors.extract_date, corpus):>14.0f}")
+
+    recognised = sum(1 for m in corpus if extractors.extract_date(m)) - sum(1 for m in corpus if legacy_extract_date(m))
+    print(f'dates found only by the new extractor: {recognised}')
+    extractors.set_clock()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark bulk chat-log import against one insert per message.
+
+Usage:
+    python scripts/benchmark_import.py [--lines 100000] [--batch-size 500]
+
+The per-message baseline parses each line and calls create_transaction,
+committing every row; the bulk path streams the same lines through
+chatbot.importer.import_messages.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark_parser import build_corpus
+from chatbot.importer import import_messages
+from chatbot.message_parser import MessageParser
+from database.db_manager import DatabaseManager
+from models.transaction import Transaction
+
+
+def per_message_import(lines, parser, transaction_model):
+    for line in lines:
+        parsed = parser.parse_message(line)
+        if parsed['intent'] == 'record_transaction':
+            transaction_model.create_transaction(
+                transaction_type=parsed['action'],
+                amount=parsed['amount'],
+                category_id=parsed['category_id'],
+                description=parsed['description'],
+                date=parsed['date']
+            )
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--lines', type=int, default=100000)
+    arg_parser.add_argument('--batch-size', type=int, default=500)
+    args = arg_parser.parse_args()
+
+    lines = build_corpus(args.lines)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+        for name in ('per-message', 'bulk'):
+            db = DatabaseManager(os.path.join(tmp, f'{name}.db'))
+            parser = MessageParser(db)
+            transaction_model = Transaction(db)
+
+            start = time.perf_counter()
+            if name == 'bulk':
+                import_messages(lines, parser, transaction_model, args.batch_size)
+            else:
+                per_message_import(lines, parser, transaction_model)
+            results[name] = len(lines) / (time.perf_counter() - start)
+            db.close_all()
+
+    print(f"{'strategy':<14}{'lines/sec':>12}")
+    for name, lines_per_sec in results.items():
+        print(f'{name:<14}{lines_per_sec:>12.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""Benchmark transaction query latency with and without the transaction indexes.
+
+Usage:
+    python scripts/benchmark_indexes.py [--rows 10000 100000 1000000] [--repeat 20]
+
+For each table size the database is built at the latest schema version,
+timed with the transaction indexes dropped, and timed again once they are
+recreated.
+"""
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_data import populate
+from database.epoch import to_epoch
+from database.migrations import migrate
+from models.transaction import Transaction
+
+
+def query_cases():
+    now = datetime.now()
+    day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    month_start = day_start.replace(day=1)
+    builder = Transaction.build_transactions_query
+    return {
+        'today': builder(to_epoch(day_start), to_epoch(now)),
+        'month': builder(to_epoch(month_start), to_epoch(now)),
+        'recent 20': builder(limit=20),
+        'update lookup': builder(to_epoch(day_start - timedelta(days=3)), to_epoch(day_start - timedelta(days=2)),
+                                 limit=1, category_id=1),
+    }
+
+
+def transaction_indexes(conn):
+    return conn.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = 'transactions' AND sql IS NOT NULL"
+    ).fetchall()
+
+
+def time_queries(conn, repeat):
+    timings = {}
+    for name, (query, params) in query_cases().items():
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            conn.execute(query, params).fetchall()
+            samples.append(time.perf_counter() - start)
+        timings[name] = statistics.median(samples) * 1000
+    return timings
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000, 1000000])
+    arg_parser.add_argument('--repeat', type=int, default=20)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            conn = sqlite3.connect(os.path.join(tmp, f'{rows}.db'))
+            migrate(conn)
+            populate(conn, rows)
+
+            indexes = transaction_indexes(conn)
+            for name, _ in indexes:
+                conn.execute(f'DROP INDEX {name}')
+            before = time_queries(conn, args.repeat)
+
+            start = time.perf_counter()
+            for _, sql in indexes:
+                conn.execute(sql)
+            build_seconds = time.perf_counter() - start
+            after = time_queries(conn, args.repeat)
+            conn.close()
+
+            print(f'\n{rows:,} rows (index build {build_seconds:.2f}s), median ms')
+            print(f"  {'query':<16}{'no index':>12}{'indexed':>12}")
+            for name in before:
+                print(f'  {name:<16}{before[name]:>12.2f}{after[name]:>12.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""Measure the request overhead of the built-in instrumentation.
+
+Usage:
+    python scripts/benchmark_instrumentation.py [--rows 50000] [--requests 300] [--rounds 21]
+
+Drives /chat (record, query and delete messages) and uncached /api/summary
+requests through the Flask test client with metrics off, metrics on, and
+metrics on plus the slow-request profiler sampling 5% of requests (with a
+threshold no request reaches, so only the profiling itself is paid).
+Modes are interleaved over many short rounds in rotating order; reports
+the best round's per-request process CPU time of each mode (the least
+noisy estimate on a shared machine) and its overhead against metrics off.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_data import populate
+from config import Config
+from monitoring import metrics
+from monitoring.profiler import SlowRequestProfiler
+
+# Each recorded transaction is deleted again so the table size stays fixed across rounds
+MESSAGES = ['spent 120 on lunch', 'how much did i spend this week', 'delete last transaction', 'show my month summary']
+PERIODS = ['today', 'week', 'month']
+
+
+def drive(app_module, client, requests):
+    """CPU seconds (all threads) per request over a fixed mix of chat and summary requests"""
+    start = time.process_time()
+    for i in range(requests):
+        if i % 2:
+            client.post('/chat', json={'message': MESSAGES[i // 2 % len(MESSAGES)]})
+        else:
+            app_module.summary_cache.clear()
+            client.get(f'/api/summary/{PERIODS[i // 2 % len(PERIODS)]}')
+    return (time.process_time() - start) / requests
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--rows', type=int, default=50000)
+    arg_parser.add_argument('--requests', type=int, default=300)
+    arg_parser.add_argument('--rounds', type=int, default=21)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        Config.DATABASE_PATH = os.path.join(tmp, 'instrumentation.db')
+        import app as app_module
+
+        populate(app_module.db.get_connection(), args.rows)
+        client = app_module.app.test_client()
+        sampling = SlowRequestProfiler(float('inf'), os.path.join(tmp, 'profiles'), sample_rate=0.05)
+
+        modes = {
+            'metrics off': (False, None),
+            'metrics on': (True, None),
+            'metrics + 5% profiling': (True, sampling),
+        }
+        samples = {name: [] for name in modes}
+        drive(app_module, client, args.requests // 10)  # warm up
+        names = list(modes)
+        for round_number in range(args.rounds):
+            shift = round_number % len(names)
+            for name in names[shift:] + names[:shift]:
+                enabled, profiler = modes[name]
+                metrics.set_enabled(enabled)
+                app_module.app.extensions['request_profiler'] = profiler
+                samples[name].append(drive(app_module, client, args.requests))
+
+        baseline = min(samples['metrics off'])
+        print(f'{args.rows:,} rows, {args.requests} requests x {args.rounds} rounds, best round')
+        print(f"{'mode':<26}{'cpu ms/req':>12}{'added us':>10}{'overhead':>10}")
+        for name, values in samples.items():
+            best = min(values)
+            print(f'{name:<26}{best * 1000:>12.3f}{(best - baseline) * 1e6:>10.1f}{(best / baseline - 1) * 100:>9.1f}%')
+        app_module.db.close_all()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark per-user summary latency on a database shared by many users.
+
+Usage:
+    python scripts/benchmark_multi_user.py [--users 10000] [--rows-per-user 1000]
+                                           [--sample 200] [--shards 1]
+
+Loads `--users` users with `--rows-per-user` transactions each into a temp
+database (or `--shards` hash-sharded files), then times period summaries
+for a random sample of users and, for contrast, the same summary over
+every user's rows, which is what each request computed before
+transactions were partitioned by user.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_data import populate
+from config import Config
+from database.epoch import to_epoch
+
+PERIODS = ['today', 'week', 'month', 'year']
+
+GLOBAL_SUMMARY = '''
+    SELECT t.transaction_type, c.category_name, SUM(t.amount) AS total, COUNT(*) AS count
+    FROM transactions t
+    LEFT JOIN categories c ON t.category_id = c.category_id
+    WHERE t.date >= ? AND t.date <= ?
+    GROUP BY t.transaction_type, c.category_name
+'''
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return samples[len(samples) // 2] * 1000, samples[int(len(samples) * 0.99)] * 1000
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--users', type=int, default=10000)
+    arg_parser.add_argument('--rows-per-user', type=int, default=1000)
+    arg_parser.add_argument('--sample', type=int, default=200, help='users timed per period')
+    arg_parser.add_argument('--shards', type=int, default=1)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        Config.DATABASE_PATH = os.path.join(tmp, 'users.db')
+        Config.DATABASE_SHARDS = args.shards
+
+        from analytics.report_generator import ReportGenerator
+        from database.db_manager import get_database
+        from database.sharding import get_user_database
+
+        user_ids = [f'user{i}' for i in range(args.users)]
+        start = time.perf_counter()
+        for seed, user_id in enumerate(user_ids):
+            populate(get_user_database(user_id).get_connection(), args.rows_per_user,
+                     seed=seed, user_id=user_id)
+        print(f'{args.users:,} users x {args.rows_per_user:,} rows, {args.shards} shard(s), '
+              f'loaded in {time.perf_counter() - start:.0f}s')
+
+        report_gen = ReportGenerator(get_database())
+        sample = random.Random(0).sample(user_ids, min(args.sample, len(user_ids)))
+
+        print(f"{'period':<8}{'user p50 ms':>13}{'user p99 ms':>13}{'all-users ms':>14}")
+        for period in PERIODS:
+            latencies = []
+            for user_id in sample:
+                reports = report_gen.for_user(user_id)
+                started = time.perf_counter()
+                reports.generate_summary(period)
+                latencies.append(time.perf_counter() - started)
+            p50, p99 = percentiles(latencies)
+
+            start_date, end_date = report_gen.get_date_range(period)
+            started = time.perf_counter()
+            get_user_database(user_ids[0]).fetch_all(GLOBAL_SUMMARY, (to_epoch(start_date), to_epoch(end_date)))
+            everyone = (time.perf_counter() - started) * 1000
+            print(f'{period:<8}{p50:>13.2f}{p99:>13.2f}{everyone:>14.1f}')
+
+
+if __name__ == '__main__':
+    main()
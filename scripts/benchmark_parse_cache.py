@@ -0,0 +1,86 @@
+"""Benchmark the message template cache in MessageParser.
+
+Usage:
+    python scripts/benchmark_parse_cache.py [--messages 50000] [--unique 0.1]
+
+Builds a skewed chat stream: the weighted message mix of the benchmark
+suite (a few shapes with varying amounts and days make up most traffic)
+plus a --unique share of one-off messages that never repeat a template.
+Checks that every message parses the same with and without the cache,
+then reports parse throughput and hit rate for several cache sizes.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import generate_messages
+from chatbot.message_parser import MessageParser
+from database.db_manager import DatabaseManager
+
+WORDS = ['lunch', 'jeep', 'rent', 'movie', 'shoes', 'tita', 'salary', 'grab', 'books', 'market',
+         'merienda', 'load', 'tricycle', 'laundry', 'haircut', 'pizza', 'bonus', 'fare', 'gym', 'water']
+SIZES = [0, 64, 1024]
+# Same template, different outcome: the amount decides between record and missing_amount
+EDGE_CASES = ['spent 0 on lunch', 'spent 50 on lunch', 'spent 1,250.50 on lunch', 'spent 2k on lunch',
+              'update 250 in food on december 1', 'update 0 in food on 2024-02-30', 'saved 3 days ago',
+              'spent on lunch', 'SPENT 70 ON LUNCH', 'spent 70 on lunch yesterday']
+
+
+def build_stream(count, unique_share, seed=0):
+    rng = random.Random(seed)
+    messages = generate_messages(count, seed=seed)
+    for i in range(int(count * unique_share)):
+        words = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 4)))
+        messages[rng.randrange(count)] = f'{rng.choice(["spent", "paid", "saved"])} {rng.randint(1, 999)} on {words} ref{i}'
+    return messages
+
+
+def comparable(result):
+    # 'date' defaults to now(), which moves between the two parses
+    return dict(result, date=result['date'].date())
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--messages', type=int, default=50000)
+    arg_parser.add_argument('--unique', type=float, default=0.1, help='share of one-off messages')
+    args = arg_parser.parse_args()
+
+    stream = build_stream(args.messages, args.unique)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, 'parse_cache.db'))
+        uncached = MessageParser(db, cache_size=0)
+        cached = MessageParser(db, cache_size=1024)
+        mismatches = [
+            message for message in EDGE_CASES + stream + [m.upper() for m in stream[:2000]]
+            if comparable(cached.parse_message(message)) != comparable(uncached.parse_message(message))
+        ]
+        for message in mismatches[:20]:
+            print(f'MISMATCH {message!r}')
+
+        print(f'{args.messages:,} messages, {len(set(stream)):,} distinct, {args.unique:.0%} one-off')
+        print(f"{'cache size':<12}{'messages/sec':>14}{'us/message':>12}{'hit rate':>10}")
+        for size in SIZES:
+            parser = MessageParser(db, cache_size=size)
+            for message in stream[:1000]:
+                parser.parse_message(message)
+            parser.cache.hits = parser.cache.misses = 0
+            start = time.perf_counter()
+            for message in stream:
+                parser.parse_message(message)
+            elapsed = time.perf_counter() - start
+            hit_rate = f"{parser.cache.stats()['hit_rate']:.1%}" if size else '-'
+            print(f'{size:<12}{len(stream) / elapsed:>14.0f}{elapsed / len(stream) * 1e6:>12.2f}{hit_rate:>10}')
+        db.close_all()
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
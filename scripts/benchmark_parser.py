@@ -0,0 +1,144 @@
+"""Benchmark MessageParser.parse_message throughput on realistic chat lines.
+
+Usage:
+    python scripts/benchmark_parser.py [--messages 50000]
+
+Compares the single-pass keyword scanner with the previous
+one-substring-pass-per-keyword-list classifier and checks that both
+resolve every message in the corpus to the same intent.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chatbot import patterns
+from chatbot.message_parser import MessageParser
+from database.db_manager import DatabaseManager
+
+TEMPLATES = [
+    'spent {amount} on lunch', 'I spent {amount} pesos on groceries today',
+    'paid {amount} for the jeep fare', 'bought new shoes for {amount}',
+    'paid {amount} php electricity bill', 'saved {amount}', 'received salary {amount}',
+    'got {amount} as a gift from tita', 'earned {amount} from freelance work',
+    'show today summary', 'how much did I spend this week?', 'display monthly report',
+    'show this year', 'total for yesterday', 'hi', 'hello there', 'good morning!',
+    'help', 'what can you do', 'delete last transaction', 'remove the last one',
+    'update {amount} in food on december {day}', 'change {amount} in transport on jan {day}',
+    'how can i save money?', 'any tips?', 'spent on food', 'saved some money',
+    'spent {amount} and saved {amount}', 'asdf qwerty', 'coffee {amount}',
+]
+
+
+def build_corpus(size, seed=0):
+    rng = random.Random(seed)
+    return [
+        rng.choice(TEMPLATES).format(amount=rng.randint(10, 5000), day=rng.randint(1, 28))
+        for _ in range(size)
+    ]
+
+
+def legacy_intent(message):
+    """Intent resolution as it worked before the scanner: one substring pass per list"""
+    message_lower = message.lower()
+
+    def any_in(keywords):
+        return any(keyword in message_lower for keyword in keywords)
+
+    actions = [name for name, keywords in (
+        ('delete', patterns.DELETE_KEYWORDS), ('update', patterns.UPDATE_KEYWORDS),
+        ('expense', patterns.EXPENSE_KEYWORDS), ('savings', patterns.SAVINGS_KEYWORDS),
+    ) if any_in(keywords)]
+    if len(actions) > 1:
+        return 'ambiguous'
+    if any_in(patterns.GREETING_KEYWORDS):
+        return 'greeting'
+    if any_in(patterns.HELP_KEYWORDS):
+        return 'help'
+    if any_in(patterns.DELETE_KEYWORDS):
+        return 'delete'
+    if any_in(patterns.QUERY_KEYWORDS):
+        for phrase in patterns.TIME_PERIODS:
+            if phrase in message_lower:
+                break
+        return 'query'
+    if any_in(patterns.UPDATE_KEYWORDS):
+        patterns.extract_amount(message)
+        return 'update'
+    amount = patterns.extract_amount(message)
+    action = None
+    if any_in(patterns.EXPENSE_KEYWORDS):
+        action = 'expense'
+    elif any_in(patterns.SAVINGS_KEYWORDS):
+        action = 'savings'
+    if action and not amount:
+        return 'missing_amount'
+    if amount and action:
+        return 'record_transaction'
+    if 'save' in message_lower or 'advice' in message_lower or 'tip' in message_lower:
+        return 'advice'
+    return 'unknown'
+
+
+def scanner_intent(message):
+    """The same resolution driven off a single scan_keywords() result"""
+    hits = patterns.scan_keywords(message)
+    if patterns.has_conflicting_keywords(message, hits)[0]:
+        return 'ambiguous'
+    for keyword_class, intent in (('greeting', 'greeting'), ('help', 'help'), ('delete', 'delete')):
+        if keyword_class in hits:
+            return intent
+    if 'query' in hits:
+        patterns.extract_time_period(message, hits)
+        return 'query'
+    if 'update' in hits:
+        patterns.extract_amount(message)
+        return 'update'
+    amount = patterns.extract_amount(message)
+    action = patterns.extract_action(message, hits)
+    if action and not amount:
+        return 'missing_amount'
+    if amount and action:
+        return 'record_transaction'
+    if 'advice' in hits:
+        return 'advice'
+    return 'unknown'
+
+
+def rate(fn, corpus):
+    start = time.perf_counter()
+    for message in corpus:
+        fn(message)
+    return len(corpus) / (time.perf_counter() - start)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--messages', type=int, default=50000)
+    args = arg_parser.parse_args()
+
+    corpus = build_corpus(args.messages)
+
+    mismatches = [m for m in set(corpus) if legacy_intent(m) != scanner_intent(m)]
+    for message in mismatches:
+        print(f'MISMATCH {message!r}: {legacy_intent(message)} != {scanner_intent(message)}')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, 'parser.db'))
+        parser = MessageParser(db)
+
+        print(f"{'classifier':<28}{'messages/sec':>14}")
+        print(f"{'legacy substring passes':<28}{rate(legacy_intent, corpus):>14.0f}")
+        print(f"{'single-pass scanner':<28}{rate(scanner_intent, corpus):>14.0f}")
+        print(f"{'MessageParser.parse_message':<28}{rate(parser.parse_message, corpus):>14.0f}")
+        db.close_all()
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
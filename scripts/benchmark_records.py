@@ -0,0 +1,81 @@
+"""Benchmark memory and loop time of transaction row representations.
+
+Usage:
+    python scripts/benchmark_records.py [--rows 100000] [--repeat 3]
+
+Fetches every transaction as:
+  sqlite3.Row    - get_transactions (SELECT t.*, description included)
+  records        - get_records: TransactionRecord with __slots__, projected
+                   columns only and dates parsed once at fetch
+and reports retained memory per 100k rows (tracemalloc), fetch time, and
+the time of the loops the app runs over them (spending trend chart,
+per-type totals, recent-list formatting).
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_data import populate
+from analytics.chart_generator import ChartGenerator
+from database.db_manager import DatabaseManager
+from database.epoch import from_epoch
+from models.transaction import Transaction
+
+
+def loops(rows):
+    ChartGenerator().generate_spending_trend(rows)
+    totals = {}
+    for trans in rows:
+        totals[trans['transaction_type']] = totals.get(trans['transaction_type'], 0) + trans['amount']
+    for trans in rows[:1000]:
+        date = trans['date']
+        if not isinstance(date, datetime):
+            date = from_epoch(date)
+        f"{trans['amount']:.2f} - {trans['category_name']} ({date.strftime('%b %d, %I:%M %p')})"
+
+
+def measure(fetch, rows_count, repeat):
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = fetch()
+    fetch_seconds = time.perf_counter() - start
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        loops(rows)
+        samples.append(time.perf_counter() - start)
+    return retained / rows_count * 100000 / 1024 / 1024, fetch_seconds, statistics.median(samples)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--rows', type=int, default=100000)
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, 'records.db'))
+        populate(db.get_connection(), args.rows)
+        transaction_model = Transaction(db)
+
+        print(f'{args.rows:,} rows')
+        print(f"{'representation':<16}{'MiB/100k':>10}{'fetch s':>10}{'loops s':>10}")
+        for name, fetch in (('sqlite3.Row', transaction_model.get_transactions),
+                            ('records', transaction_model.get_records)):
+            mib, fetch_seconds, loop_seconds = measure(fetch, args.rows, args.repeat)
+            print(f'{name:<16}{mib:>10.1f}{fetch_seconds:>10.3f}{loop_seconds:>10.3f}')
+        db.close_all()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""Benchmark multi-year range reports: rollups vs. raw-row bucketing.
+
+Usage:
+    python scripts/benchmark_report_range.py [--rows 1000000] [--years 5] [--repeat 3]
+
+For ranges of 1 year up to `--years` and each granularity, times
+ReportGenerator.generate_report (totals and buckets from daily_rollups)
+against fetching every transaction in the range and bucketing in Python,
+which is what a long view cost before.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_data import populate
+from analytics.buckets import GRANULARITIES, bucket_label, month_start, week_start
+from analytics.report_generator import ReportGenerator
+from database.db_manager import DatabaseManager
+from database.epoch import from_epoch
+
+
+def raw_report(report_gen, start_date, end_date, granularity):
+    bucket_of = {'day': lambda o: o, 'week': week_start, 'month': month_start}[granularity]
+    buckets = {}
+    breakdown = {}
+    for trans in report_gen.transaction_model.get_transactions(start_date, end_date):
+        ordinal = bucket_of(from_epoch(trans['date']).date().toordinal())
+        bucket = buckets.setdefault(ordinal, {'expense': 0.0, 'savings': 0.0})
+        bucket[trans['transaction_type']] += trans['amount']
+        if trans['transaction_type'] == 'expense':
+            category = trans['category_name'] or 'Uncategorized'
+            breakdown[category] = breakdown.get(category, 0) + trans['amount']
+    return [(bucket_label(o, granularity), buckets[o]) for o in sorted(buckets)], breakdown
+
+
+def measure(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--rows', type=int, default=1000000)
+    arg_parser.add_argument('--years', type=int, default=5)
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, 'report.db'))
+        populate(db.get_connection(), args.rows, days=365 * args.years)
+        report_gen = ReportGenerator(db)
+        end_date = datetime.now()
+
+        print(f'{args.rows:,} rows over {args.years} years')
+        print(f"{'range':<8}{'granularity':<13}{'buckets':>8}{'raw ms':>10}{'rollup ms':>11}")
+        for years in sorted({1, max(1, args.years // 2), args.years}):
+            start_date = datetime.combine(date.today() - timedelta(days=365 * years), datetime.min.time())
+            for granularity in GRANULARITIES:
+                _, data = report_gen.generate_report(start_date, end_date, granularity)
+                rollup_ms = measure(lambda: report_gen.generate_report(start_date, end_date, granularity),
+                                    args.repeat)
+                raw_ms = measure(lambda: raw_report(report_gen, start_date, end_date, granularity), args.repeat)
+                print(f"{f'{years}y':<8}{granularity:<13}{len(data['buckets']):>8}{raw_ms:>10.1f}{rollup_ms:>11.1f}")
+        db.close_all()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Benchmark greeting/help response throughput with and without the cache.
+
+Usage:
+    python scripts/benchmark_responses.py [--requests 50000]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chatbot.response_generator import ResponseGenerator
+from database.db_manager import DatabaseManager
+
+
+class UncachedResponseGenerator(ResponseGenerator):
+    """Previous behaviour: one SELECT per predefined response"""
+
+    def get_predefined_response(self, response_type):
+        query = 'SELECT response_text FROM chatbot_responses WHERE response_type = ? LIMIT 1'
+        result = self.db.fetch_one(query, (response_type,))
+        if result:
+            return result['response_text']
+        return "Hello! How can I help you today?"
+
+
+def measure(response_gen, requests):
+    intents = ['greeting', 'help', 'advice']
+    samples = []
+    start = time.perf_counter()
+    for i in range(requests):
+        call_start = time.perf_counter()
+        response_gen.generate_response(intents[i % len(intents)])
+        samples.append(time.perf_counter() - call_start)
+    elapsed = time.perf_counter() - start
+    samples.sort()
+    return requests / elapsed, statistics.median(samples) * 1e6, samples[int(len(samples) * 0.99)] * 1e6
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--requests', type=int, default=50000)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, 'responses.db'))
+        print(f"{'strategy':<10}{'responses/sec':>15}{'p50 us':>10}{'p99 us':>10}")
+        for name, cls in (('query', UncachedResponseGenerator), ('cached', ResponseGenerator)):
+            throughput, p50, p99 = measure(cls(db), args.requests)
+            print(f'{name:<10}{throughput:>15.0f}{p50:>10.1f}{p99:>10.1f}')
+        db.close_all()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""Check and benchmark summaries and trend charts served from daily_rollups.
+
+Usage:
+    python scripts/benchmark_rollups.py [--rows 100000 1000000] [--repeat 5]
+
+For each table size this first runs a consistency check: random inserts,
+updates and deletes followed by verify_rollups and a comparison of every
+period's totals against a raw-table aggregation. It then times week, month
+and year summaries plus the yearly trend series, raw vs. rollups.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_data import generate_rows, populate
+from analytics.report_generator import ReportGenerator
+from database.db_manager import DatabaseManager
+from database.epoch import SECONDS_PER_DAY, day_label, to_epoch
+from database.rollups import verify_rollups
+from models.transaction import Transaction
+
+PERIODS = ['today', 'yesterday', 'week', 'month', 'year']
+
+
+def raw_totals(db, start_date, end_date):
+    rows = db.fetch_all('''
+        SELECT t.transaction_type, c.category_name, SUM(t.amount) AS total, COUNT(*) AS count
+        FROM transactions t LEFT JOIN categories c ON t.category_id = c.category_id
+        WHERE date >= ? AND date <= ?
+        GROUP BY t.transaction_type, c.category_name
+    ''', (to_epoch(start_date), to_epoch(end_date)))
+    return {(r['transaction_type'], r['category_name']): (r['total'], r['count']) for r in rows}
+
+
+def raw_daily(db, start_date, end_date):
+    rows = db.fetch_all(f'''
+        SELECT date / {SECONDS_PER_DAY} AS day, SUM(amount) AS total FROM transactions
+        WHERE transaction_type = 'expense' AND date >= ? AND date <= ?
+        GROUP BY day ORDER BY day
+    ''', (to_epoch(start_date), to_epoch(end_date)))
+    return [(day_label(r['day']), r['total']) for r in rows]
+
+
+def check_consistency(db, transaction_model, report_gen, operations=2000, seed=1):
+    rng = random.Random(seed)
+    ids = [r[0] for r in db.fetch_all('SELECT transaction_id FROM transactions ORDER BY RANDOM() LIMIT 5000')]
+    for row in generate_rows(operations, seed=seed):
+        choice = rng.random()
+        if choice < 0.5 or not ids:
+            ids.append(transaction_model.create_transaction(*row))
+        elif choice < 0.8:
+            transaction_model.update_transaction(
+                rng.choice(ids), amount=row[1], category_id=row[2], date=row[4]
+            )
+        else:
+            transaction_model.delete_transaction(ids.pop(rng.randrange(len(ids))))
+
+    problems = verify_rollups(db.get_connection())
+    for period in PERIODS:
+        start_date, end_date = report_gen.get_date_range(period)
+        expected = raw_totals(db, start_date, end_date)
+        actual = {
+            (r['transaction_type'], r['category_name']): (r['total'], r['count'])
+            for r in transaction_model.get_totals(start_date, end_date)
+        }
+        if expected.keys() != actual.keys() or any(
+            abs(expected[k][0] - actual[k][0]) > 0.005 or expected[k][1] != actual[k][1] for k in expected
+        ):
+            problems.append(('totals', period))
+        expected_daily = raw_daily(db, start_date, end_date)
+        actual_daily = transaction_model.get_daily_totals(start_date, end_date)
+        if [d for d, _ in expected_daily] != [d for d, _ in actual_daily] or any(
+            abs(a[1] - b[1]) > 0.005 for a, b in zip(expected_daily, actual_daily)
+        ):
+            problems.append(('daily', period))
+    return problems
+
+
+def median_ms(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--rows', type=int, nargs='+', default=[100000, 1000000])
+    arg_parser.add_argument('--repeat', type=int, default=5)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            db = DatabaseManager(os.path.join(tmp, f'{rows}.db'))
+            populate(db.get_connection(), rows)
+            transaction_model = Transaction(db)
+            report_gen = ReportGenerator(db)
+
+            problems = check_consistency(db, transaction_model, report_gen)
+            print(f'\n{rows:,} rows: consistency {"FAILED " + str(problems[:5]) if problems else "ok"}')
+            print(f"  {'query':<14}{'raw ms':>10}{'rollup ms':>12}")
+            for period in ('week', 'month', 'year'):
+                start_date, end_date = report_gen.get_date_range(period)
+                raw = median_ms(lambda: raw_totals(db, start_date, end_date), args.repeat)
+                rolled = median_ms(lambda: transaction_model.get_totals(start_date, end_date), args.repeat)
+                print(f'  {period:<14}{raw:>10.2f}{rolled:>12.2f}')
+
+            start_date, end_date = report_gen.get_date_range('year')
+            raw = median_ms(lambda: raw_daily(db, start_date, end_date), args.repeat)
+            rolled = median_ms(lambda: transaction_model.get_daily_totals(start_date, end_date), args.repeat)
+            print(f"  {'year trend':<14}{raw:>10.2f}{rolled:>12.2f}")
+            db.close_all()
+
+
+if __name__ == '__main__':
+    main()
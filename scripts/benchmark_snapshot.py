@@ -0,0 +1,64 @@
+"""Time database snapshots and restores (database/snapshot.py).
+
+Usage:
+    python scripts/benchmark_snapshot.py [--mb 100] [--formats gz:1,gz:6,xz:1]
+
+Builds a synthetic database of about --mb MiB, then for each
+compression format and level times a snapshot into a local directory
+store, an unchanged re-snapshot (skipped by content hash), and a restore
+into an empty path, with and without the quick_check verification. The
+restore is what a new serverless instance pays before its first request.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import build_database
+from database.snapshot import LocalDirectoryStore, create_snapshot, restore_snapshot
+
+# Synthetic rows take about this much space with indexes and rollups
+BYTES_PER_ROW = 170
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--mb', type=float, default=100)
+    arg_parser.add_argument('--formats', default='gz:1,gz:6,xz:1', help='comma-separated format:level')
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'source.db')
+        print(f'building ~{args.mb:.0f} MiB database...', file=sys.stderr)
+        data = build_database(db_path, int(args.mb * 2 ** 20 / BYTES_PER_ROW), users=10)
+        print(f"{data['rows']:,} rows, {data['db_bytes'] / 2 ** 20:.1f} MiB")
+        print(f"{'format':<8}{'snapshot s':>11}{'backup s':>10}{'MiB':>8}{'ratio':>7}"
+              f"{'unchanged s':>13}{'restore s':>11}{'no verify s':>13}")
+
+        for spec in args.formats.split(','):
+            compression, level = spec.split(':')
+            store = LocalDirectoryStore(os.path.join(tmp, f'store-{compression}{level}'))
+            stats = create_snapshot(db_path, store, compression, int(level))
+
+            start = time.perf_counter()
+            assert create_snapshot(db_path, store, compression, int(level)) is None
+            unchanged = time.perf_counter() - start
+
+            restored = os.path.join(tmp, f'restored-{compression}{level}.db')
+            restore = restore_snapshot(store, stats['name'], restored)
+            os.remove(restored)
+            start = time.perf_counter()
+            restore_snapshot(store, stats['name'], restored, verify=False)
+            no_verify = time.perf_counter() - start
+            os.remove(restored)
+
+            print(f"{spec:<8}{stats['seconds']:>11.2f}{stats['backup_seconds']:>10.2f}"
+                  f"{stats['snapshot_bytes'] / 2 ** 20:>8.1f}{stats['db_bytes'] / stats['snapshot_bytes']:>7.1f}"
+                  f"{unchanged:>13.2f}{restore['seconds']:>11.2f}{no_verify:>13.2f}")
+
+
+if __name__ == '__main__':
+    main()
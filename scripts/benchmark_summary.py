@@ -0,0 +1,86 @@
+"""Benchmark yearly summaries: SQL aggregation vs. the old row-by-row loop.
+
+Usage:
+    python scripts/benchmark_summary.py [--rows 100000 1000000] [--repeat 5]
+
+Reports median latency and peak Python memory (tracemalloc) for a
+"this year" summary at each table size.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_data import populate
+from analytics.report_generator import ReportGenerator
+from database.db_manager import DatabaseManager
+
+
+def row_loop_summary(report_gen, period):
+    """The previous generate_summary core: fetch every row and sum in Python"""
+    start_date, end_date = report_gen.get_date_range(period)
+    transactions = report_gen.transaction_model.get_transactions(start_date, end_date)
+    total_expenses = 0
+    total_savings = 0
+    category_breakdown = {}
+    for trans in transactions:
+        amount = trans['amount']
+        category = trans['category_name'] or 'Uncategorized'
+        if trans['transaction_type'] == 'expense':
+            total_expenses += amount
+            category_breakdown[category] = category_breakdown.get(category, 0) + amount
+        else:
+            total_savings += amount
+    return total_expenses, total_savings, category_breakdown
+
+
+def sql_summary(report_gen, period):
+    _, data = report_gen.generate_summary(period)
+    return data['total_expenses'], data['total_savings'], data['category_breakdown']
+
+
+def measure(fn, report_gen, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(report_gen, 'year')
+        samples.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    fn(report_gen, 'year')
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(samples) * 1000, peak / 1024 / 1024
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--rows', type=int, nargs='+', default=[100000, 1000000])
+    arg_parser.add_argument('--repeat', type=int, default=5)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            db = DatabaseManager(os.path.join(tmp, f'{rows}.db'))
+            populate(db.get_connection(), rows)
+            report_gen = ReportGenerator(db)
+
+            before = row_loop_summary(report_gen, 'year')
+            after = sql_summary(report_gen, 'year')
+            assert abs(before[0] - after[0]) < 0.01 and abs(before[1] - after[1]) < 0.01
+
+            print(f'\n{rows:,} rows, yearly summary')
+            print(f"  {'strategy':<12}{'median ms':>12}{'peak MiB':>12}")
+            for name, fn in (('row loop', row_loop_summary), ('sql', sql_summary)):
+                latency, peak = measure(fn, report_gen, args.repeat)
+                print(f'  {name:<12}{latency:>12.1f}{peak:>12.2f}')
+            db.close_all()
+
+
+if __name__ == '__main__':
+    main()
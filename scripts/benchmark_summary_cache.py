@@ -0,0 +1,78 @@
+"""Benchmark /api/summary/<period> with and without the summary cache.
+
+Usage:
+    python scripts/benchmark_summary_cache.py [--rows 200000] [--requests 2000] [--write-ratio 0.05]
+
+Simulates analytics page traffic: period switches through the Flask test
+client, interleaved with transaction writes that invalidate affected
+entries. Reports cache hit rate and p50/p99 latency.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_data import populate
+from config import Config
+
+PERIODS = ['today', 'week', 'month', 'year']
+PERIOD_WEIGHTS = [4, 3, 2, 1]
+
+
+def drive(app_module, requests, write_ratio, seed=0):
+    rng = random.Random(seed)
+    client = app_module.app.test_client()
+    latencies = []
+    for _ in range(requests):
+        if rng.random() < write_ratio:
+            # Mostly today's spending, sometimes a back-dated entry
+            date = datetime.now() - timedelta(days=rng.choice([0, 0, 0, 3, 40]))
+            app_module.transaction_model.create_transaction('expense', 25.0, 1, 'bench', date)
+            continue
+        period = rng.choices(PERIODS, PERIOD_WEIGHTS)[0]
+        start = time.perf_counter()
+        client.get(f'/api/summary/{period}')
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return latencies[len(latencies) // 2] * 1000, latencies[int(len(latencies) * 0.99)] * 1000
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--rows', type=int, default=200000)
+    arg_parser.add_argument('--requests', type=int, default=2000)
+    arg_parser.add_argument('--write-ratio', type=float, default=0.05)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        Config.DATABASE_PATH = os.path.join(tmp, 'summary.db')
+        import app as app_module
+
+        populate(app_module.db.get_connection(), args.rows)
+
+        cache = app_module.summary_cache
+        max_entries = cache.max_entries
+
+        cache.max_entries = 0
+        uncached = drive(app_module, args.requests, args.write_ratio)
+
+        cache.max_entries = max_entries
+        cache.hits = cache.misses = 0
+        cached = drive(app_module, args.requests, args.write_ratio)
+        stats = cache.stats()
+
+        print(f'{args.rows:,} rows, {args.requests} requests, write ratio {args.write_ratio}')
+        print(f"{'mode':<10}{'p50 ms':>10}{'p99 ms':>10}")
+        print(f"{'no cache':<10}{uncached[0]:>10.2f}{uncached[1]:>10.2f}")
+        print(f"{'cache':<10}{cached[0]:>10.2f}{cached[1]:>10.2f}")
+        print(f"hit rate {stats['hit_rate']:.1%} ({stats['hits']} hits, {stats['misses']} misses)")
+        app_module.db.close_all()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""Benchmark concurrent transaction inserts with and without group commit.
+
+Usage:
+    python scripts/benchmark_write_behind.py [--threads 32] [--inserts 200] [--synchronous NORMAL]
+                                             [--max-delay 0]
+
+Each thread records `--inserts` transactions through
+Transaction.create_transaction, like concurrent /chat requests. Compared:
+every thread committing on its own connection, every insert serialized
+through the single writer thread (the default /chat path), the
+write-behind queue grouping concurrent inserts into shared commits on that
+same writer, and both at once (half the threads each way), which must
+finish without errors because only the writer thread ever writes.
+Reports writes/sec, p50/p99 latency per insert and commits issued.
+"""
+import argparse
+import itertools
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from database.db_manager import DatabaseManager
+from database.executor import DatabaseExecutor
+from database.write_behind import WriteBehindQueue
+from models.transaction import Transaction
+
+
+def run(threads, inserts, record):
+    latencies = [[] for _ in range(threads)]
+    errors = []
+
+    def worker(index):
+        for i in range(inserts):
+            start = time.perf_counter()
+            try:
+                record('expense', 25.0, 1, f'bench {index}-{i}', datetime.now())
+            except Exception as exc:
+                errors.append(exc)
+                continue
+            latencies[index].append(time.perf_counter() - start)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    flat = sorted(l for per_thread in latencies for l in per_thread)
+    return {
+        'writes_per_sec': len(flat) / elapsed,
+        'p50_ms': flat[len(flat) // 2] * 1000,
+        'p99_ms': flat[int(len(flat) * 0.99)] * 1000,
+        'errors': len(errors)
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--threads', type=int, default=32)
+    arg_parser.add_argument('--inserts', type=int, default=200, help='inserts per thread')
+    arg_parser.add_argument('--synchronous', default=Config.DATABASE_SYNCHRONOUS,
+                            help='PRAGMA synchronous (FULL makes every commit fsync)')
+    arg_parser.add_argument('--max-delay', type=float, default=Config.WRITE_BEHIND_MAX_DELAY,
+                            help='seconds the write-behind writer lingers for more rows')
+    args = arg_parser.parse_args()
+    Config.DATABASE_SYNCHRONOUS = args.synchronous
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f'{args.threads} threads x {args.inserts} inserts, synchronous={args.synchronous}')
+        print(f"{'mode':<16}{'writes/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'commits':>10}{'errors':>8}")
+
+        db = DatabaseManager(os.path.join(tmp, 'direct.db'))
+        result = run(args.threads, args.inserts, Transaction(db).create_transaction)
+        db.close_all()
+        print(f"{'per-request':<16}{result['writes_per_sec']:>10.0f}{result['p50_ms']:>10.2f}"
+              f"{result['p99_ms']:>10.2f}{args.threads * args.inserts - result['errors']:>10}{result['errors']:>8}")
+
+        db = DatabaseManager(os.path.join(tmp, 'writer.db'))
+        executor = DatabaseExecutor()
+        model = Transaction(db)
+        result = run(args.threads, args.inserts,
+                     lambda *row: executor.write(model.create_transaction, *row).result())
+        executor.shutdown()
+        db.close_all()
+        print(f"{'single writer':<16}{result['writes_per_sec']:>10.0f}{result['p50_ms']:>10.2f}"
+              f"{result['p99_ms']:>10.2f}{args.threads * args.inserts - result['errors']:>10}{result['errors']:>8}")
+
+        for mode, mixed in (('write-behind', False), ('mixed', True)):
+            db = DatabaseManager(os.path.join(tmp, f'{mode}.db'))
+            executor = DatabaseExecutor()
+            write_queue = WriteBehindQueue(db, Config.WRITE_BEHIND_MAX_BATCH, args.max_delay,
+                                           submit_job=executor.write)
+            queued = Transaction(db, write_queue=write_queue).create_transaction
+            direct = Transaction(db).create_transaction
+            calls = itertools.count()
+            record = queued
+            if mixed:
+                def record(*row):
+                    if next(calls) % 2:
+                        return queued(*row)
+                    return executor.write(direct, *row).result()
+            result = run(args.threads, args.inserts, record)
+            write_queue.close()
+            executor.shutdown()
+            stats = write_queue.stats()
+            db.close_all()
+            print(f"{mode:<16}{result['writes_per_sec']:>10.0f}{result['p50_ms']:>10.2f}"
+                  f"{result['p99_ms']:>10.2f}{stats['commits']:>10}{result['errors']:>8}"
+                  f"   (avg {stats['avg_group']:.1f} rows/commit)")
+
+if __name__ == '__main__':
+    main()
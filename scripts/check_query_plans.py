@@ -0,0 +1,77 @@
+"""Verify that the hot transaction queries are served by indexes.
+
+Usage:
+    python scripts/check_query_plans.py [--db path/to/database.db]
+
+Runs EXPLAIN QUERY PLAN for each query against a migrated database
+(a temporary one by default) and exits non-zero if any of them falls back
+to a full table scan or a temporary sort.
+"""
+import argparse
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.db_manager import DatabaseManager
+from database.epoch import to_epoch
+from models.transaction import Transaction
+
+
+def plan_cases():
+    now = datetime.now()
+    day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    return {
+        'period summary': Transaction.build_transactions_query(to_epoch(day_start), to_epoch(now)),
+        'recent transactions': Transaction.build_transactions_query(limit=20),
+        'last transaction': Transaction.build_transactions_query(limit=1),
+        'update lookup': Transaction.build_transactions_query(
+            to_epoch(day_start), to_epoch(day_start + timedelta(days=1)), limit=1, category_id=1
+        ),
+    }
+
+
+def find_problems(plan_rows):
+    problems = []
+    for row in plan_rows:
+        detail = row['detail']
+        if detail.startswith('SCAN') and 'INDEX' not in detail:
+            problems.append(detail)
+        if 'TEMP B-TREE' in detail:
+            problems.append(detail)
+    return problems
+
+
+def check(db):
+    failed = False
+    for name, (query, params) in plan_cases().items():
+        plan = db.fetch_all('EXPLAIN QUERY PLAN ' + query, params)
+        problems = find_problems(plan)
+        status = 'FAIL' if problems else 'ok'
+        print(f'[{status}] {name}')
+        for row in plan:
+            print(f"       {row['detail']}")
+        failed = failed or bool(problems)
+    return not failed
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--db', help='database to check (defaults to a fresh temporary one)')
+    args = arg_parser.parse_args()
+
+    if args.db:
+        ok = check(DatabaseManager(args.db))
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            db = DatabaseManager(os.path.join(tmp, 'plans.db'))
+            ok = check(db)
+            db.close_all()
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
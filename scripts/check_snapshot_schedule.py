@@ -0,0 +1,67 @@
+"""Verify that a change made inside the snapshot interval is still saved.
+
+Usage:
+    python scripts/check_snapshot_schedule.py [--interval 0.5]
+
+Takes the first snapshot on a write, makes one more write inside the
+interval and then none at all, sleeps past the interval and exits non-zero
+unless the deferred snapshot was taken and the Snapshotter is clean again.
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.snapshot import LocalDirectoryStore, Snapshotter
+
+
+def write(db_path, value):
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute('CREATE TABLE IF NOT EXISTS notes (value TEXT)')
+        conn.execute('INSERT INTO notes VALUES (?)', (value,))
+    conn.close()
+
+
+def check(tmp, interval):
+    db_path = os.path.join(tmp, 'schedule.db')
+    store = LocalDirectoryStore(os.path.join(tmp, 'store'))
+    snapshotter = Snapshotter(store, [db_path], interval)
+
+    write(db_path, 'first')
+    snapshotter.mark_dirty()
+    after_first = snapshotter.snapshots
+
+    write(db_path, 'inside the interval')
+    snapshotter.mark_dirty()
+    after_second = snapshotter.snapshots
+
+    time.sleep(interval * 3)
+    checks = {
+        'first write snapshotted at once': after_first == 1,
+        'write inside the interval deferred': after_second == 1,
+        'deferred snapshot taken without another write': snapshotter.snapshots == 2,
+        'nothing left dirty': not snapshotter._dirty,
+        'both snapshots stored': len(store.list()) == 2,
+    }
+    for name, passed in checks.items():
+        print(f"[{'ok' if passed else 'FAIL'}] {name}")
+    return all(checks.values())
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--interval', type=float, default=0.5)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ok = check(tmp, args.interval)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""Import an exported chat log or bank-note dump, one message per line.
+
+Usage:
+    python scripts/import_chat_log.py chat.txt [--batch-size 500] [--db path/to/database.db]
+    cat chat.txt | python scripts/import_chat_log.py -
+
+Every line that parses as a recorded expense or saving is stored; the
+rest are counted as skipped.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chatbot.importer import import_messages
+from chatbot.message_parser import MessageParser
+from config import Config
+from database.db_manager import get_database
+from models.transaction import Transaction
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('path', help="chat log file, or '-' for stdin")
+    arg_parser.add_argument('--batch-size', type=int, default=Config.IMPORT_BATCH_SIZE)
+    arg_parser.add_argument('--db', help='database path (defaults to Config.DATABASE_PATH)')
+    args = arg_parser.parse_args()
+
+    db = get_database(args.db)
+    parser = MessageParser(db)
+    transaction_model = Transaction(db)
+
+    start = time.perf_counter()
+    if args.path == '-':
+        stats = import_messages(sys.stdin, parser, transaction_model, args.batch_size)
+    else:
+        with open(args.path, encoding='utf-8', errors='replace') as f:
+            stats = import_messages(f, parser, transaction_model, args.batch_size)
+    elapsed = time.perf_counter() - start
+
+    print(f"Parsed {stats['lines']} lines: imported {stats['imported']}, "
+          f"skipped {stats['skipped']} ({stats['lines'] / max(elapsed, 1e-9):.0f} lines/sec)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""Concurrent load test against a running server.
+
+Usage:
+    python app.py                       # WSGI (Flask dev server), or
+    uvicorn asgi:application --port 5000
+    python scripts/load_test.py [--url http://127.0.0.1:5000] [--users 50] [--requests 20]
+
+Each simulated user is a thread that mixes chat messages (mostly records,
+some queries) with summary reads. Reports throughput, p50/p95/p99 latency
+and the error count, so the WSGI and ASGI entry points can be compared
+under the same load.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+
+MESSAGES = [
+    'spent 12.50 on lunch',
+    'paid 40 for groceries',
+    'uber 18 yesterday',
+    'received 1200 salary',
+    'how much did I spend this week?',
+    'how much did I spend on food this month?',
+]
+PERIODS = ['today', 'week', 'month', 'year']
+
+
+def request(base_url, rng):
+    if rng.random() < 0.7:
+        body = json.dumps({'message': rng.choice(MESSAGES)}).encode()
+        req = urllib.request.Request(f'{base_url}/chat', data=body,
+                                     headers={'Content-Type': 'application/json'})
+    else:
+        req = urllib.request.Request(f'{base_url}/api/summary/{rng.choice(PERIODS)}')
+    with urllib.request.urlopen(req, timeout=30) as response:
+        response.read()
+
+
+def user(base_url, count, seed, latencies, errors, lock):
+    rng = random.Random(seed)
+    for _ in range(count):
+        start = time.perf_counter()
+        try:
+            request(base_url, rng)
+        except (urllib.error.URLError, OSError):
+            with lock:
+                errors.append(1)
+            continue
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--url', default='http://127.0.0.1:5000')
+    arg_parser.add_argument('--users', type=int, default=50)
+    arg_parser.add_argument('--requests', type=int, default=20, help='requests per user')
+    args = arg_parser.parse_args()
+
+    latencies, errors, lock = [], [], threading.Lock()
+    threads = [
+        threading.Thread(target=user, args=(args.url.rstrip('/'), args.requests, seed, latencies, errors, lock))
+        for seed in range(args.users)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f'{args.users} users x {args.requests} requests against {args.url}')
+    print(f'{len(latencies)} ok, {len(errors)} errors in {elapsed:.2f}s '
+          f'({len(latencies) / elapsed:.1f} req/s)')
+    if latencies:
+        print(f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+        print(f'{percentile(latencies, 0.5) * 1000:>10.1f}'
+              f'{percentile(latencies, 0.95) * 1000:>10.1f}'
+              f'{percentile(latencies, 0.99) * 1000:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""Rebuild or verify the daily_rollups table.
+
+Usage:
+    python scripts/rollups.py verify [--db path/to/database.db]
+    python scripts/rollups.py rebuild [--db path/to/database.db]
+
+`verify` exits non-zero and lists the differing rows when the rollups no
+longer match the raw transactions table.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.db_manager import DatabaseManager
+from database.rollups import rebuild_rollups, verify_rollups
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('command', choices=['verify', 'rebuild'])
+    arg_parser.add_argument('--db', help='database path (defaults to Config.DATABASE_PATH)')
+    args = arg_parser.parse_args()
+
+    conn = DatabaseManager(args.db).get_connection()
+
+    if args.command == 'rebuild':
+        rebuild_rollups(conn)
+        print('Rollups rebuilt.')
+
+    mismatches = verify_rollups(conn)
+    for user_id, day, category_id, transaction_type, expected, actual in mismatches:
+        print(f'MISMATCH user={user_id} {day} category={category_id} {transaction_type}: '
+              f'expected {expected}, found {actual}')
+
+    if mismatches:
+        sys.exit(1)
+    print('Rollups match the transactions table.')
+
+
+if __name__ == '__main__':
+    main()
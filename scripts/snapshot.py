@@ -0,0 +1,56 @@
+"""Create, list or restore database snapshots.
+
+Usage:
+    python scripts/snapshot.py create [--db path/to/database.db] [--store DIR_OR_URL]
+    python scripts/snapshot.py list [--db path/to/database.db] [--store DIR_OR_URL]
+    python scripts/snapshot.py restore [--name SNAPSHOT] [--db path/to/database.db] [--store DIR_OR_URL]
+
+The store defaults to Config.SNAPSHOT_STORE. `restore` replaces the
+database file with the newest snapshot (or --name); stop the app first.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from database.snapshot import create_snapshot, open_store, restore_snapshot, snapshot_prefix
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('command', choices=['create', 'list', 'restore'])
+    arg_parser.add_argument('--db', default=Config.DATABASE_PATH, help='database path (defaults to Config.DATABASE_PATH)')
+    arg_parser.add_argument('--store', default=Config.SNAPSHOT_STORE, help='directory or <scheme>://location')
+    arg_parser.add_argument('--name', help='snapshot to restore (default: the newest)')
+    args = arg_parser.parse_args()
+
+    if not args.store:
+        arg_parser.error('no store: pass --store or set SNAPSHOT_STORE')
+    store = open_store(args.store)
+    names = store.list(snapshot_prefix(args.db))
+
+    if args.command == 'list':
+        for name in names:
+            print(name)
+        return
+
+    if args.command == 'create':
+        stats = create_snapshot(args.db, store)
+        if stats is None:
+            print('Unchanged since the latest snapshot; nothing uploaded.')
+            return
+        print(f"{stats['name']}: {stats['db_bytes'] / 2 ** 20:.1f} MiB -> "
+              f"{stats['snapshot_bytes'] / 2 ** 20:.1f} MiB in {stats['seconds']:.2f}s")
+        return
+
+    name = args.name or (names[-1] if names else None)
+    if name is None:
+        sys.exit(f'No snapshots of {args.db} in {args.store}.')
+    stats = restore_snapshot(store, name, args.db)
+    print(f"Restored {name}: {stats['db_bytes'] / 2 ** 20:.1f} MiB in {stats['seconds']:.2f}s")
+
+
+if __name__ == '__main__':
+    main()